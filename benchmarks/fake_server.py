@@ -0,0 +1,240 @@
+"""
+Local stand-in for the MCP server, used by the benchmarks.
+
+Run it on its own with ``python -m benchmarks.fake_server --port 8765``.
+"""
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def make_tools(num_tools: int) -> List[Dict[str, Any]]:
+    """Build a catalog mixing tools with no, one and several parameters.
+    
+    Args:
+        num_tools: Number of tools in the catalog
+    
+    Returns:
+        List of tool definitions
+    """
+    tools = []
+    for i in range(num_tools):
+        parameters = [
+            {
+                "name": f"param_{j}",
+                "description": f"Parameter {j} of tool {i}",
+                "type": "string",
+                "required": j == 0
+            }
+            for j in range(i % 4)
+        ]
+        tools.append({
+            "name": f"tool_{i}",
+            "description": f"Benchmark tool number {i}, returning synthetic records.",
+            "parameters": parameters,
+            "annotations": {"readOnlyHint": True}
+        })
+    return tools
+
+
+class FakeMCPServer:
+    """Threaded HTTP server implementing the MCP endpoints used by the client.
+    
+    ``/tools/call`` sleeps for ``latency`` seconds and returns
+    ``payload_items`` records of about ``item_size`` bytes each, as NDJSON
+    when the client asks for it. With ``page_size``, catalogs and results
+    are split into pages linked by ``next_cursor``. With ``gzip``, bodies
+    are gzip-compressed both ways when the client offers it.
+    """
+    
+    def __init__(
+        self,
+        num_tools: int = 50,
+        latency: float = 0.0,
+        payload_items: int = 10,
+        item_size: int = 100,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        page_size: Optional[int] = None,
+        gzip: bool = False
+    ):
+        """Initialize the fake server.
+        
+        Args:
+            num_tools: Number of tools in the catalog
+            latency: Seconds each tool call takes on the server
+            payload_items: Number of records returned by each tool call
+            item_size: Approximate size of each record, in bytes
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+            page_size: Number of tools or records per page, None to never
+                paginate
+            gzip: Read gzip request bodies and gzip responses for clients
+                accepting it. Other request encodings are answered with 415
+        """
+        self.tools = make_tools(num_tools)
+        self.latency = latency
+        self.payload_items = payload_items
+        self.item_size = item_size
+        self.page_size = page_size
+        self.gzip = gzip
+        self.etag = '"%s"' % hashlib.sha256(json.dumps(self.tools).encode()).hexdigest()[:16]
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def result(self, tool_name: str) -> List[Dict[str, Any]]:
+        """Build the synthetic result of a tool call."""
+        filler = "x" * max(0, self.item_size - 40)
+        return [{"tool": tool_name, "id": i, "data": filler} for i in range(self.payload_items)]
+    
+    def filter_tools(self, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Apply the ``include``, ``exclude`` and ``limit`` query parameters."""
+        tools = self.tools
+        if "include" in query:
+            patterns = query["include"][0].split(",")
+            tools = [tool for tool in tools if any(fnmatch.fnmatchcase(tool["name"], p) for p in patterns)]
+        if "exclude" in query:
+            patterns = query["exclude"][0].split(",")
+            tools = [tool for tool in tools if not any(fnmatch.fnmatchcase(tool["name"], p) for p in patterns)]
+        if "limit" in query:
+            tools = tools[:int(query["limit"][0])]
+        return tools
+    
+    def page(self, items: List[Any], cursor: Optional[str]) -> Dict[str, Any]:
+        """Cut the page starting at a cursor out of a list."""
+        if self.page_size is None:
+            return {}
+        start = int(cursor or 0)
+        end = start + self.page_size
+        page = {"items": items[start:end]}
+        if end < len(items):
+            page["next_cursor"] = str(end)
+        return page
+    
+    def _handler_class(self) -> Any:
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add ~40ms to every keep-alive response
+            disable_nagle_algorithm = True
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _read_json(self) -> Any:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if server.gzip and self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                return json.loads(body or b"{}")
+            
+            def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                if server.gzip and body and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    body = gzip.compress(body)
+                    headers = dict(headers or {}, **{"Content-Encoding": "gzip"})
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/tools/list":
+                    return self._send(404, b'{"error": "not found"}')
+                tools, etag = server.tools, server.etag
+                query = parse_qs(url.query)
+                if query:
+                    tools = server.filter_tools(query)
+                    etag = '"%s"' % hashlib.sha256(json.dumps(tools).encode()).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers={"ETag": etag})
+                body = {"tools": tools}
+                page = server.page(tools, query.get("cursor", [None])[0])
+                if page:
+                    body = {"tools": page["items"], "next_cursor": page.get("next_cursor")}
+                self._send(200, json.dumps(body).encode(), headers={"ETag": etag})
+            
+            def do_POST(self):
+                if self.headers.get("Content-Encoding") not in (None, "gzip" if server.gzip else None):
+                    self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                    return self._send(415, b'{"error": "unsupported content encoding"}')
+                data = self._read_json()
+                if self.path == "/initialize":
+                    body = {"server_info": {"name": "Fake MCP Server", "version": "bench"}}
+                    return self._send(200, json.dumps(body).encode())
+                if self.path != "/tools/call":
+                    return self._send(404, b'{"error": "not found"}')
+                
+                started = time.perf_counter()
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.calls += 1
+                records = server.result(data.get("name", ""))
+                page = server.page(records, data.get("cursor"))
+                if page:
+                    body = {"result": page["items"], "next_cursor": page.get("next_cursor")}
+                    return self._send(200, json.dumps(body).encode())
+                timing = {"Server-Timing": "app;dur=%.3f" % ((time.perf_counter() - started) * 1000)}
+                if "application/x-ndjson" in (self.headers.get("Accept") or ""):
+                    body = "\n".join(json.dumps(record) for record in records).encode()
+                    return self._send(200, body, "application/x-ndjson", timing)
+                self._send(200, json.dumps({"result": records}).encode(), headers=timing)
+        
+        return Handler
+    
+    def start(self) -> "FakeMCPServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self) -> "FakeMCPServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fake MCP server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tools", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payload-items", type=int, default=10)
+    parser.add_argument("--item-size", type=int, default=100)
+    args = parser.parse_args()
+    
+    fake = FakeMCPServer(args.tools, args.latency, args.payload_items, args.item_size, port=args.port)
+    print(f"Fake MCP server listening on {fake.url}")
+    try:
+        fake._httpd.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,257 @@
+"""
+Benchmarks for the MCP client and the toolkit adapters.
+
+Starts a local fake MCP server and measures ``import shivonai`` and
+``import shivonai.lyra`` time, toolkit construction time and memory for each adapter, and tool call throughput and
+latency at several concurrency levels. Results are written as JSON so runs
+of two releases can be compared::
+    
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import datetime
+import importlib
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+import shivonai
+from shivonai.core.catalog import CatalogCache
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.utils.schemas import get_schema_cache
+
+from benchmarks.fake_server import FakeMCPServer
+
+TOKEN = "benchmark-token"
+
+# Adapter name -> (module, toolkit function, framework module it needs)
+ADAPTERS = {
+    "langchain": ("shivonai.lyra.langchain_tools", "langchain_toolkit", "langchain"),
+    "llamaindex": ("shivonai.lyra.llamaindex_tools", "llamaindex_toolkit", "llama_index"),
+    "crewai": ("shivonai.lyra.crew_tools", "crew_toolkit", "crewai"),
+    "agno": ("shivonai.lyra.agno_tools", "agno_toolkit", "agno"),
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Get the q-th percentile of a list of values, by nearest rank."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize call latencies, in milliseconds."""
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def bench_import(repeat: int, module: str = "shivonai") -> Dict[str, float]:
+    """Measure importing a module in fresh interpreters."""
+    script = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    timings = [
+        float(subprocess.check_output([sys.executable, "-c", script]))
+        for _ in range(repeat)
+    ]
+    return {"best_ms": min(timings) * 1000, "median_ms": statistics.median(timings) * 1000}
+
+
+def bench_toolkit(build: Callable[..., Any], server: FakeMCPServer, repeat: int) -> Dict[str, Any]:
+    """Measure building a toolkit for the whole catalog."""
+    client = MCPClient(server.url, catalog_cache=CatalogCache(ttl=3600))
+    client.connect(TOKEN)
+    
+    cold = []
+    warm = []
+    lazy = []
+    memory = []
+    for _ in range(repeat):
+        # Cold: generated schemas are rebuilt; warm: served from the schema cache
+        get_schema_cache().clear()
+        tracemalloc.start()
+        started = time.perf_counter()
+        tools = build(TOKEN, client=client)
+        cold.append(time.perf_counter() - started)
+        memory.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        
+        started = time.perf_counter()
+        build(TOKEN, client=client)
+        warm.append(time.perf_counter() - started)
+        
+        get_schema_cache().clear()
+        started = time.perf_counter()
+        build(TOKEN, client=client, lazy=True)
+        lazy.append(time.perf_counter() - started)
+    client.close()
+    
+    return {
+        "tools": len(tools),
+        "cold_ms": min(cold) * 1000,
+        "warm_ms": min(warm) * 1000,
+        "lazy_ms": min(lazy) * 1000,
+        "memory_kb": min(memory) / 1024.0,
+        "memory_per_tool_bytes": min(memory) / max(1, len(tools)),
+    }
+
+
+def bench_calls_sync(server: FakeMCPServer, concurrency: int, calls: int) -> Dict[str, float]:
+    """Measure tool call throughput and latency with a thread pool."""
+    client = MCPClient(server.url, pool_maxsize=concurrency)
+    client.token = TOKEN
+    
+    def call(i):
+        started = time.perf_counter()
+        client.call_tool(f"tool_{i % len(server.tools)}", {"param_0": str(i)})
+        return time.perf_counter() - started
+    
+    call(0)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(call, range(calls)))
+    elapsed = time.perf_counter() - started
+    client.close()
+    return latency_summary(latencies, elapsed)
+
+
+def bench_calls_async(server: FakeMCPServer, concurrency: int, calls: int) -> Dict[str, float]:
+    """Measure tool call throughput and latency with asyncio."""
+    async def run():
+        client = AsyncMCPClient(server.url, max_connections=concurrency)
+        client.token = TOKEN
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def call(i):
+            async with semaphore:
+                started = time.perf_counter()
+                await client.call_tool(f"tool_{i % len(server.tools)}", {"param_0": str(i)})
+                return time.perf_counter() - started
+        
+        await call(0)
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(call(i) for i in range(calls)))
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+        return latency_summary(list(latencies), elapsed)
+    
+    return asyncio.run(run())
+
+
+def load_adapter(name: str) -> Optional[Callable[..., Any]]:
+    """Get an adapter's toolkit function, or None if its framework is missing."""
+    module_name, function_name, framework = ADAPTERS[name]
+    if importlib.util.find_spec(framework) is None:
+        return None
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every benchmark and collect the results."""
+    results = {
+        "meta": {
+            "shivonai": shivonai.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "params": vars(args),
+        },
+        "import": bench_import(args.repeat),
+        "import_lyra": bench_import(args.repeat, "shivonai.lyra"),
+        "toolkits": {},
+        "calls": {"sync": {}, "async": {}},
+    }
+    
+    with FakeMCPServer(num_tools=args.tools) as server:
+        for name in args.adapters:
+            build = load_adapter(name)
+            if build is None:
+                results["toolkits"][name] = {"skipped": "framework not installed"}
+                continue
+            results["toolkits"][name] = bench_toolkit(build, server, args.repeat)
+    
+    with FakeMCPServer(
+        num_tools=args.tools,
+        latency=args.latency,
+        payload_items=args.payload_items,
+        item_size=args.item_size
+    ) as server:
+        for concurrency in args.concurrency:
+            results["calls"]["sync"][str(concurrency)] = bench_calls_sync(server, concurrency, args.calls)
+            try:
+                import httpx  # noqa: F401
+            except ImportError:
+                results["calls"]["async"][str(concurrency)] = {"skipped": "httpx not installed"}
+                continue
+            results["calls"]["async"][str(concurrency)] = bench_calls_async(server, concurrency, args.calls)
+    
+    return results
+
+
+def compare(results: Any, baseline: Any, path: str = "") -> List[str]:
+    """List the relative change of every numeric result against a baseline."""
+    lines = []
+    if isinstance(results, dict) and isinstance(baseline, dict):
+        for key in results:
+            if key != "meta" and key in baseline:
+                lines.extend(compare(results[key], baseline[key], f"{path}.{key}" if path else key))
+    elif isinstance(results, (int, float)) and isinstance(baseline, (int, float)) and baseline:
+        change = (results - baseline) / baseline * 100
+        lines.append(f"{path}: {baseline:.3f} -> {results:.3f} ({change:+.1f}%)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the shivonai client and adapters.")
+    parser.add_argument("--tools", type=int, default=200, help="number of tools in the catalog")
+    parser.add_argument("--latency", type=float, default=0.005, help="server time per tool call, in seconds")
+    parser.add_argument("--payload-items", type=int, default=20, help="records returned per tool call")
+    parser.add_argument("--item-size", type=int, default=200, help="approximate bytes per record")
+    parser.add_argument("--calls", type=int, default=500, help="tool calls per concurrency level")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32],
+        help="comma-separated concurrency levels"
+    )
+    parser.add_argument(
+        "--adapters",
+        type=lambda value: value.split(","),
+        default=list(ADAPTERS),
+        help="comma-separated adapters to benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of timing measurements")
+    parser.add_argument("--output", help="file to write the JSON results to, defaults to stdout")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    args = parser.parse_args(argv)
+    
+    results = run(args)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
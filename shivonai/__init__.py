@@ -3,25 +3,16 @@
 ShivonAI Package - Tools for connecting AI agents with MCP server
 """
 from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
 
 __version__ = "0.1.4"
 
-# shivonai/core/__init__.py
-"""
-Core components for ShivonAI package.
-"""
-from shivonai.core.mcp_client import MCPClient
+_LYRA_TOOLKITS = ("langchain_toolkit", "llamaindex_toolkit", "crew_toolkit", "agno_toolkit")
 
-# shivonai/lyra/__init__.py
-"""
-Lyra module for integration with different AI agent frameworks.
-"""
-from shivonai.lyra.langchain_tools import langchain_toolkit
-from shivonai.lyra.llamaindex_tools import llamaindex_toolkit
-from shivonai.lyra.crew_tools import crew_toolkit
-from shivonai.lyra.agno_tools import agno_toolkit
 
-# shivonai/utils/__init__.py
-"""
-Utility functions for ShivonAI package.
-"""
\ No newline at end of file
+def __getattr__(name):
+    # Toolkits are re-exported lazily so `import shivonai` stays framework-free
+    if name in _LYRA_TOOLKITS:
+        from shivonai import lyra
+        return getattr(lyra, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1,18 @@
-from shivonai.core.mcp_client import MCPClient
\ No newline at end of file
+from shivonai.core.mcp_client import MCPClient, MCPToolError
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.catalog import CatalogCache, get_catalog_cache, configure_catalog_cache
+from shivonai.core.credentials import get_auth_token, set_auth_token, reset_auth_token, use_auth_token
+from shivonai.core.resilience import RetryPolicy, CircuitBreaker, CircuitOpenError
+from shivonai.core.deadline import Deadline, DeadlineExceeded, get_deadline, use_deadline
+from shivonai.core.streaming import iter_ndjson, truncate_records
+from shivonai.core.metrics import MetricsSink, InMemoryMetrics, PrometheusMetrics, OpenTelemetryMetrics
+from shivonai.core.codec import JSONCodec, get_codec, configure_codec
+from shivonai.core.filters import ToolFilter
+from shivonai.core.tool_index import ToolIndex, get_tool_index_cache, configure_tool_index
+from shivonai.core.federation import FederatedMCPClient, AsyncFederatedMCPClient, LatencyTracker
+from shivonai.core.sessions import SessionManager, get_session_manager
+from shivonai.core.coalescing import CallCoalescer
+from shivonai.core.budget import OutputBudget, ResultStore
+from shivonai.core.pagination import iter_pages, aiter_pages
+from shivonai.core.compression import Compression
+from shivonai.core.transport import Cassette, RecordTransport, ReplayTransport
\ No newline at end of file
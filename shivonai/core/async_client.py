@@ -0,0 +1,927 @@
+"""
+Asyncio MCP Client for connecting with MCP Server.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional, Tuple, Union
+
+from shivonai.core.catalog import get_bound_tool_infos
+from shivonai.core.coalescing import CallCoalescer
+from shivonai.core.codec import JSONCodec, get_codec
+from shivonai.core.compression import UNSUPPORTED_MEDIA_TYPE, Compression, Negotiation, httpx_encodings
+from shivonai.core.credentials import get_toolkit_token
+from shivonai.core.deadline import Deadline, DeadlineExceeded, get_deadline, use_deadline
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import ConnectionTrace, MetricsSink, record_response, track_tool_call
+from shivonai.core.pagination import Page, aiter_pages, next_cursor
+from shivonai.core.sessions import UNAUTHORIZED, SessionManager, bearer_token
+from shivonai.core.result_cache import MISSING, ToolResultCache
+from shivonai.core.resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    DEFAULT_CIRCUIT_BREAKER,
+    DEFAULT_RETRY_POLICY,
+    FAILURE_STATUS,
+)
+from shivonai.core.streaming import STREAM_ACCEPT, is_ndjson, iter_ndjson, truncate_records
+
+
+async def _close_on_shutdown(http_client: Any) -> None:
+    """Wait until cancelled, then close an ``httpx`` client.
+    
+    ``asyncio.run`` cancels the tasks left when its coroutine returns, so an
+    owned client is closed before its loop is.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await http_client.aclose()
+
+
+class AsyncMCPClient:
+    """Asyncio client to connect with MCP Server.
+    
+    Mirrors the ``MCPClient`` surface with coroutine methods on top of a
+    pooled ``httpx.AsyncClient``, so many concurrent agent sessions can share
+    one process without a thread per in-flight call. ``httpx`` is imported
+    on first use, so creating the client does not require it to be installed.
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "https://mcp-server.shivonai.com",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        http_client: Any = None,
+        credential_provider: Optional[Callable[[], Optional[str]]] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        retry_policy: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: Optional[CircuitBreaker] = DEFAULT_CIRCUIT_BREAKER,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        metrics: Optional[MetricsSink] = None,
+        codec: Optional[JSONCodec] = None,
+        session_manager: Optional[SessionManager] = None,
+        coalescer: Optional[CallCoalescer] = None,
+        compression: Optional[Compression] = None,
+        transport: Any = None
+    ):
+        """Initialize Async MCP Client.
+        
+        Args:
+            base_url: URL of the MCP server
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Maximum number of idle connections kept
+                alive in the pool
+            keepalive_expiry: Seconds an idle connection is kept alive
+            http_client: Existing ``httpx.AsyncClient`` to use. A client passed
+                in is not closed by ``aclose()``
+            credential_provider: Callable returning the token for each call.
+                When set, the token stored by ``authenticate()`` is never used
+                for calls
+            result_cache: Opt-in cache of results of read-only tools
+            retry_policy: Policy for retrying transient failures, or None to
+                never retry
+            circuit_breaker: Per-endpoint circuit breaker, or None to disable
+                it. Defaults to one shared by all clients in the process
+            connect_timeout: Seconds to wait for a connection to the server
+            read_timeout: Seconds to wait for the server between bytes of the
+                response
+            metrics: Sink receiving per-tool call metrics, or None to disable
+                instrumentation
+            codec: JSON codec decoding responses. Defaults to the
+                process-wide ``get_codec()``
+            session_manager: Manager sharing ``/initialize`` results between
+                clients, e.g. the process-wide ``get_session_manager()``
+            coalescer: Opt-in coalescing of identical concurrent tool calls
+            compression: Opt-in negotiation of compressed and MessagePack
+                bodies
+            transport: ``httpx`` transport sending the requests, e.g. a
+                ``RecordTransport`` or ``ReplayTransport``. Cannot be
+                combined with ``http_client``
+        """
+        if http_client is not None and transport is not None:
+            raise ValueError("Pass either an http_client or a transport, not both.")
+        self.base_url = base_url
+        self.token = None
+        self.available_tools = []
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._owns_http_client = http_client is None
+        self._http_client = http_client
+        # Owned clients by event loop, with the task closing each one
+        self._http_clients = {}
+        self._http_clients_lock = threading.Lock()
+        self.transport = transport
+        self.credential_provider = credential_provider
+        self.result_cache = result_cache
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.metrics = metrics
+        self.codec = codec if codec is not None else get_codec()
+        self.session_manager = session_manager
+        self.coalescer = coalescer
+        self.compression = compression
+        self._negotiation = None
+        if compression is not None:
+            self._negotiation = Negotiation(compression, httpx_encodings(), "content")
+    
+    @classmethod
+    def from_client(cls, client: Any, **kwargs: Any) -> "AsyncMCPClient":
+        """Create an async client with the same settings as an MCPClient.
+        
+        A ``FederatedMCPClient`` is mirrored by an async federated client
+        over the same servers.
+        
+        Args:
+            client: MCPClient to mirror
+            kwargs: Extra arguments for the constructor
+        
+        Returns:
+            Async client for the same server
+        """
+        from shivonai.core.federation import FederatedMCPClient
+        
+        if isinstance(client, FederatedMCPClient):
+            return client.to_async(**kwargs)
+        async_client = cls(
+            client.base_url,
+            credential_provider=client.credential_provider,
+            result_cache=client.result_cache,
+            retry_policy=client.retry_policy,
+            circuit_breaker=client.circuit_breaker,
+            connect_timeout=client.connect_timeout,
+            read_timeout=client.read_timeout,
+            metrics=client.metrics,
+            codec=client.codec,
+            session_manager=client.session_manager,
+            coalescer=client.coalescer,
+            compression=client.compression,
+            transport=client.transport,
+            **kwargs
+        )
+        async_client.token = client.token
+        async_client.available_tools = client.available_tools
+        return async_client
+    
+    @classmethod
+    def for_client(cls, client: Any) -> Any:
+        """Get the async client shared by the toolkits built on a client.
+        
+        It is created with ``from_client`` on first use and closed by the
+        client's ``close()``.
+        
+        Args:
+            client: MCPClient or FederatedMCPClient to mirror
+        
+        Returns:
+            The client's async counterpart
+        """
+        async_client = getattr(client, "_async_client", None)
+        if async_client is None:
+            async_client = client._async_client = cls.from_client(client)
+        else:
+            # Follow the token and catalog of the latest connect()
+            async_client.token = client.token
+            if isinstance(async_client, AsyncMCPClient):
+                async_client.available_tools = client.available_tools
+        return async_client
+    
+    @property
+    def http_client(self) -> Any:
+        """The pooled ``httpx.AsyncClient``, created on first access.
+        
+        Owned clients are kept per event loop, so loops running in different
+        threads never share connections. Each is closed when its loop shuts
+        down.
+        """
+        if not self._owns_http_client:
+            return self._http_client
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._http_clients_lock:
+            entry = self._http_clients.get(loop)
+            if entry is None:
+                http_client = self._create_http_client()
+                closer = None
+                if loop is not None:
+                    closer = loop.create_task(_close_on_shutdown(http_client))
+                    closer.add_done_callback(lambda task: self._forget_http_client(loop, http_client))
+                entry = self._http_clients[loop] = (http_client, closer)
+        return entry[0]
+    
+    def _create_http_client(self) -> Any:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "Could not import httpx. "
+                "Please install it with `pip install httpx`."
+            )
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        return httpx.AsyncClient(limits=limits, transport=self.transport)
+    
+    def _forget_http_client(self, loop: Any, http_client: Any) -> None:
+        """Drop the entry of a client closed by its loop's shutdown."""
+        with self._http_clients_lock:
+            entry = self._http_clients.get(loop)
+            if entry is not None and entry[0] is http_client:
+                del self._http_clients[loop]
+    
+    def _release_http_clients(self) -> List[Any]:
+        """Detach the owned ``httpx`` clients, closing each on its own loop.
+        
+        Returns:
+            Pairs of each client and the task closing it, None for a client
+            not bound to a loop
+        """
+        with self._http_clients_lock:
+            entries = list(self._http_clients.items())
+            self._http_clients.clear()
+        for loop, (_, closer) in entries:
+            if closer is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(closer.cancel)
+        return [entry for _, entry in entries]
+    
+    def close(self) -> None:
+        """Close the pooled connections owned by this client from sync code.
+        
+        The connections are closed on the event loop they were opened on,
+        as soon as it runs.
+        """
+        if self._owns_http_client:
+            self._release_http_clients()
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections owned by this client."""
+        if not self._owns_http_client:
+            return
+        loop = asyncio.get_running_loop()
+        for http_client, closer in self._release_http_clients():
+            if closer is None:
+                await http_client.aclose()
+            elif closer.get_loop() is loop:
+                await asyncio.gather(closer, return_exceptions=True)
+    
+    async def __aenter__(self) -> "AsyncMCPClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    def _decode(self, response: Any) -> Any:
+        """Decode a response body as JSON, or as negotiated MessagePack."""
+        if self._negotiation is None:
+            return self.codec.loads(response.content)
+        return self._negotiation.decode(response.content, response.headers, self.codec)
+    
+    def _resolve_token(self) -> str:
+        """Get the token to use for the current call."""
+        if self.credential_provider is not None:
+            token = self.credential_provider()
+        else:
+            token = get_toolkit_token() or self.token
+        if not token:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+        return token
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        idempotent: bool = True,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Any:
+        """Send a request through the circuit breaker, retrying transient failures.
+        
+        Each attempt is bounded by the client's timeouts and by the deadline
+        bound with ``use_deadline``, if any. Retries are skipped once their
+        backoff would not fit in the remaining budget.
+        
+        Args:
+            method: HTTP client method to use, e.g. ``"post"``
+            path: Endpoint path on the MCP server
+            idempotent: Whether the request is safe to send twice
+            stream: Return as soon as the headers are received, leaving the
+                body to be read and the response to be closed by the caller
+            kwargs: Arguments for the HTTP client method
+        
+        Returns:
+            The final response. Its status is not checked
+        """
+        import httpx
+        
+        url = f"{self.base_url}{path}"
+        request_kwargs = kwargs
+        if self._negotiation is not None:
+            request_kwargs = self._negotiation.prepare(kwargs, self.codec)
+        deadline = get_deadline()
+        attempt = 0
+        reinitialized = False
+        while True:
+            connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+            remaining = None
+            if deadline is not None:
+                remaining = deadline.check()
+                connect_timeout = min(connect_timeout, remaining)
+                read_timeout = min(read_timeout, remaining)
+            timeout = httpx.Timeout(
+                connect=connect_timeout,
+                read=read_timeout,
+                write=read_timeout,
+                pool=connect_timeout
+            )
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_call(url)
+            try:
+                if stream:
+                    request = self.http_client.send(
+                        self.http_client.build_request(method.upper(), url, timeout=timeout, **request_kwargs),
+                        stream=True
+                    )
+                else:
+                    request = getattr(self.http_client, method)(url, timeout=timeout, **request_kwargs)
+                if remaining is None:
+                    response = await request
+                else:
+                    response = await asyncio.wait_for(request, remaining)
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure(url)
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded(f"Deadline exceeded while calling {path}") from e
+                delay = None
+                if self.retry_policy is not None:
+                    connect_error = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    delay = self.retry_policy.delay_for_error(attempt, connect_error, idempotent)
+                if delay is not None and deadline is not None and delay >= deadline.remaining():
+                    delay = None
+                if delay is None:
+                    raise
+            except BaseException:
+                # Cancelled or interrupted: free a half-open trial for others
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release(url)
+                raise
+            else:
+                status = response.status_code
+                if self.circuit_breaker is not None:
+                    if status in FAILURE_STATUS:
+                        self.circuit_breaker.record_failure(url)
+                    else:
+                        self.circuit_breaker.record_success(url)
+                if status == UNSUPPORTED_MEDIA_TYPE and self._negotiation is not None:
+                    if self._negotiation.reject(request_kwargs["headers"]):
+                        # Resend the body in an encoding the server reads
+                        await response.aclose()
+                        request_kwargs = self._negotiation.prepare(kwargs, self.codec)
+                        continue
+                if status == UNAUTHORIZED and not reinitialized and self.session_manager is not None:
+                    token = bearer_token(kwargs.get("headers"))
+                    if token is not None:
+                        # The cached session is stale: open a new one and resend once
+                        reinitialized = True
+                        await response.aclose()
+                        self.session_manager.invalidate(self.base_url, token)
+                        await self.session_manager.aget(self.base_url, token, lambda: self._initialize(token))
+                        continue
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.delay_for_status(attempt, status, response.headers, idempotent)
+                if delay is not None and deadline is not None and delay >= deadline.remaining():
+                    delay = None
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def authenticate(self, token: str) -> Dict[str, Any]:
+        """Authenticate with the MCP server using a token.
+        
+        With a session manager, ``/initialize`` is only sent when the token
+        has no valid session, and concurrent callers share one request.
+        
+        Args:
+            token: Authentication token
+        
+        Returns:
+            Server information
+        """
+        self.token = token
+        if self.session_manager is not None:
+            session = await self.session_manager.aget(self.base_url, token, lambda: self._initialize(token))
+            return session.server_info
+        data = await self._initialize(token)
+        return data["server_info"]
+    
+    async def _initialize(self, token: str) -> Dict[str, Any]:
+        """Send ``/initialize`` and return the decoded response body."""
+        response = await self._request(
+            "post",
+            "/initialize",
+            json={"auth_token": token}
+        )
+        response.raise_for_status()
+        return self._decode(response)
+    
+    async def list_tools(self, tool_filter: Optional[ToolFilter] = None) -> List[Dict[str, Any]]:
+        """Get list of tools available with current authentication.
+        
+        Args:
+            tool_filter: Selection of the tools to return. It is sent as
+                query parameters so the server can skip the other tools, and
+                applied again to the response
+        
+        Returns:
+            List of available tools
+        """
+        token = self._resolve_token()
+        
+        data = await self._get_tools_page(token, None, tool_filter)
+        tools = data["tools"]
+        cursor = next_cursor(data)
+        if cursor is not None:
+            # A paginated catalog is assembled from every page
+            tools = list(tools)
+            async for page in aiter_pages(lambda cursor: self._fetch_tools_page(token, cursor, tool_filter), cursor):
+                tools.extend(page)
+        self.available_tools = tools
+        if tool_filter is not None:
+            self.available_tools = tool_filter.apply(self.available_tools)
+        return self.available_tools
+    
+    async def list_tools_page(
+        self,
+        cursor: Optional[str] = None,
+        tool_filter: Optional[ToolFilter] = None
+    ) -> Page:
+        """Get one page of the tool catalog.
+        
+        Async counterpart of ``MCPClient.list_tools_page``.
+        
+        Args:
+            cursor: Cursor of the page, None for the first one
+            tool_filter: Selection of the tools to return. Its ``max_tools``
+                is not applied to single pages
+        
+        Returns:
+            Tuple of the page's tools and the cursor of the next page, None
+            on the last page
+        """
+        tools, cursor = await self._fetch_tools_page(self._resolve_token(), cursor, tool_filter)
+        if tool_filter is not None:
+            tools = [tool_info for tool_info in tools if tool_filter.matches(tool_info)]
+        return tools, cursor
+    
+    async def iter_tools(
+        self,
+        tool_filter: Optional[ToolFilter] = None,
+        prefetch: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the tool catalog one page at a time.
+        
+        Async counterpart of ``MCPClient.iter_tools``.
+        
+        Args:
+            tool_filter: Selection of the tools to yield
+            prefetch: Fetch the next page concurrently
+        
+        Returns:
+            Async iterator over the tool definitions
+        """
+        token = self._resolve_token()
+        remaining = tool_filter.max_tools if tool_filter is not None else None
+        pages = aiter_pages(lambda cursor: self._fetch_tools_page(token, cursor, tool_filter), prefetch=prefetch)
+        if remaining is not None and remaining <= 0:
+            return
+        try:
+            async for page in pages:
+                for tool_info in page:
+                    if tool_filter is None or tool_filter.matches(tool_info):
+                        yield tool_info
+                        if remaining is not None:
+                            remaining -= 1
+                            if remaining <= 0:
+                                return
+        finally:
+            await pages.aclose()
+    
+    async def _get_tools_page(self, token: str, cursor: Optional[str], tool_filter: Optional[ToolFilter]) -> Dict[str, Any]:
+        """Send ``/tools/list`` for one page of the catalog and decode it."""
+        headers = {"Authorization": f"Bearer {token}"}
+        params = tool_filter.query_params() if tool_filter is not None else {}
+        if cursor is not None:
+            params["cursor"] = cursor
+        kwargs = {"params": params} if params else {}
+        response = await self._request(
+            "get",
+            "/tools/list",
+            headers=headers,
+            **kwargs
+        )
+        response.raise_for_status()
+        return self._decode(response)
+    
+    async def _fetch_tools_page(self, token: str, cursor: Optional[str], tool_filter: Optional[ToolFilter]) -> Page:
+        """Get the tools of one catalog page and the next cursor."""
+        data = await self._get_tools_page(token, cursor, tool_filter)
+        return data["tools"], next_cursor(data)
+    
+    async def call_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool on the MCP server.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            deadline: Time budget for the call and its retries, in seconds or
+                as a ``Deadline``. It cannot extend a deadline bound with
+                ``use_deadline``
+        
+        Returns:
+            Result of the tool call
+        """
+        with use_deadline(deadline):
+            return await self._call_tool(tool_name, parameters, self._resolve_token())
+    
+    async def _call_tool(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Call a tool with an already resolved token, through the result cache."""
+        if self.metrics is None:
+            return await self._cached_tool_call(tool_name, parameters, token)
+        with track_tool_call(self.metrics, tool_name):
+            return await self._cached_tool_call(tool_name, parameters, token)
+    
+    async def _cached_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Serve a tool call from the result cache, or send it."""
+        ttl = None
+        if self.result_cache is not None:
+            ttl = self.result_cache.ttl_for(tool_name, self.get_tool_info(tool_name))
+        if ttl is not None:
+            key = self.result_cache.make_key(token, tool_name, parameters)
+            result = self.result_cache.get(key)
+            if result is MISSING:
+                result = await self._coalesced_tool_call(tool_name, parameters, token)
+                self.result_cache.set(key, result, ttl)
+            return result
+        return await self._coalesced_tool_call(tool_name, parameters, token)
+    
+    async def _coalesced_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Send a tool call, or wait for an identical one already in flight."""
+        if self.coalescer is None or not self.coalescer.enabled_for(tool_name, self.get_tool_info(tool_name)):
+            return await self._post_tool_call(tool_name, parameters, token)
+        return await self.coalescer.acall(
+            ToolResultCache.make_key(token, tool_name, parameters),
+            lambda: self._post_tool_call(tool_name, parameters, token)
+        )
+    
+    def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get a tool's definition from the catalog of the calling toolkit.
+        
+        Tools it does not list, e.g. outside a toolkit call, are looked up
+        in the last fetched catalog.
+        
+        Args:
+            tool_name: Name of the tool
+        
+        Returns:
+            Tool definition, or None if the tool is not in the catalog
+        """
+        tool_infos = get_bound_tool_infos()
+        if tool_infos is not None and tool_name in tool_infos:
+            return tool_infos[tool_name]
+        for tool_info in self.available_tools:
+            if tool_info.get("name") == tool_name:
+                return tool_info
+        return None
+    
+    async def _post_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Send a tool call to the MCP server."""
+        return (await self._send_tool_call(tool_name, parameters, token))["result"]
+    
+    async def _send_tool_call(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        token: str,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send a tool call and return the decoded response body."""
+        idempotent = False
+        if self.retry_policy is not None:
+            idempotent = self.retry_policy.is_idempotent_tool(tool_name, self.get_tool_info(tool_name))
+        headers = {"Authorization": f"Bearer {token}"}
+        body = {"name": tool_name, "parameters": parameters}
+        if cursor is not None:
+            body["cursor"] = cursor
+        if self.metrics is None:
+            response = await self._request(
+                "post",
+                "/tools/call",
+                idempotent=idempotent,
+                headers=headers,
+                json=body
+            )
+            response.raise_for_status()
+            return self._decode(response)
+        
+        trace = ConnectionTrace()
+        sent = time.perf_counter()
+        response = await self._request(
+            "post",
+            "/tools/call",
+            idempotent=idempotent,
+            headers=headers,
+            json=body,
+            extensions={"trace": trace.trace}
+        )
+        response.raise_for_status()
+        try:
+            response_seconds = response.elapsed.total_seconds()
+        except RuntimeError:
+            # Transports that do not close the stream leave elapsed unset
+            response_seconds = time.perf_counter() - sent
+        started = time.perf_counter()
+        data = self._decode(response)
+        self._record_response(
+            tool_name,
+            response,
+            response_seconds,
+            time.perf_counter() - started,
+            len(response.content),
+            trace
+        )
+        return data
+    
+    def _record_response(
+        self,
+        tool_name: str,
+        response: Any,
+        response_seconds: float,
+        decode_seconds: float,
+        response_bytes: int,
+        trace: ConnectionTrace
+    ) -> None:
+        """Record the phases and sizes of a response, with its connection setup."""
+        record_response(
+            self.metrics,
+            tool_name,
+            response_seconds,
+            decode_seconds,
+            response.headers,
+            len(response.request.content),
+            response_bytes,
+            new_connection=trace.connect_seconds is not None,
+            connect_seconds=trace.connect_seconds
+        )
+    
+    async def call_tool_page(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        cursor: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Page:
+        """Call a tool for one page of its result.
+        
+        Async counterpart of ``MCPClient.call_tool_page``.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            cursor: Cursor of the page, None for the first one
+            deadline: Time budget for the call and its retries
+        
+        Returns:
+            Tuple of the page's result and the cursor of the next page, None
+            on the last page or when the server does not paginate the tool
+        """
+        with use_deadline(deadline):
+            return await self._call_tool_page(tool_name, parameters, self._resolve_token(), cursor)
+    
+    async def _call_tool_page(self, tool_name: str, parameters: Dict[str, Any], token: str, cursor: Optional[str]) -> Page:
+        """Get one page of a tool result with an already resolved token."""
+        if self.metrics is None:
+            data = await self._send_tool_call(tool_name, parameters, token, cursor)
+        else:
+            with track_tool_call(self.metrics, tool_name):
+                data = await self._send_tool_call(tool_name, parameters, token, cursor)
+        return data["result"], next_cursor(data)
+    
+    async def call_tool_paged(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        prefetch: bool = True,
+        max_pages: Optional[int] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> AsyncIterator[Any]:
+        """Call a tool and iterate over the records of every result page.
+        
+        Async counterpart of ``MCPClient.call_tool_paged``.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            prefetch: Fetch the next page concurrently
+            max_pages: Maximum number of pages to fetch
+            deadline: Time budget for fetching every page, in seconds or as a
+                ``Deadline``
+        
+        Returns:
+            Async iterator over the result records. A page whose result is
+            not a list is yielded as one record
+        """
+        token = self._resolve_token()
+        if deadline is not None and not isinstance(deadline, Deadline):
+            deadline = Deadline(deadline)
+        
+        async def fetch(cursor):
+            with use_deadline(deadline):
+                return await self._call_tool_page(tool_name, parameters, token, cursor)
+        
+        pages = aiter_pages(fetch, prefetch=prefetch, max_pages=max_pages)
+        try:
+            async for page in pages:
+                if isinstance(page, list):
+                    for record in page:
+                        yield record
+                else:
+                    yield page
+        finally:
+            await pages.aclose()
+    
+    async def call_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> AsyncIterator[Any]:
+        """Call a tool and iterate over its result records as they arrive.
+        
+        Async counterpart of ``MCPClient.call_tool_stream``.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            deadline: Time budget for sending the call and receiving the
+                response headers
+        
+        Returns:
+            Async iterator over the result records
+        """
+        with use_deadline(deadline):
+            response, opened = await self._open_tool_stream(tool_name, parameters, self._resolve_token())
+        records = self._stream_records(response)
+        decode_seconds = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    record = await records.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    decode_seconds += time.perf_counter() - started
+                yield record
+        finally:
+            await records.aclose()
+            await response.aclose()
+            if opened is not None:
+                self._record_stream(tool_name, response, decode_seconds, opened)
+    
+    async def _stream_records(self, response: Any) -> AsyncIterator[Any]:
+        """Decode the records of a streamed response."""
+        if is_ndjson(response.headers):
+            async for line in response.aiter_lines():
+                for record in iter_ndjson((line,), self.codec.loads):
+                    yield record
+        else:
+            await response.aread()
+            result = self._decode(response)["result"]
+            if isinstance(result, list):
+                for record in result:
+                    yield record
+            else:
+                yield result
+    
+    async def call_tool_preview(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        max_items: int,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool and keep only the first records of its result.
+        
+        Async counterpart of ``MCPClient.call_tool_preview``.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            max_items: Maximum number of records to return
+            deadline: Time budget for sending the call and receiving the
+                response headers
+        
+        Returns:
+            The records when they all fit, otherwise a dict with the first
+            ``max_items`` records and a truncation note. A result that is not
+            a list is returned unchanged
+        """
+        with use_deadline(deadline):
+            response, opened = await self._open_tool_stream(tool_name, parameters, self._resolve_token())
+        started = time.perf_counter()
+        try:
+            if not is_ndjson(response.headers):
+                await response.aread()
+                result = self._decode(response)["result"]
+                if not isinstance(result, list):
+                    return result
+                return truncate_records(iter(result), max_items)
+            
+            records = []
+            async for line in response.aiter_lines():
+                for record in iter_ndjson((line,), self.codec.loads):
+                    records.append(record)
+                if len(records) > max_items:
+                    break
+            return truncate_records(iter(records), max_items)
+        finally:
+            await response.aclose()
+            if opened is not None:
+                self._record_stream(tool_name, response, time.perf_counter() - started, opened)
+    
+    async def _open_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        token: str
+    ) -> Tuple[Any, Optional[Tuple[float, ConnectionTrace]]]:
+        """Send a tool call asking for a streamed result.
+        
+        Returns:
+            Tuple of the response, with its body left unread, and when
+            metrics are recorded, the time to its headers and the trace of
+            its connection
+        """
+        if self.metrics is None:
+            return await self._send_stream_call(tool_name, parameters, token), None
+        trace = ConnectionTrace()
+        with track_tool_call(self.metrics, tool_name):
+            sent = time.perf_counter()
+            response = await self._send_stream_call(tool_name, parameters, token, {"trace": trace.trace})
+            return response, (time.perf_counter() - sent, trace)
+    
+    def _record_stream(
+        self,
+        tool_name: str,
+        response: Any,
+        decode_seconds: float,
+        opened: Tuple[float, ConnectionTrace]
+    ) -> None:
+        """Record the phases and sizes of a streamed response once it is read."""
+        response_seconds, trace = opened
+        self._record_response(tool_name, response, response_seconds, decode_seconds, response.num_bytes_downloaded, trace)
+    
+    async def _send_stream_call(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        token: str,
+        extensions: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Send a streamed tool call and check its status."""
+        idempotent = False
+        if self.retry_policy is not None:
+            idempotent = self.retry_policy.is_idempotent_tool(tool_name, self.get_tool_info(tool_name))
+        headers = {"Authorization": f"Bearer {token}", "Accept": STREAM_ACCEPT}
+        response = await self._request(
+            "post",
+            "/tools/call",
+            idempotent=idempotent,
+            stream=True,
+            headers=headers,
+            json={"name": tool_name, "parameters": parameters},
+            extensions=extensions
+        )
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
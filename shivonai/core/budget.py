@@ -0,0 +1,426 @@
+"""
+Size budgets for the tool results handed to the agent.
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from shivonai.core.codec import JSONCodec, get_codec
+
+# Name of the local tool the agent pages through truncated results with
+PAGE_TOOL_NAME = "read_more_results"
+
+_LIMITS = ("max_bytes", "max_tokens", "max_items", "max_string_chars", "fields")
+
+
+class ResultStore:
+    """LRU + TTL store of the full lists behind truncated results."""
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 900.0):
+        """Initialize the store.
+        
+        Args:
+            max_entries: Maximum number of stored lists
+            ttl: Seconds a list can be paged through
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, tool_name: str, items: List[Any]) -> str:
+        """Store a list and get its handle."""
+        handle = f"r_{secrets.token_hex(6)}"
+        with self._lock:
+            self._entries[handle] = (tool_name, items, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return handle
+    
+    def get(self, handle: str) -> Optional[Tuple[str, List[Any]]]:
+        """Get the tool name and list stored under a handle, if still there."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                del self._entries[handle]
+                return None
+            self._entries.move_to_end(handle)
+            return entry[0], entry[1]
+
+
+class _State:
+    """Budget left while shaping one result."""
+    
+    __slots__ = ("tool_name", "limits", "bytes_left", "tokens_left")
+    
+    def __init__(self, tool_name: str, limits: Dict[str, Any]):
+        self.tool_name = tool_name
+        self.limits = limits
+        self.bytes_left = limits["max_bytes"]
+        self.tokens_left = limits["max_tokens"]
+
+
+class OutputBudget:
+    """Post-processing of tool results before they reach the agent.
+    
+    Results are shaped in a single pass: records (dicts inside lists) are
+    projected to ``fields``, long strings are cut, and lists stop growing
+    once ``max_items`` records or the byte/token budget is reached. A cut
+    list is replaced by its first records, the number left out, and a
+    handle the agent passes to the ``read_more_results`` tool to page
+    through the rest. Each kept record is encoded once, to measure it.
+    Values outside lists are charged as well, with strings cut to the budget
+    left, and a first record larger than the budget is cut down to it.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        max_items: Optional[int] = None,
+        max_string_chars: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        tools: Optional[Dict[str, Dict[str, Any]]] = None,
+        chars_per_token: float = 4.0,
+        token_counter: Optional[Callable[[str], int]] = None,
+        store: Optional[ResultStore] = None,
+        paging: bool = True,
+        codec: Optional[JSONCodec] = None
+    ):
+        """Initialize the budget.
+        
+        Args:
+            max_bytes: Maximum size of a result, measured on its JSON encoding
+            max_tokens: Maximum number of tokens of a result
+            max_items: Maximum number of records kept from any list
+            max_string_chars: Maximum length of any string
+            fields: Keys kept in records, dotted for nested keys
+                (``"address.city"``). Every key is kept when None
+            tools: Per-tool overrides of the limits above, e.g.
+                ``{"search_listings": {"max_items": 20, "fields": ["id"]}}``
+            chars_per_token: Bytes per token used to estimate tokens when no
+                ``token_counter`` is given
+            token_counter: Callable counting the tokens of a text, e.g. a
+                tiktoken encoder's ``lambda text: len(enc.encode(text))``
+            store: Store of the lists behind truncated results. Defaults to
+                a private one
+            paging: Give truncated lists a handle for ``read_more_results``
+            codec: JSON codec used to measure records
+        """
+        self.defaults = {
+            "max_bytes": max_bytes,
+            "max_tokens": max_tokens,
+            "max_items": max_items,
+            "max_string_chars": max_string_chars,
+            "fields": fields,
+        }
+        self.tools = dict(tools or {})
+        for overrides in self.tools.values():
+            unknown = set(overrides) - set(_LIMITS)
+            if unknown:
+                raise ValueError(f"Unknown budget limits: {', '.join(sorted(unknown))}")
+        self.chars_per_token = chars_per_token
+        self.token_counter = token_counter
+        self.store = (store if store is not None else ResultStore()) if paging else None
+        self.codec = codec if codec is not None else get_codec()
+    
+    def limits_for(self, tool_name: str) -> Dict[str, Any]:
+        """Get the limits applying to a tool's results."""
+        limits = dict(self.defaults)
+        limits.update(self.tools.get(tool_name, {}))
+        return limits
+    
+    def apply(self, tool_name: str, result: Any) -> Any:
+        """Shape a tool result to fit the tool's budget.
+        
+        Args:
+            tool_name: Name of the tool that returned the result
+            result: Decoded tool result
+        
+        Returns:
+            The result, unchanged when it fits
+        """
+        return self._shape(result, _State(tool_name, self.limits_for(tool_name)), top=True)
+    
+    def page(self, handle: str, offset: int = 0, limit: Optional[int] = None) -> Any:
+        """Get more records of a truncated result.
+        
+        Args:
+            handle: Handle of the truncated list
+            offset: Index of the first record to return
+            limit: Maximum number of records to return
+        
+        Returns:
+            The records, shaped with the budget of the tool that returned
+            them, or an error message when the handle is unknown or expired
+        """
+        entry = self.store.get(handle) if self.store is not None else None
+        if entry is None:
+            return {"error": f"Unknown or expired result handle {handle!r}. Call the tool again."}
+        tool_name, items = entry
+        state = _State(tool_name, self.limits_for(tool_name))
+        offset = max(0, int(offset or 0))
+        if limit:
+            limit = int(limit)
+            max_items = state.limits["max_items"]
+            state.limits["max_items"] = min(limit, max_items) if max_items else limit
+        return self._shape_list(items, state, top=True, offset=offset, handle=handle)
+    
+    def page_tool_info(self) -> Dict[str, Any]:
+        """Definition of the local tool paging through truncated results."""
+        return {
+            "name": PAGE_TOOL_NAME,
+            "description": "Read more records of a tool result that was cut short. "
+                           "Pass the handle and the offset given in the truncated result.",
+            "parameters": [
+                {"name": "handle", "type": "string", "description": "Handle of the truncated result", "required": True},
+                {"name": "offset", "type": "integer", "description": "Index of the first record to read", "required": True},
+                {"name": "limit", "type": "integer", "description": "Maximum number of records to read", "required": False},
+            ],
+            "annotations": {"readOnlyHint": True},
+        }
+    
+    def _measure(self, value: Any) -> Tuple[int, float]:
+        """Get the size in bytes and tokens of a value's JSON encoding."""
+        text = self.codec.dumps(value)
+        if self.token_counter is not None:
+            return len(text), self.token_counter(text.decode("utf-8"))
+        return len(text), len(text) / self.chars_per_token
+    
+    def _fits(self, size: int, tokens: float, state: _State) -> bool:
+        if state.bytes_left is not None and size > state.bytes_left:
+            return False
+        return state.tokens_left is None or tokens <= state.tokens_left
+    
+    def _charge(self, value: Any, state: _State, force: bool = False) -> bool:
+        """Take a value's size from the budget, if it fits or ``force`` is set."""
+        if state.bytes_left is None and state.tokens_left is None:
+            return True
+        size, tokens = self._measure(value)
+        if not force and not self._fits(size, tokens, state):
+            return False
+        if state.bytes_left is not None:
+            state.bytes_left -= size
+        if state.tokens_left is not None:
+            state.tokens_left -= tokens
+        return True
+    
+    def _room(self, state: _State) -> Optional[int]:
+        """Get the number of characters left in the budget, or None if unlimited."""
+        room = None
+        if state.bytes_left is not None:
+            room = state.bytes_left
+        if state.tokens_left is not None:
+            chars = int(state.tokens_left * self.chars_per_token)
+            room = chars if room is None else min(room, chars)
+        return None if room is None else max(0, int(room))
+    
+    def _shape(self, value: Any, state: _State, top: bool = False, in_record: bool = False) -> Any:
+        # Outside records every value is charged as it is shaped, records are
+        # charged as a whole by the list holding them
+        if isinstance(value, list):
+            return self._shape_list(value, state, top=top, in_record=in_record)
+        if isinstance(value, dict):
+            if in_record:
+                return {key: self._shape(item, state, in_record=True) for key, item in value.items()}
+            self._charge({}, state, force=True)
+            shaped = {}
+            for key, item in value.items():
+                self._charge(key, state, force=True)
+                shaped[key] = self._shape(item, state)
+            return shaped
+        if isinstance(value, str):
+            return self._shape_string(value, state, in_record)
+        if not in_record:
+            self._charge(value, state, force=True)
+        return value
+    
+    def _shape_string(self, value: str, state: _State, in_record: bool) -> str:
+        limit = state.limits["max_string_chars"]
+        room = None if in_record else self._room(state)
+        if room is not None and len(value) > room:
+            # Leave room for the quotes and the note on the cut
+            room = max(0, room - len(f'"... ({len(value)} more chars)"'))
+            limit = room if limit is None else min(limit, room)
+        value = _cut_string(value, limit)
+        if not in_record:
+            self._charge(value, state, force=True)
+        return value
+    
+    def _shape_record(self, record: Any, state: _State) -> Any:
+        fields = state.limits["fields"]
+        if fields and isinstance(record, dict):
+            record = project(record, fields)
+        return self._shape(record, state, in_record=True)
+    
+    def _fit_record(self, record: Any, state: _State) -> Any:
+        """Cut the strings and lists of a record until it fits the budget.
+        
+        The longest cut that fits is found by bisection. A record that does
+        not fit even with every string and list emptied is kept in that form,
+        so paging still makes progress.
+        """
+        low, high = 0, _longest(record)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._fits(*self._measure(_squeeze(record, middle)), state):
+                low = middle
+            else:
+                high = middle - 1
+        record = _squeeze(record, low)
+        self._charge(record, state, force=True)
+        return record
+    
+    def _shape_list(
+        self,
+        items: List[Any],
+        state: _State,
+        top: bool = False,
+        in_record: bool = False,
+        offset: int = 0,
+        handle: Optional[str] = None
+    ) -> Any:
+        max_items = state.limits["max_items"]
+        end = len(items) if max_items is None else min(len(items), offset + max_items)
+        kept = []
+        for index in range(offset, end):
+            record = self._shape_record(items[index], state)
+            # Lists nested in records are only cut by count, the enclosing
+            # record is charged as a whole. A first record over the budget is
+            # cut down to it rather than dropped, so paging makes progress
+            if not in_record and not self._charge(record, state):
+                if kept:
+                    break
+                record = self._fit_record(record, state)
+            kept.append(record)
+        
+        more = len(items) - offset - len(kept)
+        if more <= 0 and offset == 0:
+            return kept
+        shaped = {"items": kept, "offset": offset, "more": more}
+        if more <= 0:
+            return shaped
+        shaped["truncated"] = True
+        if self.store is not None and not in_record:
+            if handle is None:
+                handle = self.store.put(state.tool_name, items)
+            shaped["handle"] = handle
+            shaped["note"] = (
+                f"{more} more records. Call {PAGE_TOOL_NAME} with handle={handle!r} "
+                f"and offset={offset + len(kept)} to read them."
+            )
+        else:
+            shaped["note"] = f"{more} more records not shown."
+        return shaped
+
+
+def _cut_string(value: str, limit: Optional[int]) -> str:
+    if limit is None or len(value) <= limit:
+        return value
+    return f"{value[:limit]}... ({len(value) - limit} more chars)"
+
+
+def _longest(value: Any) -> int:
+    """Get the length of the longest string or list in a value."""
+    if isinstance(value, dict):
+        return max((_longest(item) for item in value.values()), default=0)
+    if isinstance(value, list):
+        return max([len(value)] + [_longest(item) for item in value])
+    if isinstance(value, str):
+        return len(value)
+    return 0
+
+
+def _squeeze(value: Any, limit: int) -> Any:
+    """Cut every string and list in a value to at most ``limit`` items."""
+    if isinstance(value, dict):
+        return {key: _squeeze(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_squeeze(item, limit) for item in value[:limit]]
+        if len(value) <= limit:
+            return items
+        more = len(value) - limit
+        return {"items": items, "offset": 0, "more": more, "truncated": True, "note": f"{more} more records not shown."}
+    if isinstance(value, str):
+        return _cut_string(value, limit)
+    return value
+
+
+def project(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Keep only some keys of a record.
+    
+    Args:
+        record: Record to project
+        fields: Keys to keep, dotted for nested keys
+    
+    Returns:
+        New record with the kept keys, in the order of ``fields``
+    """
+    projected = {}
+    for field in fields:
+        source, target = record, projected
+        parts = field.split(".")
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(part, {})
+        else:
+            if parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    return projected
+
+
+def with_page_tool(tool_infos: List[Dict[str, Any]], budget: Optional[OutputBudget]) -> List[Dict[str, Any]]:
+    """Add the ``read_more_results`` tool to a catalog when the budget pages.
+    
+    Args:
+        tool_infos: Tool definitions from the catalog
+        budget: Budget applied to the toolkit's results, or None
+    
+    Returns:
+        The catalog, extended when truncated results can be paged
+    """
+    if budget is None or budget.store is None:
+        return tool_infos
+    return list(tool_infos) + [budget.page_tool_info()]
+
+
+def budget_callers(
+    budget: OutputBudget,
+    call_tool: Callable[..., Any],
+    acall_tool: Optional[Callable[..., Any]]
+) -> Tuple[Callable[..., Any], Optional[Callable[..., Any]]]:
+    """Wrap toolkit callables so results are shaped by a budget.
+    
+    Calls to ``read_more_results`` are answered locally from the budget's
+    store.
+    
+    Args:
+        budget: Budget applied to the results
+        call_tool: Sync callable taking the tool name and its parameters
+        acall_tool: Async callable with the same signature, or None
+    
+    Returns:
+        Tuple of the wrapped sync and async callables
+    """
+    def page(parameters):
+        return budget.page(parameters.get("handle", ""), parameters.get("offset", 0), parameters.get("limit"))
+    
+    def budgeted_call_tool(tool_name, parameters, *args, **kwargs):
+        if tool_name == PAGE_TOOL_NAME and budget.store is not None:
+            return page(parameters)
+        return budget.apply(tool_name, call_tool(tool_name, parameters, *args, **kwargs))
+    
+    budgeted_acall_tool = None
+    if acall_tool is not None:
+        async def budgeted_acall_tool(tool_name, parameters, *args, **kwargs):
+            if tool_name == PAGE_TOOL_NAME and budget.store is not None:
+                return page(parameters)
+            return budget.apply(tool_name, await acall_tool(tool_name, parameters, *args, **kwargs))
+    
+    return budgeted_call_tool, budgeted_acall_tool
@@ -0,0 +1,256 @@
+"""
+Process-wide cache of MCP tool catalogs.
+"""
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+# Catalog of the toolkit making the current call, by tool name
+_tool_infos = contextvars.ContextVar("shivonai_tool_infos", default=None)
+
+
+def catalog_version(tools: List[Dict[str, Any]]) -> str:
+    """Compute a stable version hash of a tool catalog.
+    
+    Args:
+        tools: List of tool definitions
+    
+    Returns:
+        Hex digest identifying the catalog contents
+    """
+    payload = json.dumps(tools, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CatalogEntry:
+    """A cached tool catalog and the validators used to revalidate it."""
+    
+    def __init__(
+        self,
+        tools: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        version: Optional[str] = None,
+        fetched_at: Optional[float] = None
+    ):
+        self.tools = tools
+        self.etag = etag
+        self.version = version or catalog_version(tools)
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+    
+    def validator(self) -> str:
+        """Value sent as ``If-None-Match`` when revalidating the catalog."""
+        return self.etag or f'"{self.version}"'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tools": self.tools,
+            "etag": self.etag,
+            "version": self.version,
+            "fetched_at": self.fetched_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CatalogEntry":
+        return cls(
+            data["tools"],
+            etag=data.get("etag"),
+            version=data.get("version"),
+            fetched_at=data.get("fetched_at")
+        )
+
+
+class CatalogCache:
+    """Thread-safe tool catalog cache keyed by ``(base_url, token)``.
+    
+    Catalogs fetched with a tool filter are stored under an additional
+    ``scope`` (the filter's key) so they never shadow the full catalog.
+    
+    Entries younger than ``ttl`` seconds are served without contacting the
+    server. Older entries are kept so the next fetch can be a conditional
+    request. With ``persist_dir`` set, entries are also written to disk (file
+    names are hashes, tokens are never stored) so a cold worker can start
+    from the last known catalog.
+    """
+    
+    def __init__(self, ttl: float = 300.0, persist_dir: Optional[str] = None):
+        """Initialize the catalog cache.
+        
+        Args:
+            ttl: Seconds a catalog is served without revalidation
+            persist_dir: Directory used to persist catalogs across processes
+        """
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(base_url: str, token: str, scope: str = "") -> Tuple[str, ...]:
+        if scope:
+            return (base_url.rstrip("/"), token, scope)
+        return (base_url.rstrip("/"), token)
+    
+    def _path(self, key: Tuple[str, ...]) -> str:
+        digest = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"catalog-{digest}.json")
+    
+    def get(self, base_url: str, token: str, scope: str = "") -> Optional[CatalogEntry]:
+        """Get the cached catalog entry, fresh or stale.
+        
+        Args:
+            base_url: URL of the MCP server
+            token: Authentication token
+            scope: Key of the tool filter the catalog was fetched with
+        
+        Returns:
+            Cached entry, or None if nothing is known for this key
+        """
+        key = self._key(base_url, token, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.persist_dir:
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    entry = self._entries.setdefault(key, entry)
+        return entry
+    
+    def is_fresh(self, entry: CatalogEntry) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl
+    
+    def set(self, base_url: str, token: str, entry: CatalogEntry, scope: str = "") -> None:
+        """Store a catalog entry.
+        
+        Args:
+            base_url: URL of the MCP server
+            token: Authentication token
+            entry: Catalog entry to store
+            scope: Key of the tool filter the catalog was fetched with
+        """
+        key = self._key(base_url, token, scope)
+        with self._lock:
+            self._entries[key] = entry
+        if self.persist_dir:
+            self._save(key, entry)
+    
+    def touch(self, base_url: str, token: str, entry: CatalogEntry, scope: str = "") -> None:
+        """Mark an entry as revalidated by the server."""
+        entry.fetched_at = time.time()
+        self.set(base_url, token, entry, scope)
+    
+    def invalidate(self, base_url: str, token: str, scope: str = "") -> None:
+        """Drop a catalog from the cache and from disk."""
+        key = self._key(base_url, token, scope)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.persist_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+    
+    def clear(self) -> None:
+        """Drop every in-memory catalog."""
+        with self._lock:
+            self._entries.clear()
+    
+    def _load(self, key: Tuple[str, ...]) -> Optional[CatalogEntry]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return CatalogEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _save(self, key: Tuple[str, ...], entry: CatalogEntry) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Persistence is best effort, the in-memory entry is still valid
+            pass
+
+
+_catalog_cache = CatalogCache()
+
+
+def get_catalog_cache() -> CatalogCache:
+    """Get the process-wide catalog cache shared by all toolkits."""
+    return _catalog_cache
+
+
+def configure_catalog_cache(
+    ttl: Optional[float] = None,
+    persist_dir: Optional[str] = None
+) -> CatalogCache:
+    """Configure the process-wide catalog cache.
+    
+    Args:
+        ttl: Seconds a catalog is served without revalidation
+        persist_dir: Directory used to persist catalogs across processes
+    
+    Returns:
+        The process-wide catalog cache
+    """
+    if ttl is not None:
+        _catalog_cache.ttl = ttl
+    if persist_dir is not None:
+        _catalog_cache.persist_dir = persist_dir
+    return _catalog_cache
+
+
+def get_bound_tool_infos() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Get the catalog bound by the toolkit making the current call.
+    
+    Clients read tool metadata (idempotency, result cache and coalescing
+    hints) from it rather than from their last fetched catalog, which a
+    client shared between tenants overwrites on every ``connect()``.
+    
+    Returns:
+        Tool definitions by name, or None outside a toolkit call
+    """
+    return _tool_infos.get()
+
+
+def catalog_callers(
+    tool_infos: List[Dict[str, Any]],
+    call_tool: Callable[..., Any],
+    acall_tool: Optional[Callable[..., Any]]
+) -> Tuple[Callable[..., Any], Optional[Callable[..., Any]]]:
+    """Wrap toolkit callables so each call sees the toolkit's own catalog.
+    
+    Args:
+        tool_infos: Tool definitions the toolkit was built from
+        call_tool: Sync callable taking the tool name and its parameters
+        acall_tool: Async callable with the same signature, or None
+    
+    Returns:
+        Tuple of the wrapped sync and async callables
+    """
+    by_name = {tool_info["name"]: tool_info for tool_info in tool_infos}
+    
+    def bound_call_tool(*args, **kwargs):
+        reset_token = _tool_infos.set(by_name)
+        try:
+            return call_tool(*args, **kwargs)
+        finally:
+            _tool_infos.reset(reset_token)
+    
+    bound_acall_tool = None
+    if acall_tool is not None:
+        async def bound_acall_tool(*args, **kwargs):
+            reset_token = _tool_infos.set(by_name)
+            try:
+                return await acall_tool(*args, **kwargs)
+            finally:
+                _tool_infos.reset(reset_token)
+    
+    return bound_call_tool, bound_acall_tool
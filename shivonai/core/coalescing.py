@@ -0,0 +1,161 @@
+"""
+Coalescing of identical in-flight tool calls.
+"""
+import asyncio
+import threading
+from typing import Dict, Any, Awaitable, Callable, Iterable, Optional
+
+from shivonai.core.deadline import DeadlineExceeded, get_deadline
+from shivonai.core.result_cache import MISSING
+
+
+class _Flight:
+    """A tool call shared by every caller waiting on it."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CallCoalescer:
+    """Single-flight for identical concurrent tool calls.
+    
+    While a call is in flight, identical calls (same token, tool and
+    parameters) wait for it instead of reaching the server, and all of them
+    get its result or its error. Only opted-in tools are coalesced: those
+    listed in ``tools``, and with ``read_only`` those the catalog marks
+    ``readOnlyHint``. Tools the catalog marks as destructive or not
+    read-only are never coalesced.
+    """
+    
+    def __init__(self, tools: Optional[Iterable[str]] = None, read_only: bool = False):
+        """Initialize the coalescer.
+        
+        Args:
+            tools: Names of the tools whose calls are coalesced
+            read_only: Also coalesce every tool the catalog marks read-only
+        """
+        self.tools = frozenset(tools or ())
+        self.read_only = read_only
+        self.coalesced = 0
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+    
+    def enabled_for(self, tool_name: str, tool_info: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether calls to a tool are coalesced.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_info: Tool definition from the catalog, if known
+        
+        Returns:
+            True if identical concurrent calls share one request
+        """
+        annotations = (tool_info or {}).get("annotations") or {}
+        if annotations.get("destructiveHint") or annotations.get("readOnlyHint") is False:
+            return False
+        return tool_name in self.tools or bool(self.read_only and annotations.get("readOnlyHint"))
+    
+    def call(self, key: str, call: Callable[[], Any]) -> Any:
+        """Make a call, or wait for the identical call already in flight.
+        
+        A waiter gives up when the deadline bound with ``use_deadline``
+        expires, without cancelling the shared call.
+        
+        Args:
+            key: Key identifying the call, e.g. ``ToolResultCache.make_key``
+            call: Callable making the actual tool call
+        
+        Returns:
+            Result of the call. It is shared between callers and must not
+            be modified
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            return self._wait(flight)
+        
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+    
+    def join(self, key: str) -> Any:
+        """Wait for the identical call in flight, if there is one.
+        
+        Batches use it to leave out of their request the calls another
+        caller is already making.
+        
+        Args:
+            key: Key identifying the call
+        
+        Returns:
+            Result of the call in flight, or ``MISSING`` if there is none
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                return MISSING
+            self.coalesced += 1
+        return self._wait(flight)
+    
+    @staticmethod
+    def _wait(flight: _Flight) -> Any:
+        deadline = get_deadline()
+        if not flight.done.wait(deadline.remaining() if deadline is not None else None):
+            raise DeadlineExceeded("Deadline exceeded while waiting for a coalesced tool call")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    
+    async def acall(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Asyncio counterpart of ``call``.
+        
+        The shared call runs as a task, so a caller being cancelled does not
+        cancel it for the others.
+        
+        Args:
+            key: Key identifying the call
+            call: Coroutine function making the actual tool call
+        
+        Returns:
+            Result of the call, shared between callers
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (key, id(loop))
+        task = self._async_flights.get(flight_key)
+        if task is None:
+            async def run():
+                try:
+                    return await call()
+                finally:
+                    self._async_flights.pop(flight_key, None)
+            
+            task = self._async_flights[flight_key] = loop.create_task(run())
+            # Retrieve the error even if every waiter gave up
+            task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        else:
+            with self._lock:
+                self.coalesced += 1
+        
+        deadline = get_deadline()
+        if deadline is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("Deadline exceeded while waiting for a coalesced tool call")
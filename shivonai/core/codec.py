@@ -0,0 +1,139 @@
+"""
+JSON codec with optional fast backends.
+"""
+import json
+from typing import Any, Optional, Union
+
+# Backends tried in order when none is requested
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """JSON encoder and decoder backed by orjson, msgspec or the stdlib.
+    
+    Responses are decoded straight from their bytes, and encoding is compact
+    unless indentation is asked for. Values JSON cannot represent are
+    encoded as their ``str()``.
+    """
+    
+    def __init__(self, backend: Optional[str] = None):
+        """Initialize the codec.
+        
+        Args:
+            backend: ``"orjson"``, ``"msgspec"`` or ``"json"``. Defaults to
+                the fastest one installed
+        """
+        if backend is None:
+            for name in BACKENDS:
+                try:
+                    self._load_backend(name)
+                except ImportError:
+                    continue
+                backend = name
+                break
+        else:
+            self._load_backend(backend)
+        self.backend = backend
+    
+    def _load_backend(self, backend: str) -> None:
+        if backend == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                raise ImportError(
+                    "Could not import orjson. "
+                    "Please install it with `pip install orjson`."
+                )
+            self._loads = orjson.loads
+            self._dumps = lambda obj: orjson.dumps(obj, default=str)
+            self._dumps_indented = lambda obj: orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+        elif backend == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                raise ImportError(
+                    "Could not import msgspec. "
+                    "Please install it with `pip install msgspec`."
+                )
+            decoder = msgspec.json.Decoder()
+            encoder = msgspec.json.Encoder(enc_hook=str)
+            self._loads = decoder.decode
+            self._dumps = encoder.encode
+            self._dumps_indented = lambda obj: msgspec.json.format(encoder.encode(obj), indent=2)
+        elif backend == "json":
+            self._loads = json.loads
+            self._dumps = lambda obj: json.dumps(
+                obj, separators=(",", ":"), ensure_ascii=False, default=str
+            ).encode("utf-8")
+            self._dumps_indented = lambda obj: json.dumps(
+                obj, indent=2, ensure_ascii=False, default=str
+            ).encode("utf-8")
+        else:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document.
+        
+        Args:
+            data: JSON document, as bytes or str
+        
+        Returns:
+            Decoded value
+        """
+        return self._loads(data)
+    
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        """Encode a value as UTF-8 JSON.
+        
+        Args:
+            obj: Value to encode
+            indent: Indent the output by two spaces instead of encoding it
+                compactly
+        
+        Returns:
+            JSON document
+        """
+        if indent:
+            return self._dumps_indented(obj)
+        return self._dumps(obj)
+    
+    def dumps_text(self, obj: Any, indent: bool = False) -> str:
+        """Encode a value as a JSON string, e.g. for a model prompt.
+        
+        Args:
+            obj: Value to encode
+            indent: Indent the output by two spaces instead of encoding it
+                compactly
+        
+        Returns:
+            JSON document
+        """
+        return self.dumps(obj, indent=indent).decode("utf-8")
+
+
+_codec = None
+
+
+def get_codec() -> JSONCodec:
+    """Get the process-wide codec, using the fastest installed backend."""
+    global _codec
+    if _codec is None:
+        _codec = JSONCodec()
+    return _codec
+
+
+def configure_codec(backend: Optional[str] = None) -> JSONCodec:
+    """Replace the process-wide codec.
+    
+    Clients created afterwards use the new codec.
+    
+    Args:
+        backend: ``"orjson"``, ``"msgspec"`` or ``"json"``. Defaults to the
+            fastest one installed
+    
+    Returns:
+        The new codec
+    """
+    global _codec
+    _codec = JSONCodec(backend)
+    return _codec
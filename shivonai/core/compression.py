@@ -0,0 +1,246 @@
+"""
+Compression and encoding negotiation for MCP requests and responses.
+"""
+import gzip
+from typing import Dict, Any, Callable, Iterable, Optional, Sequence, Tuple
+
+from shivonai.core.codec import JSONCodec
+
+# Response encodings in order of preference
+RESPONSE_ENCODINGS = ("zstd", "br", "gzip")
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# Accept header asking for MessagePack, falling back to JSON
+MSGPACK_ACCEPT = "application/msgpack, application/json;q=0.9"
+
+# Status answered by servers that cannot read a compressed request body
+UNSUPPORTED_MEDIA_TYPE = 415
+
+
+def requests_encodings() -> Tuple[str, ...]:
+    """Get the response encodings ``requests`` can decode in this process."""
+    try:
+        from urllib3.response import HTTPResponse
+    except ImportError:
+        return ("gzip", "deflate")
+    return tuple(HTTPResponse.CONTENT_DECODERS)
+
+
+def httpx_encodings() -> Tuple[str, ...]:
+    """Get the response encodings ``httpx`` can decode in this process."""
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:
+        return ("gzip", "deflate")
+    return tuple(SUPPORTED_DECODERS)
+
+
+def _compressor(encoding: str, level: Optional[int]) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        return lambda data: gzip.compress(data, 6 if level is None else level)
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "Could not import zstandard. "
+                "Please install it with `pip install zstandard`."
+            )
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.compress
+    if encoding == "br":
+        try:
+            import brotli
+        except ImportError:
+            raise ImportError(
+                "Could not import brotli. "
+                "Please install it with `pip install brotli`."
+            )
+        return lambda data: brotli.compress(data, quality=5 if level is None else level)
+    raise ValueError(f"Unknown request encoding: {encoding}")
+
+
+class Compression:
+    """Wire encoding settings of a client.
+    
+    Responses are requested with ``Accept-Encoding`` listing the preferred
+    encodings the HTTP library can decode, so a server can pick zstd or
+    brotli over gzip. Request bodies of at least ``min_size`` bytes are
+    compressed with ``request_encoding``; a server answering 415 gets
+    uncompressed bodies from then on. With ``msgpack``, MessagePack is
+    accepted alongside JSON, and once the server has answered with it,
+    request bodies are sent as MessagePack too.
+    """
+    
+    def __init__(
+        self,
+        response_encodings: Sequence[str] = RESPONSE_ENCODINGS,
+        request_encoding: Optional[str] = None,
+        min_size: int = 1024,
+        level: Optional[int] = None,
+        msgpack: bool = False
+    ):
+        """Initialize the settings.
+        
+        Args:
+            response_encodings: Response encodings to accept, most preferred
+                first. Encodings the HTTP library cannot decode are skipped
+            request_encoding: ``"gzip"``, ``"zstd"`` or ``"br"`` to compress
+                request bodies, or None to send them as is
+            min_size: Smallest body, in bytes, worth compressing
+            level: Compression level, defaulting to a fast one for each
+                encoding
+            msgpack: Negotiate MessagePack instead of JSON
+        """
+        self.response_encodings = tuple(response_encodings)
+        self.request_encoding = request_encoding
+        self.min_size = min_size
+        self._compress = _compressor(request_encoding, level) if request_encoding is not None else None
+        self.msgpack = msgpack
+        if msgpack:
+            try:
+                import msgpack as msgpack_module
+            except ImportError:
+                raise ImportError(
+                    "Could not import msgpack. "
+                    "Please install it with `pip install msgpack`."
+                )
+            self._packb = msgpack_module.packb
+            self._unpackb = msgpack_module.unpackb
+    
+    def accept_encoding(self, supported: Iterable[str]) -> str:
+        """Build the ``Accept-Encoding`` header for an HTTP library.
+        
+        Args:
+            supported: Encodings the library decodes
+        
+        Returns:
+            Header value, ``"identity"`` when no preferred encoding is supported
+        """
+        supported = set(supported)
+        encodings = [encoding for encoding in self.response_encodings if encoding in supported]
+        return ", ".join(encodings) or "identity"
+    
+    def encode_body(
+        self,
+        obj: Any,
+        codec: JSONCodec,
+        binary: bool = False,
+        compress: bool = True
+    ) -> Tuple[bytes, Dict[str, str]]:
+        """Encode a request body.
+        
+        Args:
+            obj: Value to send
+            codec: JSON codec used unless ``binary`` is set
+            binary: Encode the body as MessagePack
+            compress: Compress the body if it is large enough
+        
+        Returns:
+            Tuple of the body and its ``Content-Type`` and
+            ``Content-Encoding`` headers
+        """
+        if binary:
+            body = self._packb(obj, use_bin_type=True, default=str)
+            headers = {"Content-Type": MSGPACK_CONTENT_TYPES[0]}
+        else:
+            body = codec.dumps(obj)
+            headers = {"Content-Type": "application/json"}
+        if compress and self._compress is not None and len(body) >= self.min_size:
+            body = self._compress(body)
+            headers["Content-Encoding"] = self.request_encoding
+        return body, headers
+    
+    def is_msgpack(self, headers: Any) -> bool:
+        """Check whether a response carries MessagePack."""
+        if not self.msgpack:
+            return False
+        content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        return content_type in MSGPACK_CONTENT_TYPES
+    
+    def decode(self, content: bytes, headers: Any, codec: JSONCodec) -> Any:
+        """Decode a response body by its content type.
+        
+        Args:
+            content: Body, already decompressed by the HTTP library
+            headers: Response headers
+            codec: JSON codec for JSON bodies
+        
+        Returns:
+            Decoded value
+        """
+        if self.is_msgpack(headers):
+            return self._unpackb(content, raw=False)
+        return codec.loads(content)
+
+
+class Negotiation:
+    """Wire encodings agreed with one server, learned from its responses."""
+    
+    def __init__(self, compression: Compression, supported: Iterable[str], body_argument: str = "data"):
+        """Initialize the negotiation.
+        
+        Args:
+            compression: Settings of the client
+            supported: Response encodings the HTTP library decodes
+            body_argument: Name of the HTTP library's raw body argument
+        """
+        self.compression = compression
+        self.accept_encoding = compression.accept_encoding(supported)
+        self.body_argument = body_argument
+        self.compress_bodies = compression.request_encoding is not None
+        # None until the server has answered with MessagePack
+        self.msgpack_bodies = None
+    
+    def prepare(self, kwargs: Dict[str, Any], codec: JSONCodec) -> Dict[str, Any]:
+        """Apply the agreed encodings to the arguments of a request.
+        
+        Args:
+            kwargs: Arguments for the HTTP library, with the body as ``json``
+            codec: JSON codec encoding the body
+        
+        Returns:
+            New arguments with the encoded body and negotiation headers
+        """
+        kwargs = dict(kwargs)
+        headers = dict(kwargs.get("headers") or {})
+        headers["Accept-Encoding"] = self.accept_encoding
+        if self.compression.msgpack and "Accept" not in headers:
+            headers["Accept"] = MSGPACK_ACCEPT
+        if "json" in kwargs:
+            body, body_headers = self.compression.encode_body(
+                kwargs.pop("json"),
+                codec,
+                binary=bool(self.msgpack_bodies),
+                compress=self.compress_bodies
+            )
+            headers.update(body_headers)
+            kwargs[self.body_argument] = body
+        kwargs["headers"] = headers
+        return kwargs
+    
+    def decode(self, content: bytes, headers: Any, codec: JSONCodec) -> Any:
+        """Decode a response body, noting whether the server speaks MessagePack."""
+        if self.compression.is_msgpack(headers):
+            if self.msgpack_bodies is None:
+                self.msgpack_bodies = True
+            return self.compression.decode(content, headers, codec)
+        return codec.loads(content)
+    
+    def reject(self, request_headers: Dict[str, str]) -> bool:
+        """Stop using the body encoding a server answered 415 to.
+        
+        Args:
+            request_headers: Headers of the rejected request
+        
+        Returns:
+            True if the request can be sent again with a plainer body
+        """
+        if self.msgpack_bodies and request_headers.get("Content-Type") in MSGPACK_CONTENT_TYPES:
+            self.msgpack_bodies = False
+            return True
+        if self.compress_bodies and "Content-Encoding" in request_headers:
+            self.compress_bodies = False
+            return True
+        return False
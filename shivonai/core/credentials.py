@@ -0,0 +1,106 @@
+"""
+Per-call credentials for clients and toolkits shared between tenants.
+"""
+import contextlib
+import contextvars
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+_auth_token = contextvars.ContextVar("shivonai_auth_token", default=None)
+
+# Token of the toolkit making the current call
+_toolkit_token = contextvars.ContextVar("shivonai_toolkit_token", default=None)
+
+
+def get_auth_token() -> Optional[str]:
+    """Get the auth token bound to the current context.
+    
+    This is the default credential provider of shared toolkits: pass it as
+    ``credential_provider`` to a client to resolve the token per call.
+    
+    Returns:
+        The bound token, or None
+    """
+    return _auth_token.get()
+
+
+def set_auth_token(token: Optional[str]) -> contextvars.Token:
+    """Bind an auth token to the current context.
+    
+    Args:
+        token: Authentication token
+    
+    Returns:
+        Token to pass to ``reset_auth_token`` to restore the previous value
+    """
+    return _auth_token.set(token)
+
+
+def reset_auth_token(reset_token: contextvars.Token) -> None:
+    """Restore the auth token bound before ``set_auth_token``."""
+    _auth_token.reset(reset_token)
+
+
+@contextlib.contextmanager
+def use_auth_token(token: str) -> Iterator[str]:
+    """Bind an auth token to the current context for the duration of a block.
+    
+    Example::
+        
+        with use_auth_token(tenant_token):
+            agent.run("what listings I have?")
+    
+    Args:
+        token: Authentication token
+    """
+    reset_token = set_auth_token(token)
+    try:
+        yield token
+    finally:
+        reset_auth_token(reset_token)
+
+
+def get_toolkit_token() -> Optional[str]:
+    """Get the token of the toolkit making the current call.
+    
+    Clients without a credential provider use it in place of the token
+    stored by their latest ``connect()``, which another toolkit sharing the
+    client may have replaced.
+    
+    Returns:
+        The toolkit's token, or None outside toolkit calls
+    """
+    return _toolkit_token.get()
+
+
+def token_callers(
+    auth_token: Optional[str],
+    call_tool: Callable[..., Any],
+    acall_tool: Optional[Callable[..., Any]]
+) -> Tuple[Callable[..., Any], Optional[Callable[..., Any]]]:
+    """Wrap toolkit callables so each call is made with the toolkit's token.
+    
+    Args:
+        auth_token: Token the toolkit was built with
+        call_tool: Sync callable taking the tool name and its parameters
+        acall_tool: Async callable with the same signature, or None
+    
+    Returns:
+        Tuple of the wrapped sync and async callables
+    """
+    def bound_call_tool(*args, **kwargs):
+        reset_token = _toolkit_token.set(auth_token)
+        try:
+            return call_tool(*args, **kwargs)
+        finally:
+            _toolkit_token.reset(reset_token)
+    
+    bound_acall_tool = None
+    if acall_tool is not None:
+        async def bound_acall_tool(*args, **kwargs):
+            reset_token = _toolkit_token.set(auth_token)
+            try:
+                return await acall_tool(*args, **kwargs)
+            finally:
+                _toolkit_token.reset(reset_token)
+    
+    return bound_call_tool, bound_acall_tool
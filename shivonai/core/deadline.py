@@ -0,0 +1,74 @@
+"""
+End-to-end deadlines for MCP calls.
+"""
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional, Union
+
+_deadline = contextvars.ContextVar("shivonai_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's time budget has run out."""
+
+
+class Deadline:
+    """Point in time by which a call, including its retries, must finish."""
+    
+    def __init__(self, timeout: float):
+        """Initialize a deadline.
+        
+        Args:
+            timeout: Seconds from now until the deadline
+        """
+        self.expires_at = time.monotonic() + timeout
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Check whether the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+    
+    def check(self) -> float:
+        """Get the remaining time, raising if there is none left.
+        
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded before the request could be sent")
+        return remaining
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Get the deadline bound to the current context, if any."""
+    return _deadline.get()
+
+
+@contextlib.contextmanager
+def use_deadline(deadline: Union[float, Deadline, None]) -> Iterator[Optional[Deadline]]:
+    """Bind a deadline to every MCP call made in a block.
+    
+    Nested deadlines never extend an outer one: the earliest wins. Use it to
+    pass an agent's overall time budget down to its tool calls::
+        
+        with use_deadline(30):
+            agent.run("what listings I have?")
+    
+    Args:
+        deadline: Seconds from now, a ``Deadline``, or None for no new limit
+    """
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    current = _deadline.get()
+    if deadline is None or (current is not None and current.expires_at <= deadline.expires_at):
+        deadline = current
+    reset_token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(reset_token)
@@ -0,0 +1,655 @@
+"""
+Federation of several MCP servers behind one client.
+"""
+import contextvars
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, AsyncIterator, Callable, Iterator, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from shivonai.core.codec import get_codec
+from shivonai.core.deadline import Deadline, use_deadline
+from shivonai.core.filters import ToolFilter
+from shivonai.core.mcp_client import MCPClient, is_connect_error
+from shivonai.core.metrics import MetricsSink
+from shivonai.core.resilience import DEFAULT_RETRY_POLICY, FAILURE_STATUS, CircuitOpenError, RetryPolicy
+
+# How tools offered by several servers under the same name are merged
+CONFLICT_MODES = ("replicas", "first", "namespace", "error")
+
+
+def server_name(base_url: str) -> str:
+    """Derive a tool-name-safe server name from a URL, e.g. ``mcp-eu``."""
+    host = urlsplit(base_url).hostname or base_url
+    return re.sub(r"[^A-Za-z0-9_-]", "_", host.split(".")[0])
+
+
+def is_failover_error(error: Exception, idempotent: bool = True) -> bool:
+    """Check whether a failed call may be retried on another replica.
+    
+    A call that never reached the server (a connection failure, an open
+    circuit, or a 429 or 503 with ``Retry-After``) may always be resent. A
+    call that may have run, e.g. one that timed out or got a gateway error,
+    is only resent when it is idempotent. Errors reported for the call
+    itself, e.g. bad parameters, are never resent.
+    
+    Args:
+        error: Exception raised by the call
+        idempotent: Whether the call is safe to send twice
+    
+    Returns:
+        True if the call may be sent to another replica
+    """
+    # httpx is optional, match its transport errors by name
+    httpx_errors = {cls.__name__ for cls in type(error).__mro__}
+    if isinstance(error, CircuitOpenError) or is_connect_error(error):
+        return True
+    if httpx_errors & {"ConnectError", "ConnectTimeout"}:
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status in (429, 503) and response.headers.get("Retry-After"):
+        return True
+    if not idempotent:
+        return False
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if status in FAILURE_STATUS:
+        return True
+    return bool(httpx_errors & {"TransportError", "TimeoutException"})
+
+
+def pin_cursor(server: str, cursor: Optional[str]) -> Optional[str]:
+    """Prefix a page cursor with the server that issued it."""
+    return f"{server}:{cursor}" if cursor is not None else None
+
+
+def unpin_cursor(servers: Sequence[str], cursor: str) -> Tuple[str, str]:
+    """Split a cursor made by ``pin_cursor`` into its server and cursor.
+    
+    Raises:
+        ValueError: If the cursor was not issued by one of ``servers``
+    """
+    matches = [server for server in servers if cursor.startswith(f"{server}:")]
+    if not matches:
+        raise ValueError(f"Cursor {cursor!r} was not issued by a connected server.")
+    server = max(matches, key=len)
+    return server, cursor[len(server) + 1:]
+
+
+class LatencyTracker:
+    """Exponentially weighted moving average of each server's call latency."""
+    
+    def __init__(self, alpha: float = 0.3, failure_penalty: float = 5.0):
+        """Initialize the tracker.
+        
+        Args:
+            alpha: Weight of the newest sample, from 0 to 1
+            failure_penalty: Latency, in seconds, recorded for a failed call
+        """
+        self.alpha = alpha
+        self.failure_penalty = failure_penalty
+        self._averages = {}
+        self._lock = threading.Lock()
+    
+    def record(self, server: str, seconds: float) -> None:
+        """Record the latency of a call to a server."""
+        with self._lock:
+            average = self._averages.get(server)
+            self._averages[server] = seconds if average is None else average + self.alpha * (seconds - average)
+    
+    def record_failure(self, server: str) -> None:
+        """Record a failed call, pushing the server behind its replicas."""
+        self.record(server, self.failure_penalty)
+    
+    def get(self, server: str) -> Optional[float]:
+        """Get the average latency of a server, None before its first call."""
+        with self._lock:
+            return self._averages.get(server)
+    
+    def rank(self, servers: Sequence[str]) -> List[str]:
+        """Order servers fastest first. Servers never called come first."""
+        with self._lock:
+            return sorted(servers, key=lambda server: self._averages.get(server, 0.0))
+
+
+class FederatedMCPClient:
+    """Client spreading one tool catalog over several MCP servers.
+    
+    Catalogs are fetched from every server concurrently and merged. A tool
+    offered by several servers is, depending on ``conflict``, treated as a
+    set of replicas, taken from the first server, namespaced per server, or
+    rejected. Calls are routed to the server owning the tool; among replicas
+    the one with the lowest observed latency is tried first, and the next
+    one is tried when it is unreachable. Calls to tools that are not
+    idempotent are only failed over when they never reached the server.
+    
+    The client has the same calling surface as ``MCPClient``, so it can be
+    passed as ``client`` to any toolkit.
+    """
+    
+    def __init__(
+        self,
+        clients: Union[Mapping[str, MCPClient], Sequence[MCPClient]],
+        namespace: bool = False,
+        conflict: str = "replicas",
+        separator: str = "__",
+        max_workers: Optional[int] = None,
+        latency: Optional[LatencyTracker] = None,
+        metrics: Optional[MetricsSink] = None,
+        retry_policy: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        credential_provider: Optional[Callable[[], Optional[str]]] = None
+    ):
+        """Initialize the federated client.
+        
+        Args:
+            clients: Clients of the member servers, as a mapping of server
+                names to clients or a sequence named after their hosts
+            namespace: Prefix every tool name with its server name
+            conflict: How to merge tools offered by several servers under
+                the same name: ``"replicas"``, ``"first"``, ``"namespace"``
+                (prefix only the conflicting tools) or ``"error"``
+            separator: Separator between server and tool names
+            max_workers: Threads used to reach the servers concurrently.
+                Defaults to one per server
+            latency: Tracker ranking replicas, e.g. to share it between
+                clients
+            metrics: Sink receiving toolkit metrics
+            retry_policy: Policy deciding which tools are idempotent, and so
+                may be resent to another replica after a timeout, or None
+                to treat every tool as not idempotent
+            credential_provider: Callable returning the token for each call,
+                e.g. ``get_auth_token``. It is given to the members that do
+                not have their own
+        """
+        if conflict not in CONFLICT_MODES:
+            raise ValueError(f"Unknown conflict mode {conflict!r}, expected one of {CONFLICT_MODES}")
+        if isinstance(clients, Mapping):
+            members = OrderedDict(clients)
+        else:
+            members = OrderedDict()
+            for client in clients:
+                name = server_name(client.base_url)
+                unique, suffix = name, 2
+                while unique in members:
+                    unique, suffix = f"{name}_{suffix}", suffix + 1
+                members[unique] = client
+        if not members:
+            raise ValueError("A federated client needs at least one server.")
+        
+        self.members = members
+        self.namespace = namespace
+        self.conflict = conflict
+        self.separator = separator
+        self.max_workers = max_workers or len(members)
+        self.latency = latency if latency is not None else LatencyTracker()
+        self.metrics = metrics
+        self.codec = get_codec()
+        self.catalog_cache = None
+        self.retry_policy = retry_policy
+        self.credential_provider = credential_provider
+        if credential_provider is not None:
+            for client in members.values():
+                if client.credential_provider is None:
+                    client.credential_provider = credential_provider
+        self.token = None
+        self.available_tools = []
+        self.errors = {}
+        self._routes = {}
+        self._tool_infos = {}
+        self._async_client = None
+    
+    def close(self) -> None:
+        """Close the member clients."""
+        for client in self.members.values():
+            client.close()
+        if self._async_client is not None:
+            self._async_client.close()
+            self._async_client = None
+    
+    def __enter__(self) -> "FederatedMCPClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _map_members(self, func: Callable[[MCPClient], Any]) -> Dict[str, Any]:
+        """Run a function on every member concurrently.
+        
+        Returns:
+            Results by server name, in member order. A failed server maps to
+            its exception
+        """
+        def run(client):
+            try:
+                return func(client)
+            except Exception as e:
+                return e
+        
+        # Workers run in copies of the caller's context, so members see its
+        # deadline and bound token
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, client)
+                for client in self.members.values()
+            ]
+            results = [future.result() for future in futures]
+        return OrderedDict(zip(self.members, results))
+    
+    def _merge(self, catalogs: Dict[str, Any], tool_filter: Optional[ToolFilter]) -> List[Dict[str, Any]]:
+        """Merge the member catalogs and rebuild the routing table."""
+        self.errors = {name: result for name, result in catalogs.items() if isinstance(result, Exception)}
+        if len(self.errors) == len(catalogs):
+            raise next(iter(self.errors.values()))
+        catalogs = OrderedDict((name, tools) for name, tools in catalogs.items() if name not in self.errors)
+        
+        owners = {}
+        for server, tools in catalogs.items():
+            for tool_info in tools:
+                owners.setdefault(tool_info["name"], []).append(server)
+        conflicts = sorted(name for name, servers in owners.items() if len(servers) > 1)
+        if conflicts and self.conflict == "error" and not self.namespace:
+            raise ValueError(f"Tools offered by several servers: {', '.join(conflicts)}")
+        
+        routes = OrderedDict()
+        tool_infos = {}
+        for server, tools in catalogs.items():
+            for tool_info in tools:
+                name = tool_info["name"]
+                if self.namespace or (self.conflict == "namespace" and len(owners[name]) > 1):
+                    public_name = f"{server}{self.separator}{name}"
+                    tool_info = dict(tool_info, name=public_name)
+                else:
+                    public_name = name
+                    if public_name in routes:
+                        if self.conflict == "replicas":
+                            routes[public_name].append((server, name))
+                        continue
+                routes[public_name] = [(server, name)]
+                tool_infos[public_name] = tool_info
+        
+        self._routes = routes
+        self._tool_infos = tool_infos
+        self.available_tools = list(tool_infos.values())
+        if tool_filter is not None and tool_filter.max_tools is not None:
+            self.available_tools = self.available_tools[:tool_filter.max_tools]
+        return self.available_tools
+    
+    def authenticate(self, token: str) -> Dict[str, Any]:
+        """Authenticate with every server concurrently.
+        
+        Args:
+            token: Authentication token
+        
+        Returns:
+            Server information by server name. A server that failed maps to
+            its exception
+        """
+        self.token = token
+        return self._map_members(lambda client: client.authenticate(token))
+    
+    def connect(self, token: str, tool_filter: Optional[ToolFilter] = None) -> List[Dict[str, Any]]:
+        """Authenticate and get the merged tool catalog in one step.
+        
+        Servers are reached concurrently. Servers that fail are left out of
+        the catalog and listed in ``errors``; the call only fails when every
+        server does.
+        
+        Args:
+            token: Authentication token
+            tool_filter: Selection of the tools to return, applied by each
+                server with ``max_tools`` applied to the merged catalog
+        
+        Returns:
+            List of available tools
+        """
+        self.token = token
+        return self._merge(self._map_members(lambda client: client.connect(token, tool_filter)), tool_filter)
+    
+    def list_tools(self, tool_filter: Optional[ToolFilter] = None) -> List[Dict[str, Any]]:
+        """Get the merged tool catalog of every server, fetched concurrently.
+        
+        Args:
+            tool_filter: Selection of the tools to return
+        
+        Returns:
+            List of available tools
+        """
+        return self._merge(self._map_members(lambda client: client.list_tools(tool_filter)), tool_filter)
+    
+    def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get a tool's definition from the merged catalog."""
+        return self._tool_infos.get(tool_name)
+    
+    def replicas(self, tool_name: str) -> List[Tuple[str, str]]:
+        """Get the servers offering a tool, fastest first.
+        
+        Args:
+            tool_name: Name of the tool in the merged catalog
+        
+        Returns:
+            List of ``(server_name, tool_name_on_server)``
+        """
+        routes = self._routes.get(tool_name)
+        if not routes:
+            raise ValueError(f"Tool {tool_name!r} is not offered by any connected server.")
+        if len(routes) == 1:
+            return routes
+        by_server = dict(routes)
+        return [(server, by_server[server]) for server in self.latency.rank(list(by_server))]
+    
+    def _is_idempotent_tool(self, tool_name: str) -> bool:
+        """Check whether the retry policy may resend a call to a tool."""
+        if self.retry_policy is None:
+            return False
+        return self.retry_policy.is_idempotent_tool(tool_name, self.get_tool_info(tool_name))
+    
+    def _route(self, tool_name: str, call: Callable[[MCPClient, str], Any]) -> Any:
+        """Run a call on the fastest replica, failing over to the others."""
+        replicas = self.replicas(tool_name)
+        idempotent = self._is_idempotent_tool(tool_name)
+        for i, (server, name) in enumerate(replicas):
+            started = time.perf_counter()
+            try:
+                result = call(self.members[server], name)
+            except Exception as e:
+                if not is_failover_error(e, idempotent):
+                    raise
+                self.latency.record_failure(server)
+                if i == len(replicas) - 1:
+                    raise
+            else:
+                self.latency.record(server, time.perf_counter() - started)
+                return result
+    
+    def call_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool on the server owning it.
+        
+        Args:
+            tool_name: Name of the tool in the merged catalog
+            parameters: Parameters to pass to the tool
+            deadline: Time budget for the call, shared by every replica tried
+        
+        Returns:
+            Result of the tool call
+        """
+        with use_deadline(deadline):
+            return self._route(tool_name, lambda client, name: client.call_tool(name, parameters))
+    
+    def call_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Iterator[Any]:
+        """Call a tool on the server owning it and iterate over its records.
+        
+        See ``MCPClient.call_tool_stream``.
+        """
+        with use_deadline(deadline):
+            return self._route(tool_name, lambda client, name: client.call_tool_stream(name, parameters))
+    
+    def call_tool_preview(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        max_items: int,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool on the server owning it and keep its first records.
+        
+        See ``MCPClient.call_tool_preview``.
+        """
+        with use_deadline(deadline):
+            return self._route(tool_name, lambda client, name: client.call_tool_preview(name, parameters, max_items))
+    
+    def call_tool_page(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        cursor: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """Call a tool for one page of its result.
+        
+        The first page goes to the fastest replica. The returned cursor names
+        that server, so later pages go back to it without failover. See
+        ``MCPClient.call_tool_page``.
+        """
+        with use_deadline(deadline):
+            if cursor is not None:
+                server, cursor = unpin_cursor(list(self.members), cursor)
+                name = dict(self.replicas(tool_name)).get(server)
+                if name is None:
+                    raise ValueError(f"Tool {tool_name!r} is not offered by server {server!r}.")
+                page, cursor = self.members[server].call_tool_page(name, parameters, cursor)
+                return page, pin_cursor(server, cursor)
+            
+            def call(client, name):
+                return client, client.call_tool_page(name, parameters)
+            
+            client, (page, cursor) = self._route(tool_name, call)
+            server = next(server for server, member in self.members.items() if member is client)
+            return page, pin_cursor(server, cursor)
+    
+    def call_tools_batch(
+        self,
+        calls: Sequence[Tuple[str, Dict[str, Any]]],
+        max_concurrency: int = 8,
+        deadline: Union[float, Deadline, None] = None
+    ) -> List[Union[Any, Exception]]:
+        """Call several independent tools, batching the calls of each server.
+        
+        Each call goes to the fastest replica of its tool, and the batches of
+        the servers are sent concurrently.
+        
+        Args:
+            calls: Sequence of ``(tool_name, parameters)`` pairs
+            max_concurrency: Maximum number of parallel requests per server
+            deadline: Time budget for the whole batch
+        
+        Returns:
+            Results in the order of ``calls``. A call that failed is returned
+            as its exception instead of failing the whole batch
+        """
+        results = [None] * len(calls)
+        groups = OrderedDict()
+        for i, (tool_name, parameters) in enumerate(calls):
+            try:
+                server, name = self.replicas(tool_name)[0]
+            except ValueError as e:
+                results[i] = e
+                continue
+            groups.setdefault(server, []).append((i, name, parameters))
+        
+        def run(server):
+            group = groups[server]
+            client = self.members[server]
+            return client.call_tools_batch([(name, parameters) for _, name, parameters in group], max_concurrency)
+        
+        with use_deadline(deadline):
+            if len(groups) == 1:
+                batches = {server: run(server) for server in groups}
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as executor:
+                    futures = [executor.submit(contextvars.copy_context().run, run, server) for server in groups]
+                    batches = dict(zip(groups, [future.result() for future in futures]))
+        for server, group in groups.items():
+            for (i, _, _), result in zip(group, batches[server]):
+                results[i] = result
+        return results
+    
+    def to_async(self, **kwargs: Any) -> "AsyncFederatedMCPClient":
+        """Create an async client routing over the same servers and catalog.
+        
+        Args:
+            kwargs: Extra arguments for each member's ``AsyncMCPClient``
+        
+        Returns:
+            Async federated client sharing this client's routes and latencies
+        """
+        from shivonai.core.async_client import AsyncMCPClient
+        
+        members = OrderedDict(
+            (name, AsyncMCPClient.from_client(client, **kwargs))
+            for name, client in self.members.items()
+        )
+        return AsyncFederatedMCPClient(self, members)
+
+
+class AsyncFederatedMCPClient:
+    """Asyncio counterpart of ``FederatedMCPClient``.
+    
+    Created with ``FederatedMCPClient.to_async()``, it routes calls with the
+    catalog and latency statistics of the synchronous client.
+    """
+    
+    def __init__(self, federated: FederatedMCPClient, members: Mapping[str, Any]):
+        """Initialize the async federated client.
+        
+        Args:
+            federated: Synchronous client owning the routes
+            members: Async clients by server name
+        """
+        self.federated = federated
+        self.members = members
+        self.metrics = federated.metrics
+        self.codec = federated.codec
+        self.credential_provider = federated.credential_provider
+        self._token = federated.token
+    
+    @property
+    def token(self) -> Optional[str]:
+        """Token used by every member."""
+        return self._token
+    
+    @token.setter
+    def token(self, token: Optional[str]) -> None:
+        self._token = token
+        for client in self.members.values():
+            client.token = token
+    
+    @property
+    def available_tools(self) -> List[Dict[str, Any]]:
+        return self.federated.available_tools
+    
+    def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get a tool's definition from the merged catalog."""
+        return self.federated.get_tool_info(tool_name)
+    
+    def close(self) -> None:
+        """Close the member clients from sync code."""
+        for client in self.members.values():
+            client.close()
+    
+    async def aclose(self) -> None:
+        """Close the member clients."""
+        for client in self.members.values():
+            await client.aclose()
+    
+    async def __aenter__(self) -> "AsyncFederatedMCPClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    async def _route(self, tool_name: str, call: Callable[[Any, str], Any]) -> Any:
+        """Run a call on the fastest replica, failing over to the others."""
+        latency = self.federated.latency
+        replicas = self.federated.replicas(tool_name)
+        idempotent = self.federated._is_idempotent_tool(tool_name)
+        for i, (server, name) in enumerate(replicas):
+            started = time.perf_counter()
+            try:
+                result = await call(self.members[server], name)
+            except Exception as e:
+                if not is_failover_error(e, idempotent):
+                    raise
+                latency.record_failure(server)
+                if i == len(replicas) - 1:
+                    raise
+            else:
+                latency.record(server, time.perf_counter() - started)
+                return result
+    
+    async def call_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool on the server owning it.
+        
+        See ``FederatedMCPClient.call_tool``.
+        """
+        with use_deadline(deadline):
+            return await self._route(tool_name, lambda client, name: client.call_tool(name, parameters))
+    
+    async def call_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> AsyncIterator[Any]:
+        """Call a tool on its fastest server and iterate over its records.
+        
+        See ``AsyncMCPClient.call_tool_stream``. Streams are not failed over
+        to other replicas, since records may already have been consumed.
+        """
+        server, name = self.federated.replicas(tool_name)[0]
+        async for record in self.members[server].call_tool_stream(name, parameters, deadline):
+            yield record
+    
+    async def call_tool_preview(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        max_items: int,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool on the server owning it and keep its first records.
+        
+        See ``AsyncMCPClient.call_tool_preview``.
+        """
+        with use_deadline(deadline):
+            return await self._route(
+                tool_name,
+                lambda client, name: client.call_tool_preview(name, parameters, max_items)
+            )
+    
+    async def call_tool_page(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        cursor: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """Call a tool for one page of its result.
+        
+        See ``FederatedMCPClient.call_tool_page``.
+        """
+        with use_deadline(deadline):
+            if cursor is not None:
+                server, cursor = unpin_cursor(list(self.members), cursor)
+                name = dict(self.federated.replicas(tool_name)).get(server)
+                if name is None:
+                    raise ValueError(f"Tool {tool_name!r} is not offered by server {server!r}.")
+                page, cursor = await self.members[server].call_tool_page(name, parameters, cursor)
+                return page, pin_cursor(server, cursor)
+            
+            async def call(client, name):
+                return client, await client.call_tool_page(name, parameters)
+            
+            client, (page, cursor) = await self._route(tool_name, call)
+            server = next(server for server, member in self.members.items() if member is client)
+            return page, pin_cursor(server, cursor)
@@ -0,0 +1,104 @@
+"""
+Tool catalog filters.
+"""
+import fnmatch
+from typing import Dict, List, Any, Iterable, Optional
+
+
+class ToolFilter:
+    """Selection of the tools a toolkit wraps.
+    
+    Filters are sent to ``/tools/list`` as query parameters so a server that
+    supports them returns only the selected tools, and are applied again to
+    the returned catalog so servers that ignore them give the same result.
+    """
+    
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        max_tools: Optional[int] = None
+    ):
+        """Initialize the filter.
+        
+        Args:
+            include: Names or glob patterns (``"search_*"``) of the tools to
+                keep. Every tool is kept when None
+            exclude: Names or glob patterns of the tools to drop
+            tags: Keep only tools carrying at least one of these tags
+            max_tools: Maximum number of tools kept, in catalog order
+        """
+        self.include = tuple(include) if include is not None else None
+        self.exclude = tuple(exclude or ())
+        self.tags = frozenset(tags) if tags is not None else None
+        self.max_tools = max_tools
+    
+    @classmethod
+    def from_options(
+        cls,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        max_tools: Optional[int] = None
+    ) -> Optional["ToolFilter"]:
+        """Build a filter from toolkit options.
+        
+        Returns:
+            The filter, or None if no option is set
+        """
+        if include is None and not exclude and tags is None and max_tools is None:
+            return None
+        return cls(include, exclude, tags, max_tools)
+    
+    def matches(self, tool_info: Dict[str, Any]) -> bool:
+        """Check whether a tool passes the name and tag filters.
+        
+        Args:
+            tool_info: Tool definition from the catalog
+        
+        Returns:
+            True if the tool is selected
+        """
+        name = tool_info.get("name", "")
+        if self.include is not None and not any(fnmatch.fnmatchcase(name, pattern) for pattern in self.include):
+            return False
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.exclude):
+            return False
+        if self.tags is not None and not self.tags.intersection(tool_info.get("tags") or ()):
+            return False
+        return True
+    
+    def apply(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Select tools from a catalog.
+        
+        Args:
+            tools: Tool definitions from the catalog
+        
+        Returns:
+            Selected tool definitions, in catalog order
+        """
+        selected = [tool_info for tool_info in tools if self.matches(tool_info)]
+        if self.max_tools is not None:
+            selected = selected[:self.max_tools]
+        return selected
+    
+    def query_params(self) -> Dict[str, str]:
+        """Get the ``/tools/list`` query parameters expressing the filter."""
+        params = {}
+        if self.include is not None:
+            params["include"] = ",".join(self.include)
+        if self.exclude:
+            params["exclude"] = ",".join(self.exclude)
+        if self.tags is not None:
+            params["tags"] = ",".join(sorted(self.tags))
+        if self.max_tools is not None:
+            params["limit"] = str(self.max_tools)
+        return params
+    
+    def key(self) -> str:
+        """Get a stable string identifying the filter, e.g. for cache keys."""
+        return "&".join(f"{name}={value}" for name, value in sorted(self.query_params().items()))
+    
+    def __repr__(self) -> str:
+        return f"ToolFilter({self.key()})"
@@ -1,78 +1,1009 @@
 """
 MCP Client for connecting with MCP Server.
 """
+import contextvars
+import time
 import requests
-from typing import Dict, List, Any, Optional
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Iterator, Optional, Sequence, Tuple, Union
+
+from shivonai.core.catalog import CatalogCache, CatalogEntry, get_bound_tool_infos
+from shivonai.core.coalescing import CallCoalescer
+from shivonai.core.codec import JSONCodec, get_codec
+from shivonai.core.credentials import get_toolkit_token
+from shivonai.core.compression import UNSUPPORTED_MEDIA_TYPE, Compression, Negotiation, requests_encodings
+from shivonai.core.deadline import Deadline, DeadlineExceeded, get_deadline, use_deadline
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import BATCH_TOOL, MetricsSink, record_batch_call, record_response, track_tool_call
+from shivonai.core.pagination import Page, iter_pages, next_cursor
+from shivonai.core.sessions import UNAUTHORIZED, SessionManager, bearer_token
+from shivonai.core.result_cache import MISSING, ToolResultCache
+from shivonai.core.streaming import STREAM_ACCEPT, is_ndjson, iter_ndjson, truncate_records
+from shivonai.core.resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    DEFAULT_CIRCUIT_BREAKER,
+    DEFAULT_RETRY_POLICY,
+    FAILURE_STATUS,
+)
+
+# Status codes meaning the server has no multi-call endpoint
+BATCH_UNSUPPORTED_STATUS = (404, 405, 501)
+
+
+class MCPToolError(Exception):
+    """Error reported by the MCP server for a single tool call."""
+    
+    def __init__(self, tool_name: str, message: str):
+        super().__init__(f"{tool_name}: {message}")
+        self.tool_name = tool_name
+        self.message = message
+
+
+def is_connect_error(error: Exception) -> bool:
+    """Check whether a request failed before reaching the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
 
 class MCPClient:
-    """Client to connect with MCP Server."""
+    """Client to connect with MCP Server.
+    
+    The client owns a pooled ``requests.Session`` so that the TCP/TLS
+    connection to the server is kept alive and reused by every call, and by
+    every toolkit built on top of the client. Use it as a context manager (or
+    call ``close()``) to release the pooled connections.
+    """
     
-    def __init__(self, base_url: str = "https://mcp-server.shivonai.com"):
+    def __init__(
+        self,
+        base_url: str = "https://mcp-server.shivonai.com",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        session: Optional[requests.Session] = None,
+        catalog_cache: Optional[CatalogCache] = None,
+        credential_provider: Optional[Callable[[], Optional[str]]] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        retry_policy: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: Optional[CircuitBreaker] = DEFAULT_CIRCUIT_BREAKER,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        metrics: Optional[MetricsSink] = None,
+        codec: Optional[JSONCodec] = None,
+        session_manager: Optional[SessionManager] = None,
+        coalescer: Optional[CallCoalescer] = None,
+        compression: Optional[Compression] = None,
+        transport: Optional[BaseAdapter] = None
+    ):
         """Initialize MCP Client.
         
         Args:
             base_url: URL of the MCP server
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of connections kept alive per host
+            pool_block: Whether to block when the pool has no free connection
+                instead of opening a throwaway one
+            session: Existing session to use. A session passed in is not
+                closed by ``close()``
+            catalog_cache: Cache used to serve and revalidate the tool
+                catalog, e.g. the process-wide ``get_catalog_cache()``
+            credential_provider: Callable returning the token for each call,
+                e.g. ``get_auth_token`` to use the token bound with
+                ``use_auth_token``. When set, the token stored by
+                ``authenticate()`` is never used for calls
+            result_cache: Opt-in cache of results of read-only tools
+            retry_policy: Policy for retrying transient failures, or None to
+                never retry
+            circuit_breaker: Per-endpoint circuit breaker, or None to disable
+                it. Defaults to one shared by all clients in the process
+            connect_timeout: Seconds to wait for a connection to the server
+            read_timeout: Seconds to wait for the server between bytes of the
+                response
+            metrics: Sink receiving per-tool call metrics, or None to disable
+                instrumentation
+            codec: JSON codec decoding responses. Defaults to the
+                process-wide ``get_codec()``
+            session_manager: Manager sharing ``/initialize`` results between
+                clients, e.g. the process-wide ``get_session_manager()``
+            coalescer: Opt-in coalescing of identical concurrent tool calls
+            compression: Opt-in negotiation of compressed and MessagePack
+                bodies
+            transport: Adapter sending the requests in place of the pooled
+                ``HTTPAdapter``, e.g. a ``RecordTransport`` or
+                ``ReplayTransport``. Cannot be combined with ``session``
         """
+        if session is not None and transport is not None:
+            raise ValueError("Pass either a session or a transport, not both.")
         self.base_url = base_url
         self.token = None
         self.available_tools = []
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = transport
+            if adapter is None:
+                adapter = HTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block
+                )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.transport = transport
+        self.catalog_cache = catalog_cache
+        self.credential_provider = credential_provider
+        self.result_cache = result_cache
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.metrics = metrics
+        self.codec = codec if codec is not None else get_codec()
+        self.session_manager = session_manager
+        self.coalescer = coalescer
+        self.compression = compression
+        self._negotiation = None
+        if compression is not None:
+            self._negotiation = Negotiation(compression, requests_encodings(), "data")
+        self._batch_supported = None
+        self._async_client = None
+    
+    def close(self) -> None:
+        """Close the pooled connections owned by this client."""
+        if self._owns_session:
+            self.session.close()
+        if self._async_client is not None:
+            self._async_client.close()
+            self._async_client = None
+    
+    def __enter__(self) -> "MCPClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _decode(self, response: requests.Response) -> Any:
+        """Decode a response body as JSON, or as negotiated MessagePack."""
+        if self._negotiation is None:
+            return self.codec.loads(response.content)
+        return self._negotiation.decode(response.content, response.headers, self.codec)
+    
+    def _resolve_token(self) -> str:
+        """Get the token to use for the current call."""
+        if self.credential_provider is not None:
+            token = self.credential_provider()
+        else:
+            token = get_toolkit_token() or self.token
+        if not token:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+        return token
+    
+    def _request(self, method: str, path: str, idempotent: bool = True, **kwargs: Any) -> requests.Response:
+        """Send a request through the circuit breaker, retrying transient failures.
+        
+        Each attempt is bounded by the client's timeouts and by the deadline
+        bound with ``use_deadline``, if any. Retries are skipped once their
+        backoff would not fit in the remaining budget.
+        
+        Args:
+            method: Session method to use, e.g. ``"post"``
+            path: Endpoint path on the MCP server
+            idempotent: Whether the request is safe to send twice
+            kwargs: Arguments for the session method
+        
+        Returns:
+            The final response. Its status is not checked
+        """
+        url = f"{self.base_url}{path}"
+        request_kwargs = kwargs
+        if self._negotiation is not None:
+            request_kwargs = self._negotiation.prepare(kwargs, self.codec)
+        deadline = get_deadline()
+        attempt = 0
+        reinitialized = False
+        while True:
+            timeout = (self.connect_timeout, self.read_timeout)
+            if deadline is not None:
+                remaining = deadline.check()
+                timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_call(url)
+            try:
+                response = getattr(self.session, method)(url, timeout=timeout, **request_kwargs)
+            except requests.exceptions.RequestException as e:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure(url)
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded(f"Deadline exceeded while calling {path}") from e
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.delay_for_error(attempt, is_connect_error(e), idempotent)
+                if delay is not None and deadline is not None and delay >= deadline.remaining():
+                    delay = None
+                if delay is None:
+                    raise
+            except BaseException:
+                # Cancelled or interrupted: free a half-open trial for others
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release(url)
+                raise
+            else:
+                status = response.status_code
+                if self.circuit_breaker is not None:
+                    if status in FAILURE_STATUS:
+                        self.circuit_breaker.record_failure(url)
+                    else:
+                        self.circuit_breaker.record_success(url)
+                if status == UNSUPPORTED_MEDIA_TYPE and self._negotiation is not None:
+                    if self._negotiation.reject(request_kwargs["headers"]):
+                        # Resend the body in an encoding the server reads
+                        response.close()
+                        request_kwargs = self._negotiation.prepare(kwargs, self.codec)
+                        continue
+                if status == UNAUTHORIZED and not reinitialized and self.session_manager is not None:
+                    token = bearer_token(kwargs.get("headers"))
+                    if token is not None:
+                        # The cached session is stale: open a new one and resend once
+                        reinitialized = True
+                        response.close()
+                        self.session_manager.invalidate(self.base_url, token)
+                        self.session_manager.get(self.base_url, token, lambda: self._initialize(token))
+                        continue
+                delay = None
+                if self.retry_policy is not None:
+                    delay = self.retry_policy.delay_for_status(attempt, status, response.headers, idempotent)
+                if delay is not None and deadline is not None and delay >= deadline.remaining():
+                    delay = None
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
     
     def authenticate(self, token: str) -> Dict[str, Any]:
         """Authenticate with the MCP server using a token.
         
+        With a session manager, ``/initialize`` is only sent when the token
+        has no valid session, and concurrent callers share one request.
+        
         Args:
             token: Authentication token
-            
+        
         Returns:
             Server information
         """
         self.token = token
-        response = requests.post(
-            f"{self.base_url}/initialize",
+        if self.session_manager is not None:
+            session = self.session_manager.get(self.base_url, token, lambda: self._initialize(token))
+            return session.server_info
+        data = self._initialize(token)
+        return data["server_info"]
+    
+    def _initialize(self, token: str) -> Dict[str, Any]:
+        """Send ``/initialize`` and return the decoded response body."""
+        response = self._request(
+            "post",
+            "/initialize",
             json={"auth_token": token}
         )
         response.raise_for_status()
-        data = response.json()
-        return data["server_info"]
+        return self._decode(response)
+    
+    def connect(self, token: str, tool_filter: Optional[ToolFilter] = None) -> List[Dict[str, Any]]:
+        """Authenticate and get the tool catalog in one step.
+        
+        When the catalog cache holds a fresh catalog for this server and
+        token, it is returned without the ``/initialize`` and ``/tools/list``
+        round trips. A filtered request is also served from a fresh full
+        catalog.
+        
+        Args:
+            token: Authentication token
+            tool_filter: Selection of the tools to return
+        
+        Returns:
+            List of available tools
+        """
+        if self.catalog_cache is not None:
+            entry = None
+            if tool_filter is not None:
+                entry = self.catalog_cache.get(self.base_url, token, tool_filter.key())
+            if entry is None or not self.catalog_cache.is_fresh(entry):
+                entry = self.catalog_cache.get(self.base_url, token)
+            if entry is not None and self.catalog_cache.is_fresh(entry):
+                self.token = token
+                self.available_tools = entry.tools
+                if tool_filter is not None:
+                    self.available_tools = tool_filter.apply(entry.tools)
+                return self.available_tools
+        
+        self.authenticate(token)
+        return self.list_tools(tool_filter)
     
-    def list_tools(self) -> List[Dict[str, Any]]:
+    def list_tools(self, tool_filter: Optional[ToolFilter] = None) -> List[Dict[str, Any]]:
         """Get list of tools available with current authentication.
         
+        With a catalog cache, a previously seen catalog is revalidated with
+        ``If-None-Match`` and reused when the server answers 304.
+        
+        Args:
+            tool_filter: Selection of the tools to return. It is sent as
+                query parameters so the server can skip the other tools, and
+                applied again to the response
+        
         Returns:
             List of available tools
         """
-        if not self.token:
-            raise ValueError("Not authenticated. Call authenticate() first.")
+        token = self._resolve_token()
+        scope = tool_filter.key() if tool_filter is not None else ""
+        
+        entry = None
+        if self.catalog_cache is not None:
+            entry = self.catalog_cache.get(self.base_url, token, scope)
+        
+        headers = {}
+        if entry is not None:
+            headers["If-None-Match"] = entry.validator()
+        response = self._get_tools_page(token, None, tool_filter, headers)
+        if entry is not None and response.status_code == 304:
+            self.catalog_cache.touch(self.base_url, token, entry, scope)
+            self.available_tools = entry.tools
+            return self.available_tools
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = requests.get(
-            f"{self.base_url}/tools/list",
-            headers=headers
-        )
         response.raise_for_status()
-        data = response.json()
-        self.available_tools = data["tools"]
+        data = self._decode(response)
+        tools = data["tools"]
+        cursor = next_cursor(data)
+        if cursor is not None:
+            # A paginated catalog is assembled from every page
+            tools = list(tools)
+            for page in iter_pages(lambda cursor: self._fetch_tools_page(token, cursor, tool_filter), cursor):
+                tools.extend(page)
+        self.available_tools = tools
+        if tool_filter is not None:
+            self.available_tools = tool_filter.apply(self.available_tools)
+        if self.catalog_cache is not None:
+            self.catalog_cache.set(self.base_url, token, CatalogEntry(
+                self.available_tools,
+                etag=response.headers.get("ETag"),
+                version=data.get("version")
+            ), scope)
         return self.available_tools
     
-    def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Any:
+    def list_tools_page(
+        self,
+        cursor: Optional[str] = None,
+        tool_filter: Optional[ToolFilter] = None
+    ) -> Page:
+        """Get one page of the tool catalog.
+        
+        The page is neither cached nor stored as the client's catalog.
+        
+        Args:
+            cursor: Cursor of the page, None for the first one
+            tool_filter: Selection of the tools to return. Its ``max_tools``
+                is not applied to single pages
+        
+        Returns:
+            Tuple of the page's tools and the cursor of the next page, None
+            on the last page
+        """
+        tools, cursor = self._fetch_tools_page(self._resolve_token(), cursor, tool_filter)
+        if tool_filter is not None:
+            tools = [tool_info for tool_info in tools if tool_filter.matches(tool_info)]
+        return tools, cursor
+    
+    def iter_tools(self, tool_filter: Optional[ToolFilter] = None, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        """Iterate over the tool catalog one page at a time.
+        
+        The next page is fetched while the current one is consumed, and no
+        page is requested past the point where iteration stops. Use it to
+        scan a large catalog without holding all of it.
+        
+        Args:
+            tool_filter: Selection of the tools to yield
+            prefetch: Fetch the next page concurrently
+        
+        Returns:
+            Iterator over the tool definitions
+        """
+        token = self._resolve_token()
+        pages = iter_pages(lambda cursor: self._fetch_tools_page(token, cursor, tool_filter), prefetch=prefetch)
+        return self._iter_tools(pages, tool_filter)
+    
+    def _iter_tools(self, pages: Iterator[List[Dict[str, Any]]], tool_filter: Optional[ToolFilter]) -> Iterator[Dict[str, Any]]:
+        """Yield the selected tools of catalog pages."""
+        remaining = tool_filter.max_tools if tool_filter is not None else None
+        if remaining is not None and remaining <= 0:
+            return
+        try:
+            for page in pages:
+                for tool_info in page:
+                    if tool_filter is None or tool_filter.matches(tool_info):
+                        yield tool_info
+                        if remaining is not None:
+                            remaining -= 1
+                            if remaining <= 0:
+                                return
+        finally:
+            pages.close()
+    
+    def _get_tools_page(
+        self,
+        token: str,
+        cursor: Optional[str],
+        tool_filter: Optional[ToolFilter],
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Send ``/tools/list`` for one page of the catalog."""
+        headers = dict(headers or {})
+        headers["Authorization"] = f"Bearer {token}"
+        params = tool_filter.query_params() if tool_filter is not None else {}
+        if cursor is not None:
+            params["cursor"] = cursor
+        kwargs = {"params": params} if params else {}
+        return self._request(
+            "get",
+            "/tools/list",
+            headers=headers,
+            **kwargs
+        )
+    
+    def _fetch_tools_page(self, token: str, cursor: Optional[str], tool_filter: Optional[ToolFilter]) -> Page:
+        """Get the tools of one catalog page and the next cursor."""
+        response = self._get_tools_page(token, cursor, tool_filter)
+        response.raise_for_status()
+        data = self._decode(response)
+        return data["tools"], next_cursor(data)
+    
+    def call_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
         """Call a tool on the MCP server.
         
         Args:
             tool_name: Name of the tool to call
             parameters: Parameters to pass to the tool
-            
+            deadline: Time budget for the call and its retries, in seconds or
+                as a ``Deadline``. It cannot extend a deadline bound with
+                ``use_deadline``
+        
         Returns:
             Result of the tool call
         """
-        if not self.token:
-            raise ValueError("Not authenticated. Call authenticate() first.")
+        with use_deadline(deadline):
+            return self._call_tool(tool_name, parameters, self._resolve_token())
+    
+    def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get a tool's definition from the catalog of the calling toolkit.
+        
+        Tools it does not list, e.g. outside a toolkit call, are looked up
+        in the last fetched catalog.
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = requests.post(
-            f"{self.base_url}/tools/call",
+        Args:
+            tool_name: Name of the tool
+        
+        Returns:
+            Tool definition, or None if the tool is not in the catalog
+        """
+        tool_infos = get_bound_tool_infos()
+        if tool_infos is not None and tool_name in tool_infos:
+            return tool_infos[tool_name]
+        for tool_info in self.available_tools:
+            if tool_info.get("name") == tool_name:
+                return tool_info
+        return None
+    
+    def _is_idempotent_tool(self, tool_name: str) -> bool:
+        """Check whether the retry policy may resend a call to a tool."""
+        if self.retry_policy is None:
+            return False
+        return self.retry_policy.is_idempotent_tool(tool_name, self.get_tool_info(tool_name))
+    
+    def _call_tool(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Call a tool with an already resolved token, through the result cache."""
+        if self.metrics is None:
+            return self._cached_tool_call(tool_name, parameters, token)
+        with track_tool_call(self.metrics, tool_name):
+            return self._cached_tool_call(tool_name, parameters, token)
+    
+    def _cached_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Serve a tool call from the result cache, or send it."""
+        if self.result_cache is None:
+            return self._coalesced_tool_call(tool_name, parameters, token)
+        return self.result_cache.get_or_call(
+            token,
+            tool_name,
+            parameters,
+            lambda: self._coalesced_tool_call(tool_name, parameters, token),
+            tool_info=self.get_tool_info(tool_name)
+        )
+    
+    def _coalesced_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Send a tool call, or wait for an identical one already in flight."""
+        if self.coalescer is None or not self.coalescer.enabled_for(tool_name, self.get_tool_info(tool_name)):
+            return self._post_tool_call(tool_name, parameters, token)
+        return self.coalescer.call(
+            ToolResultCache.make_key(token, tool_name, parameters),
+            lambda: self._post_tool_call(tool_name, parameters, token)
+        )
+    
+    def _post_tool_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> Any:
+        """Send a tool call to the MCP server."""
+        return self._send_tool_call(tool_name, parameters, token)["result"]
+    
+    def _send_tool_call(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        token: str,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send a tool call and return the decoded response body."""
+        idempotent = self._is_idempotent_tool(tool_name)
+        headers = {"Authorization": f"Bearer {token}"}
+        body = {"name": tool_name, "parameters": parameters}
+        if cursor is not None:
+            body["cursor"] = cursor
+        opened = self._opened_connections()
+        response = self._request(
+            "post",
+            "/tools/call",
+            idempotent=idempotent,
             headers=headers,
-            json={"name": tool_name, "parameters": parameters}
+            json=body
         )
         response.raise_for_status()
-        data = response.json()
-        return data["result"]
\ No newline at end of file
+        if self.metrics is None:
+            return self._decode(response)
+        
+        started = time.perf_counter()
+        data = self._decode(response)
+        self._record_response(tool_name, response, time.perf_counter() - started, len(response.content), opened)
+        return data
+    
+    def _opened_connections(self) -> Optional[int]:
+        """Count the connections opened to the MCP server while metrics are recorded.
+        
+        Returns:
+            Number of connections opened so far, or None without metrics or
+            when the transport does not pool connections
+        """
+        if self.metrics is None:
+            return None
+        poolmanager = getattr(self.session.get_adapter(self.base_url), "poolmanager", None)
+        if poolmanager is None:
+            return None
+        return poolmanager.connection_from_url(self.base_url).num_connections
+    
+    def _record_response(
+        self,
+        tool_name: str,
+        response: requests.Response,
+        decode_seconds: float,
+        response_bytes: int,
+        opened: Optional[int]
+    ) -> None:
+        """Record the phases and sizes of a response.
+        
+        A new connection is reported when the pool opened one since
+        ``opened`` was counted. Concurrent calls can be credited with each
+        other's connections.
+        """
+        new_connection = None
+        if opened is not None:
+            new_connection = self._opened_connections() > opened
+        record_response(
+            self.metrics,
+            tool_name,
+            response.elapsed.total_seconds(),
+            decode_seconds,
+            response.headers,
+            len(response.request.body or b""),
+            response_bytes,
+            new_connection=new_connection
+        )
+    
+    def call_tool_page(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        cursor: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Page:
+        """Call a tool for one page of its result.
+        
+        Pages bypass the result cache and the coalescer.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            cursor: Cursor of the page, None for the first one
+            deadline: Time budget for the call and its retries
+        
+        Returns:
+            Tuple of the page's result and the cursor of the next page, None
+            on the last page or when the server does not paginate the tool
+        """
+        with use_deadline(deadline):
+            return self._call_tool_page(tool_name, parameters, self._resolve_token(), cursor)
+    
+    def _call_tool_page(self, tool_name: str, parameters: Dict[str, Any], token: str, cursor: Optional[str]) -> Page:
+        """Get one page of a tool result with an already resolved token."""
+        if self.metrics is None:
+            data = self._send_tool_call(tool_name, parameters, token, cursor)
+        else:
+            with track_tool_call(self.metrics, tool_name):
+                data = self._send_tool_call(tool_name, parameters, token, cursor)
+        return data["result"], next_cursor(data)
+    
+    def call_tool_paged(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        prefetch: bool = True,
+        max_pages: Optional[int] = None,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Iterator[Any]:
+        """Call a tool and iterate over the records of every result page.
+        
+        The next page is requested while the records of the current one are
+        consumed. Stop iterating (or close the iterator) to stop paging; at
+        most one page past that point has been requested.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            prefetch: Fetch the next page concurrently
+            max_pages: Maximum number of pages to fetch
+            deadline: Time budget for fetching every page, in seconds or as a
+                ``Deadline``
+        
+        Returns:
+            Iterator over the result records. A page whose result is not a
+            list is yielded as one record
+        """
+        token = self._resolve_token()
+        if deadline is not None and not isinstance(deadline, Deadline):
+            deadline = Deadline(deadline)
+        
+        def fetch(cursor):
+            with use_deadline(deadline):
+                return self._call_tool_page(tool_name, parameters, token, cursor)
+        
+        return self._iter_records(iter_pages(fetch, prefetch=prefetch, max_pages=max_pages))
+    
+    @staticmethod
+    def _iter_records(pages: Iterator[Any]) -> Iterator[Any]:
+        """Yield the records of result pages."""
+        try:
+            for page in pages:
+                if isinstance(page, list):
+                    for record in page:
+                        yield record
+                else:
+                    yield page
+        finally:
+            pages.close()
+    
+    def call_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        deadline: Union[float, Deadline, None] = None
+    ) -> Iterator[Any]:
+        """Call a tool and iterate over its result records as they arrive.
+        
+        The server is asked for newline-delimited JSON, which is decoded one
+        record at a time without buffering the body. A server answering with
+        plain JSON still works: a list result is yielded item by item, any
+        other result once. Stop iterating (or close the iterator) to release
+        the connection early.
+        
+        The call is timed up to its response headers. Reading the records is
+        recorded as its decode phase once the iterator is done.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            deadline: Time budget for sending the call and receiving the
+                response headers
+        
+        Returns:
+            Iterator over the result records
+        """
+        with use_deadline(deadline):
+            response, opened = self._open_tool_stream(tool_name, parameters, self._resolve_token())
+        return self._iter_stream(tool_name, response, opened)
+    
+    def call_tool_preview(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        max_items: int,
+        deadline: Union[float, Deadline, None] = None
+    ) -> Any:
+        """Call a tool and keep only the first records of its result.
+        
+        Records past ``max_items`` are never decoded, and the connection is
+        released as soon as the preview is complete.
+        
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+            max_items: Maximum number of records to return
+            deadline: Time budget for sending the call and receiving the
+                response headers
+        
+        Returns:
+            The records when they all fit, otherwise a dict with the first
+            ``max_items`` records and a truncation note. A result that is not
+            a list is returned unchanged
+        """
+        with use_deadline(deadline):
+            response, opened = self._open_tool_stream(tool_name, parameters, self._resolve_token())
+        started = time.perf_counter()
+        try:
+            if is_ndjson(response.headers):
+                records = iter_ndjson(response.iter_lines(), self.codec.loads)
+            else:
+                result = self._decode(response)["result"]
+                if not isinstance(result, list):
+                    return result
+                records = iter(result)
+            return truncate_records(records, max_items)
+        finally:
+            response.close()
+            if self.metrics is not None:
+                self._record_response(tool_name, response, time.perf_counter() - started, response.raw.tell(), opened)
+    
+    def _open_tool_stream(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        token: str
+    ) -> Tuple[requests.Response, Optional[int]]:
+        """Send a tool call asking for a streamed result.
+        
+        Returns:
+            Tuple of the response, with its body left unread, and the count
+            of connections opened before it was sent
+        """
+        if self.metrics is None:
+            return self._send_stream_call(tool_name, parameters, token), None
+        opened = self._opened_connections()
+        with track_tool_call(self.metrics, tool_name):
+            return self._send_stream_call(tool_name, parameters, token), opened
+    
+    def _send_stream_call(self, tool_name: str, parameters: Dict[str, Any], token: str) -> requests.Response:
+        """Send a streamed tool call and check its status."""
+        headers = {"Authorization": f"Bearer {token}", "Accept": STREAM_ACCEPT}
+        response = self._request(
+            "post",
+            "/tools/call",
+            idempotent=self._is_idempotent_tool(tool_name),
+            headers=headers,
+            json={"name": tool_name, "parameters": parameters},
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
+    
+    def _iter_stream(self, tool_name: str, response: requests.Response, opened: Optional[int]) -> Iterator[Any]:
+        """Yield the records of a streamed response, then release and record it."""
+        records = self._stream_records(response)
+        decode_seconds = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    break
+                finally:
+                    decode_seconds += time.perf_counter() - started
+                yield record
+        finally:
+            response.close()
+            if self.metrics is not None:
+                self._record_response(tool_name, response, decode_seconds, response.raw.tell(), opened)
+    
+    def _stream_records(self, response: requests.Response) -> Iterator[Any]:
+        """Decode the records of a streamed response."""
+        if is_ndjson(response.headers):
+            for record in iter_ndjson(response.iter_lines(), self.codec.loads):
+                yield record
+        else:
+            result = self._decode(response)["result"]
+            if isinstance(result, list):
+                for record in result:
+                    yield record
+            else:
+                yield result
+    
+    def call_tools_batch(
+        self,
+        calls: Sequence[Tuple[str, Dict[str, Any]]],
+        max_concurrency: int = 8,
+        deadline: Union[float, Deadline, None] = None
+    ) -> List[Union[Any, Exception]]:
+        """Call several independent tools concurrently.
+        
+        The calls are sent in one round trip to ``/tools/call_batch`` when the
+        server offers it. Otherwise, or once the server has answered that it
+        does not, they are issued in parallel over the pooled session with at
+        most ``max_concurrency`` requests in flight.
+        
+        Either way, calls go through the result cache, the coalescer and the
+        metrics sink like ``call_tool``: cached results and identical calls
+        already in flight are not sent, identical coalesced calls of the
+        batch are sent once, and every call is counted under its tool.
+        
+        Args:
+            calls: Sequence of ``(tool_name, parameters)`` pairs
+            max_concurrency: Maximum number of parallel requests
+            deadline: Time budget for the whole batch, in seconds or as a
+                ``Deadline``
+        
+        Returns:
+            Results in the order of ``calls``. A call that failed is returned
+            as its exception instead of failing the whole batch
+        """
+        with use_deadline(deadline):
+            return self._call_tools_batch(list(calls), max_concurrency)
+    
+    def _call_tools_batch(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        max_concurrency: int
+    ) -> List[Union[Any, Exception]]:
+        """Run a batch of tool calls under the current deadline."""
+        token = self._resolve_token()
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        
+        if not calls:
+            return []
+        
+        if self._batch_supported is not False:
+            if self.metrics is None:
+                results = self._call_batch(calls, token)
+            else:
+                started = time.perf_counter()
+                with self.metrics.span("mcp.tool_call_batch", {"mcp.batch_size": len(calls)}):
+                    results = self._call_batch(calls, token)
+                if results is not None:
+                    record_batch_call(
+                        self.metrics,
+                        [(tool_name, result) for (tool_name, _), result in zip(calls, results)],
+                        time.perf_counter() - started
+                    )
+            if results is not None:
+                return results
+        
+        def run(call):
+            tool_name, parameters = call
+            try:
+                return self._call_tool(tool_name, parameters, token)
+            except Exception as e:
+                return e
+        
+        workers = min(max_concurrency, len(calls))
+        if workers == 1:
+            return [run(call) for call in calls]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each call runs in a copy of the caller's context, so the
+            # deadline and bound credentials reach the worker threads
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, call)
+                for call in calls
+            ]
+            return [future.result() for future in futures]
+    
+    def _call_batch(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        token: str
+    ) -> Optional[List[Union[Any, Exception]]]:
+        """Serve a batch from the result cache and the coalescer, sending the rest in one request.
+        
+        Returns:
+            Per-call results, or None if the server has no multi-call endpoint
+        """
+        results = [MISSING] * len(calls)
+        cache_ttls = {}
+        requested = []
+        slots = {}
+        slots_by_key = {}
+        for index, (tool_name, parameters) in enumerate(calls):
+            tool_info = self.get_tool_info(tool_name)
+            key = ToolResultCache.make_key(token, tool_name, parameters)
+            if self.result_cache is not None:
+                ttl = self.result_cache.ttl_for(tool_name, tool_info)
+                if ttl is not None:
+                    cache_ttls[index] = (key, ttl)
+                    results[index] = self.result_cache.get(key)
+            coalesced = self.coalescer is not None and self.coalescer.enabled_for(tool_name, tool_info)
+            if results[index] is MISSING and coalesced:
+                try:
+                    results[index] = self.coalescer.join(key)
+                except Exception as e:
+                    results[index] = e
+            if results[index] is not MISSING:
+                continue
+            if coalesced and key in slots_by_key:
+                slots[index] = slots_by_key[key]
+                continue
+            slots[index] = len(requested)
+            if coalesced:
+                slots_by_key[key] = len(requested)
+            requested.append(calls[index])
+        
+        if requested:
+            items = self._call_batch_endpoint(requested, token)
+            if items is None:
+                return None
+            for index, slot in slots.items():
+                results[index] = items[slot]
+                if index in cache_ttls and not isinstance(items[slot], Exception):
+                    self.result_cache.set(cache_ttls[index][0], items[slot], cache_ttls[index][1])
+        return results
+    
+    def _call_batch_endpoint(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        token: str
+    ) -> Optional[List[Union[Any, Exception]]]:
+        """Send calls to the multi-call endpoint.
+        
+        Returns:
+            Per-call results, or None if the server has no multi-call endpoint
+        """
+        headers = {"Authorization": f"Bearer {token}"}
+        opened = self._opened_connections()
+        try:
+            response = self._request(
+                "post",
+                "/tools/call_batch",
+                idempotent=all(self._is_idempotent_tool(tool_name) for tool_name, _ in calls),
+                headers=headers,
+                json={"calls": [
+                    {"name": tool_name, "parameters": parameters}
+                    for tool_name, parameters in calls
+                ]}
+            )
+            if response.status_code in BATCH_UNSUPPORTED_STATUS:
+                self._batch_supported = False
+                return None
+            response.raise_for_status()
+            started = time.perf_counter()
+            items = self._decode(response)["results"]
+        except Exception as e:
+            return [e for _ in calls]
+        if self.metrics is not None:
+            self._record_response(BATCH_TOOL, response, time.perf_counter() - started, len(response.content), opened)
+        
+        self._batch_supported = True
+        results = []
+        for index, (tool_name, _) in enumerate(calls):
+            item = items[index] if index < len(items) else {"error": "Missing from batch response"}
+            if "error" in item:
+                results.append(MCPToolError(tool_name, str(item["error"])))
+            else:
+                results.append(item.get("result"))
+        return results
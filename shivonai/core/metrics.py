@@ -0,0 +1,434 @@
+"""
+Metrics for MCP tool calls.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import re
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+# Client-side seconds spent in tool calls by the adapter call being measured
+_client_seconds = contextvars.ContextVar("shivonai_client_seconds", default=None)
+
+# Metric names
+TOOL_CALLS = "mcp_tool_calls_total"
+TOOL_ERRORS = "mcp_tool_errors_total"
+TOOL_CALL_SECONDS = "mcp_tool_call_seconds"
+TOOL_PHASE_SECONDS = "mcp_tool_phase_seconds"
+ADAPTER_SECONDS = "mcp_adapter_overhead_seconds"
+REQUEST_BYTES = "mcp_tool_request_bytes"
+RESPONSE_BYTES = "mcp_tool_response_bytes"
+CONNECTIONS_OPENED = "mcp_connections_opened_total"
+
+# Tool label of the metrics of multi-call requests
+BATCH_TOOL = "call_batch"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_SERVER_TIMING_DUR = re.compile(r"dur=([0-9.]+)")
+
+
+class MetricsSink:
+    """Receiver of client metrics.
+    
+    The base class discards everything. Subclasses override ``increment``,
+    ``observe`` and ``span`` to forward metrics to a backend. Clients are
+    not instrumented at all when they have no sink.
+    """
+    
+    def increment(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        """Add to a counter.
+        
+        Args:
+            name: Metric name
+            labels: Metric labels
+            value: Amount to add
+        """
+    
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        """Record a value in a histogram.
+        
+        Args:
+            name: Metric name
+            value: Observed value, in seconds or bytes
+            labels: Metric labels
+        """
+    
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Any]:
+        """Trace a block of work.
+        
+        Args:
+            name: Span name
+            attributes: Span attributes
+        """
+        yield None
+
+
+class InMemoryMetrics(MetricsSink):
+    """Thread-safe sink keeping counters and histograms in memory."""
+    
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS
+    ):
+        """Initialize the in-memory sink.
+        
+        Args:
+            latency_buckets: Upper bounds of the latency histogram buckets
+            size_buckets: Upper bounds of the payload size histogram buckets
+        """
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return name, tuple(sorted(labels.items()))
+    
+    def increment(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+    
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = self.size_buckets if name.endswith("_bytes") else self.latency_buckets
+                histogram = {"bounds": bounds, "buckets": [0] * len(bounds), "count": 0, "sum": 0.0}
+                self._histograms[key] = histogram
+            histogram["count"] += 1
+            histogram["sum"] += value
+            for i, bound in enumerate(histogram["bounds"]):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+    
+    def counter(self, name: str, **labels: str) -> float:
+        """Get the value of a counter.
+        
+        Args:
+            name: Metric name
+            labels: Metric labels
+        
+        Returns:
+            Current value, 0 if never incremented
+        """
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0.0)
+    
+    def histogram(self, name: str, **labels: str) -> Optional[Dict[str, Any]]:
+        """Get a histogram.
+        
+        Args:
+            name: Metric name
+            labels: Metric labels
+        
+        Returns:
+            Dict with ``count``, ``sum``, the bucket ``bounds`` and the
+            per-bucket ``buckets`` counts, or None if never observed
+        """
+        with self._lock:
+            histogram = self._histograms.get(self._key(name, labels))
+            if histogram is None:
+                return None
+            return dict(histogram, buckets=list(histogram["buckets"]))
+    
+    def clear(self) -> None:
+        """Drop every recorded metric."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class PrometheusMetrics(InMemoryMetrics):
+    """In-memory sink rendering the Prometheus text exposition format.
+    
+    Serve ``render()`` from the application's ``/metrics`` endpoint.
+    """
+    
+    @staticmethod
+    def _labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+        parts = []
+        for name, value in labels:
+            value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            parts.append(f'{name}="{value}"')
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format.
+        
+        Returns:
+            Metrics text, ending with a newline
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, dict(value, buckets=list(value["buckets"])))
+                for key, value in self._histograms.items()
+            )
+        
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+        for (name, labels), histogram in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(histogram["bounds"], histogram["buckets"]):
+                cumulative += count
+                bucket_labels = self._labels(labels, f'le="{bound:g}"')
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            bucket_labels = self._labels(labels, 'le="+Inf"')
+            lines.append(f"{name}_bucket{bucket_labels} {histogram['count']}")
+            lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']:g}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryMetrics(MetricsSink):
+    """Sink forwarding metrics and spans to OpenTelemetry.
+    
+    Each tool call becomes a span, and counters and histograms are recorded
+    with OpenTelemetry instruments.
+    """
+    
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        """Initialize the OpenTelemetry sink.
+        
+        Args:
+            tracer: Tracer used for spans. Defaults to the global tracer
+            meter: Meter used for counters and histograms. Defaults to the
+                global meter
+        """
+        if tracer is None or meter is None:
+            try:
+                from opentelemetry import metrics, trace
+            except ImportError:
+                raise ImportError(
+                    "Could not import opentelemetry. "
+                    "Please install it with `pip install opentelemetry-api`."
+                )
+            if tracer is None:
+                tracer = trace.get_tracer("shivonai")
+            if meter is None:
+                meter = metrics.get_meter("shivonai")
+        self.tracer = tracer
+        self.meter = meter
+        self._instruments = {}
+        self._lock = threading.Lock()
+    
+    def _instrument(self, name: str, factory: str) -> Any:
+        with self._lock:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                unit = "By" if name.endswith("_bytes") else "s" if name.endswith("_seconds") else "1"
+                instrument = getattr(self.meter, factory)(name, unit=unit)
+                self._instruments[name] = instrument
+            return instrument
+    
+    def increment(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        self._instrument(name, "create_counter").add(value, attributes=labels)
+    
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        self._instrument(name, "create_histogram").record(value, attributes=labels)
+    
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Any]:
+        with self.tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+
+class ConnectionTrace:
+    """Time the connection setup of an httpx request from its trace events.
+    
+    Pass ``trace`` as the ``"trace"`` extension of the request.
+    ``connect_seconds`` stays None when the request reuses a pooled
+    connection.
+    """
+    
+    def __init__(self):
+        """Initialize the trace."""
+        self.connect_seconds = None
+        self._opened = 0.0
+        self._started = None
+    
+    async def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Receive an httpcore trace event."""
+        if event_name == "connection.connect_tcp.started":
+            self._opened = self.connect_seconds or 0.0
+            self._started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self._started is not None:
+                self.connect_seconds = self._opened + time.perf_counter() - self._started
+
+
+def server_seconds(headers: Any) -> Optional[float]:
+    """Get the server processing time from a ``Server-Timing`` header.
+    
+    Args:
+        headers: Response headers
+    
+    Returns:
+        Longest duration reported by the server, in seconds, or None if the
+        server reports none
+    """
+    value = headers.get("Server-Timing") if headers is not None else None
+    if not value:
+        return None
+    durations = [float(dur) for dur in _SERVER_TIMING_DUR.findall(value)]
+    return max(durations) / 1000.0 if durations else None
+
+
+@contextlib.contextmanager
+def track_tool_call(sink: MetricsSink, tool_name: str) -> Iterator[None]:
+    """Count and time a tool call made by a client.
+    
+    Args:
+        sink: Sink receiving the metrics
+        tool_name: Name of the tool being called
+    """
+    labels = {"tool": tool_name}
+    started = time.perf_counter()
+    try:
+        with sink.span("mcp.tool_call", {"mcp.tool": tool_name}):
+            yield
+    except Exception as e:
+        sink.increment(TOOL_ERRORS, {"tool": tool_name, "error": type(e).__name__})
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        sink.increment(TOOL_CALLS, labels)
+        sink.observe(TOOL_CALL_SECONDS, elapsed, labels)
+        client_seconds = _client_seconds.get()
+        if client_seconds is not None:
+            client_seconds[0] += elapsed
+
+
+def record_response(
+    sink: MetricsSink,
+    tool_name: str,
+    response_seconds: float,
+    decode_seconds: float,
+    headers: Any,
+    request_bytes: int,
+    response_bytes: int,
+    new_connection: Optional[bool] = None,
+    connect_seconds: Optional[float] = None
+) -> None:
+    """Record the phases and payload sizes of a tool call response.
+    
+    The time to the response headers covers DNS, connect and server time.
+    When the server reports its own time in ``Server-Timing``, it is split
+    into ``server`` and ``network`` phases. Opening a new connection is
+    counted apart, and its time is recorded as the ``connect`` phase and
+    left out of ``network`` when it is known.
+    
+    Args:
+        sink: Sink receiving the metrics
+        tool_name: Name of the tool called
+        response_seconds: Time from sending the request to its response headers
+        decode_seconds: Time spent decoding the response body
+        headers: Response headers
+        request_bytes: Size of the request body
+        response_bytes: Size of the response body
+        new_connection: Whether a new connection was opened for the call,
+            None if unknown
+        connect_seconds: Time spent opening the new connection, if measured
+    """
+    labels = {"tool": tool_name}
+    sink.observe(TOOL_PHASE_SECONDS, response_seconds, dict(labels, phase="response"))
+    if new_connection:
+        sink.increment(CONNECTIONS_OPENED, labels)
+    if connect_seconds is not None:
+        sink.observe(TOOL_PHASE_SECONDS, connect_seconds, dict(labels, phase="connect"))
+    server = server_seconds(headers)
+    if server is not None:
+        network = response_seconds - server - (connect_seconds or 0.0)
+        sink.observe(TOOL_PHASE_SECONDS, server, dict(labels, phase="server"))
+        sink.observe(TOOL_PHASE_SECONDS, max(0.0, network), dict(labels, phase="network"))
+    sink.observe(TOOL_PHASE_SECONDS, decode_seconds, dict(labels, phase="decode"))
+    sink.observe(REQUEST_BYTES, request_bytes, labels)
+    sink.observe(RESPONSE_BYTES, response_bytes, labels)
+
+
+def record_batch_call(sink: MetricsSink, results: Sequence[Tuple[str, Any]], seconds: float) -> None:
+    """Count and time the calls of a batch answered together.
+    
+    Each call is counted under its own tool, with the time of the whole
+    batch, which it waited for. Calls whose result is an exception are
+    counted as errors.
+    
+    Args:
+        sink: Sink receiving the metrics
+        results: Pairs of each call's tool name and result
+        seconds: Time taken by the batch
+    """
+    for tool_name, result in results:
+        labels = {"tool": tool_name}
+        if isinstance(result, Exception):
+            sink.increment(TOOL_ERRORS, {"tool": tool_name, "error": type(result).__name__})
+        sink.increment(TOOL_CALLS, labels)
+        sink.observe(TOOL_CALL_SECONDS, seconds, labels)
+    client_seconds = _client_seconds.get()
+    if client_seconds is not None:
+        client_seconds[0] += seconds
+
+
+def instrument_tool(func: Callable, tool_name: str, sink: Optional[MetricsSink], framework: str) -> Callable:
+    """Measure the overhead a toolkit wrapper adds around its tool calls.
+    
+    Args:
+        func: Tool function or coroutine function built by a toolkit
+        tool_name: Name of the tool
+        sink: Sink receiving the metrics. The function is returned as-is
+            when None
+        framework: Name of the agent framework, used as a label
+    
+    Returns:
+        The instrumented function
+    """
+    if sink is None:
+        return func
+    labels = {"tool": tool_name, "framework": framework}
+    
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            client_seconds = [0.0]
+            reset_token = _client_seconds.set(client_seconds)
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                sink.observe(ADAPTER_SECONDS, max(0.0, time.perf_counter() - started - client_seconds[0]), labels)
+                _client_seconds.reset(reset_token)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        client_seconds = [0.0]
+        reset_token = _client_seconds.set(client_seconds)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sink.observe(ADAPTER_SECONDS, max(0.0, time.perf_counter() - started - client_seconds[0]), labels)
+            _client_seconds.reset(reset_token)
+    return wrapper
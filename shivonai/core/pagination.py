@@ -0,0 +1,159 @@
+"""
+Cursor pagination of tool catalogs and tool results.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Tuple
+
+# A page of items and the cursor of the next page, None on the last page
+Page = Tuple[List[Any], Optional[str]]
+
+# Optional parameter added to every tool of a paged toolkit
+CURSOR_PARAM = {
+    "name": "cursor",
+    "type": "string",
+    "description": "Cursor returned with the previous page of results. Omit it for the first page",
+    "required": False
+}
+
+
+def next_cursor(data: Dict[str, Any]) -> Optional[str]:
+    """Get the cursor of the next page from a response body.
+    
+    Both ``next_cursor`` and the MCP spelling ``nextCursor`` are understood.
+    
+    Returns:
+        The cursor, or None on the last page
+    """
+    return data.get("next_cursor") or data.get("nextCursor") or None
+
+
+def iter_pages(
+    fetch: Callable[[Optional[str]], Page],
+    cursor: Optional[str] = None,
+    prefetch: bool = True,
+    max_pages: Optional[int] = None
+) -> Iterator[List[Any]]:
+    """Iterate over pages, fetching the next one while the current is used.
+    
+    The prefetch runs in a background thread, in a copy of the caller's
+    context so bound deadlines and credentials apply to it.
+    
+    Args:
+        fetch: Callable fetching the page at a cursor, None for the first
+        cursor: Cursor to start from
+        prefetch: Fetch the next page concurrently
+        max_pages: Maximum number of pages to fetch
+    
+    Returns:
+        Iterator over the pages' item lists
+    """
+    executor = None
+    try:
+        page, cursor = fetch(cursor)
+        fetched = 1
+        while True:
+            more = cursor is not None and (max_pages is None or fetched < max_pages)
+            future = None
+            if more and prefetch:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=1)
+                future = executor.submit(contextvars.copy_context().run, fetch, cursor)
+            yield page
+            if not more:
+                return
+            page, cursor = future.result() if future is not None else fetch(cursor)
+            fetched += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_pages(
+    fetch: Callable[[Optional[str]], Awaitable[Page]],
+    cursor: Optional[str] = None,
+    prefetch: bool = True,
+    max_pages: Optional[int] = None
+) -> AsyncIterator[List[Any]]:
+    """Asyncio counterpart of ``iter_pages``, prefetching with a task."""
+    task = None
+    try:
+        page, cursor = await fetch(cursor)
+        fetched = 1
+        while True:
+            more = cursor is not None and (max_pages is None or fetched < max_pages)
+            task = asyncio.ensure_future(fetch(cursor)) if more and prefetch else None
+            yield page
+            if not more:
+                return
+            page, cursor = await task if task is not None else await fetch(cursor)
+            task = None
+            fetched += 1
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+
+
+def page_result(items: List[Any], cursor: Optional[str]) -> Any:
+    """Build the result of one page handed to an agent.
+    
+    Returns:
+        The items on the last page, otherwise a dict with the items and the
+        cursor to pass to get the next page
+    """
+    if cursor is None:
+        return items
+    return {
+        "items": items,
+        "next_cursor": cursor,
+        "note": f"More results available. Call the tool again with the same parameters and cursor={cursor!r}."
+    }
+
+
+def with_cursor_param(tool_infos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add the optional ``cursor`` parameter to every tool of a catalog.
+    
+    Args:
+        tool_infos: Tool definitions from the catalog
+    
+    Returns:
+        Copies of the definitions with the extra parameter
+    """
+    paged = []
+    for tool_info in tool_infos:
+        parameters = tool_info.get("parameters", [])
+        if not any(param.get("name") == "cursor" for param in parameters):
+            tool_info = dict(tool_info, parameters=list(parameters) + [dict(CURSOR_PARAM)])
+        paged.append(tool_info)
+    return paged
+
+
+def paged_callers(client: Any, async_client: Any) -> Tuple[Callable, Optional[Callable]]:
+    """Get toolkit callables returning one page of results per call.
+    
+    The ``cursor`` argument the agent passes is sent to the server as the
+    page cursor instead of as a tool parameter.
+    
+    Args:
+        client: MCPClient used by the sync wrappers
+        async_client: AsyncMCPClient used by the async wrappers, or None
+    
+    Returns:
+        Tuple of the sync and async callables
+    """
+    def split(parameters):
+        parameters = dict(parameters)
+        return parameters, parameters.pop("cursor", None) or None
+    
+    def call_tool(tool_name, parameters):
+        parameters, cursor = split(parameters)
+        return page_result(*client.call_tool_page(tool_name, parameters, cursor))
+    
+    acall_tool = None
+    if async_client is not None:
+        async def acall_tool(tool_name, parameters):
+            parameters, cursor = split(parameters)
+            return page_result(*await async_client.call_tool_page(tool_name, parameters, cursor))
+    
+    return call_tool, acall_tool
@@ -0,0 +1,225 @@
+"""
+Retry and circuit breaker policies for MCP transports.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Iterable, Optional
+
+# Status codes worth retrying: rate limiting and transient gateway errors
+RETRY_STATUS = (429, 502, 503, 504)
+
+# Status codes counted as a failure of the server by the circuit breaker. A
+# 500 is the error of one tool call, not of the endpoint, so it is not counted
+FAILURE_STATUS = (502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the endpoint's circuit is open."""
+    
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Retry policy with jittered exponential backoff.
+    
+    Idempotent calls (``/initialize``, ``/tools/list`` and tools declared
+    read-only or idempotent) are retried on transient statuses and connection
+    errors. Any call is retried when it failed to connect or was rejected with
+    429, since the server never ran it.
+    """
+    
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 60.0,
+        retry_status: Iterable[int] = RETRY_STATUS,
+        idempotent_tools: Iterable[str] = ()
+    ):
+        """Initialize the retry policy.
+        
+        Args:
+            max_retries: Maximum number of retries after the first attempt
+            backoff_factor: Base delay in seconds, doubled on every retry
+            max_backoff: Maximum backoff delay in seconds
+            max_retry_after: Longest ``Retry-After`` honoured, in seconds. A
+                longer one is not retried
+            retry_status: Status codes that are retried
+            idempotent_tools: Tools that may be retried in addition to the
+                ones the catalog declares read-only or idempotent
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_status = frozenset(retry_status)
+        self.idempotent_tools = frozenset(idempotent_tools)
+    
+    def is_idempotent_tool(self, tool_name: str, tool_info: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether a tool call can safely be sent twice.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_info: Tool definition from the catalog, if known
+        
+        Returns:
+            True if the tool may be retried
+        """
+        if tool_name in self.idempotent_tools:
+            return True
+        annotations = (tool_info or {}).get("annotations") or {}
+        return bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+    
+    def backoff(self, attempt: int) -> float:
+        """Get the delay before a retry, with full jitter.
+        
+        Args:
+            attempt: Number of the retry, starting at 0
+        
+        Returns:
+            Delay in seconds
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+    
+    def retry_after(self, headers: Any) -> Optional[float]:
+        """Parse the ``Retry-After`` header of a response.
+        
+        Args:
+            headers: Response headers
+        
+        Returns:
+            Delay in seconds, or None if the header is missing or invalid
+        """
+        value = headers.get("Retry-After") if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError):
+            return None
+    
+    def delay_for_status(self, attempt: int, status: int, headers: Any, idempotent: bool) -> Optional[float]:
+        """Get the delay before retrying a response, if it should be retried.
+        
+        Args:
+            attempt: Number of the retry, starting at 0
+            status: Response status code
+            headers: Response headers
+            idempotent: Whether the call is safe to send twice
+        
+        Returns:
+            Delay in seconds, or None if the response is final
+        """
+        if attempt >= self.max_retries or status not in self.retry_status:
+            return None
+        if status != 429 and not idempotent:
+            return None
+        retry_after = self.retry_after(headers)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+    
+    def delay_for_error(self, attempt: int, connect_error: bool, idempotent: bool) -> Optional[float]:
+        """Get the delay before retrying a failed request, if it should be retried.
+        
+        Args:
+            attempt: Number of the retry, starting at 0
+            connect_error: Whether the request failed before reaching the server
+            idempotent: Whether the call is safe to send twice
+        
+        Returns:
+            Delay in seconds, or None if the error is final
+        """
+        if attempt >= self.max_retries or not (connect_error or idempotent):
+            return None
+        return self.backoff(attempt)
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+    
+    After ``failure_threshold`` consecutive failures of an endpoint, calls to
+    it fail fast with ``CircuitOpenError`` for ``recovery_timeout`` seconds.
+    Then a single trial call is let through: success closes the circuit,
+    failure opens it again. Gateway errors (502, 503, 504) and transport
+    errors count as failures; any other response counts as a success.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._trial_in_flight = set()
+        self._lock = threading.Lock()
+    
+    def before_call(self, endpoint: str) -> None:
+        """Check that a call to an endpoint may go through.
+        
+        Args:
+            endpoint: Endpoint being called
+        
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint is open
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return
+            retry_in = opened_at + self.recovery_timeout - time.monotonic()
+            if retry_in > 0 or endpoint in self._trial_in_flight:
+                raise CircuitOpenError(endpoint, max(retry_in, 0.0))
+            self._trial_in_flight.add(endpoint)
+    
+    def record_success(self, endpoint: str) -> None:
+        """Record a successful call, closing the endpoint's circuit."""
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+            self._trial_in_flight.discard(endpoint)
+    
+    def record_failure(self, endpoint: str) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if failures >= self.failure_threshold or endpoint in self._trial_in_flight:
+                self._opened_at[endpoint] = time.monotonic()
+            self._trial_in_flight.discard(endpoint)
+    
+    def release(self, endpoint: str) -> None:
+        """End a call that neither succeeded nor failed, e.g. a cancelled one.
+        
+        A trial call ending this way lets the next call through as a new
+        trial, without changing the failure count.
+        """
+        with self._lock:
+            self._trial_in_flight.discard(endpoint)
+    
+    def is_open(self, endpoint: str) -> bool:
+        """Check whether an endpoint's circuit is currently open."""
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            return opened_at is not None and opened_at + self.recovery_timeout > time.monotonic()
+
+
+# Shared by every client that is not given its own policies, so all clients
+# talking to an endpoint see the same circuit state
+DEFAULT_RETRY_POLICY = RetryPolicy()
+DEFAULT_CIRCUIT_BREAKER = CircuitBreaker()
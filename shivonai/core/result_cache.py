@@ -0,0 +1,178 @@
+"""
+Opt-in cache of tool call results.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional
+
+from shivonai.core.codec import get_codec
+
+# Sentinel for "no cached value", since None is a valid tool result
+MISSING = object()
+
+
+class ToolResultCache:
+    """Thread-safe LRU + TTL cache of tool results.
+    
+    Results are keyed by tenant token, tool name and canonicalized
+    parameters. A tool is only cached when it is declared read-only, either
+    by the catalog (``annotations.readOnlyHint`` or a ``cache_ttl`` field) or
+    by ``tool_ttls``. Tools the catalog marks as destructive or not read-only
+    are never cached.
+    """
+    
+    def __init__(
+        self,
+        default_ttl: float = 60.0,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        tool_ttls: Optional[Dict[str, Optional[float]]] = None
+    ):
+        """Initialize the result cache.
+        
+        Args:
+            default_ttl: Seconds a result of a read-only tool is kept
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of cached results, measured on their
+                JSON encoding
+            tool_ttls: Per-tool TTL overrides. A positive value marks the tool
+                cacheable, ``None`` or ``0`` disables caching for it
+        """
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.tool_ttls = dict(tool_ttls or {})
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def ttl_for(self, tool_name: str, tool_info: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """Get the TTL for a tool's results.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_info: Tool definition from the catalog, if known
+        
+        Returns:
+            TTL in seconds, or None if the tool must not be cached
+        """
+        annotations = (tool_info or {}).get("annotations") or {}
+        if annotations.get("destructiveHint") or annotations.get("readOnlyHint") is False:
+            return None
+        
+        if tool_name in self.tool_ttls:
+            ttl = self.tool_ttls[tool_name]
+        elif tool_info is not None and "cache_ttl" in tool_info:
+            ttl = tool_info["cache_ttl"]
+        elif annotations.get("readOnlyHint"):
+            ttl = self.default_ttl
+        else:
+            ttl = None
+        return ttl if ttl and ttl > 0 else None
+    
+    @staticmethod
+    def make_key(token: str, tool_name: str, parameters: Dict[str, Any]) -> str:
+        """Build the cache key for a call.
+        
+        Args:
+            token: Authentication token of the tenant
+            tool_name: Name of the tool
+            parameters: Parameters of the call
+        
+        Returns:
+            Hex digest identifying the call
+        """
+        payload = json.dumps(
+            [token, tool_name, parameters],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Any:
+        """Get a cached result.
+        
+        Args:
+            key: Cache key from ``make_key``
+        
+        Returns:
+            The cached result, or ``MISSING``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a result.
+        
+        Args:
+            key: Cache key from ``make_key``
+            value: Result to store
+            ttl: Seconds the result is kept
+        """
+        size = len(get_codec().dumps(value))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+    
+    def get_or_call(
+        self,
+        token: str,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        call: Callable[[], Any],
+        tool_info: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Serve a call from the cache, or make it and cache the result.
+        
+        Args:
+            token: Authentication token of the tenant
+            tool_name: Name of the tool
+            parameters: Parameters of the call
+            call: Callable making the actual tool call
+            tool_info: Tool definition from the catalog, if known
+        
+        Returns:
+            Result of the tool call. Cached results are shared and must not be
+            modified
+        """
+        ttl = self.ttl_for(tool_name, tool_info)
+        if ttl is None:
+            return call()
+        
+        key = self.make_key(token, tool_name, parameters)
+        value = self.get(key)
+        if value is MISSING:
+            value = call()
+            self.set(key, value, ttl)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
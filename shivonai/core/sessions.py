@@ -0,0 +1,227 @@
+"""
+Shared MCP sessions: one ``/initialize`` per credential, refreshed ahead of expiry.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+# Status of a request whose token the server rejected
+UNAUTHORIZED = 401
+
+
+def bearer_token(headers: Optional[Dict[str, str]]) -> Optional[str]:
+    """Get the token of a request's ``Authorization`` header, if any."""
+    authorization = (headers or {}).get("Authorization") or ""
+    if authorization.startswith("Bearer "):
+        return authorization[len("Bearer "):]
+    return None
+
+
+class Session:
+    """Result of ``/initialize`` for one server and token."""
+    
+    def __init__(self, server_info: Dict[str, Any], expires_at: float, created_at: Optional[float] = None):
+        self.server_info = server_info
+        self.expires_at = expires_at
+        self.created_at = time.time() if created_at is None else created_at
+    
+    def expired(self) -> bool:
+        """Check whether the session must be renewed before use."""
+        return time.time() >= self.expires_at
+    
+    def refresh_due(self, margin: float) -> bool:
+        """Check whether the session is within ``margin`` seconds of expiry."""
+        return time.time() >= self.expires_at - margin
+
+
+class _Flight:
+    """An ``/initialize`` request shared by every caller waiting on it."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.session = None
+        self.error = None
+
+
+class SessionManager:
+    """Cache of MCP sessions keyed by ``(base_url, token)``.
+    
+    ``/initialize`` runs once per credential. Callers arriving while it is
+    in flight wait for that request instead of sending their own, so a
+    worker pool starting up authenticates each token once. A session is
+    served until ``ttl`` seconds (or the ``expires_in`` the server returns)
+    have passed; within ``refresh_margin`` seconds of expiry it is still
+    served while a background request renews it. Clients drop the session
+    of a token the server rejects with 401 and initialize it again once.
+    """
+    
+    def __init__(self, ttl: float = 3600.0, refresh_margin: float = 300.0, max_sessions: int = 1024):
+        """Initialize the session manager.
+        
+        Args:
+            ttl: Seconds a session is valid when the server does not say
+            refresh_margin: Seconds before expiry at which a session is
+                renewed in the background
+            max_sessions: Maximum number of sessions kept
+        """
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(base_url: str, token: str) -> Tuple[str, str]:
+        return (base_url.rstrip("/"), token)
+    
+    def _session(self, data: Dict[str, Any]) -> Session:
+        """Build a session from an ``/initialize`` response body."""
+        ttl = data.get("expires_in")
+        # A missing, null or malformed lifetime falls back to the default
+        if isinstance(ttl, bool) or not isinstance(ttl, (int, float, str)):
+            ttl = self.ttl
+        try:
+            ttl = float(ttl)
+        except ValueError:
+            ttl = self.ttl
+        if not 0 <= ttl < float("inf"):
+            ttl = self.ttl
+        return Session(data["server_info"], time.time() + ttl)
+    
+    def _store(self, key: Tuple[str, str], session: Session) -> None:
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+    
+    def peek(self, base_url: str, token: str) -> Optional[Session]:
+        """Get the cached session, even if expired, without renewing it."""
+        with self._lock:
+            return self._sessions.get(self._key(base_url, token))
+    
+    def get(self, base_url: str, token: str, initialize: Callable[[], Dict[str, Any]]) -> Session:
+        """Get a valid session, initializing it if needed.
+        
+        Args:
+            base_url: URL of the MCP server
+            token: Authentication token
+            initialize: Callable sending ``/initialize`` and returning the
+                decoded response body
+        
+        Returns:
+            The session
+        """
+        key = self._key(base_url, token)
+        session = self.peek(base_url, token)
+        if session is not None and not session.expired():
+            if session.refresh_due(self.refresh_margin):
+                self._refresh_in_background(key, initialize)
+            return session
+        return self._initialize(key, initialize)
+    
+    def _initialize(self, key: Tuple[str, str], initialize: Callable[[], Dict[str, Any]]) -> Session:
+        """Run ``/initialize`` once for every concurrent caller of a key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.session
+        
+        try:
+            flight.session = self._session(initialize())
+            self._store(key, flight.session)
+            return flight.session
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+    
+    def _refresh_in_background(self, key: Tuple[str, str], initialize: Callable[[], Dict[str, Any]]) -> None:
+        with self._lock:
+            if key in self._flights:
+                return
+        
+        def refresh():
+            try:
+                self._initialize(key, initialize)
+            except Exception:
+                # The current session stays valid until it expires, when the
+                # next caller renews it and sees the error
+                pass
+        
+        threading.Thread(target=refresh, name="shivonai-session-refresh", daemon=True).start()
+    
+    async def aget(self, base_url: str, token: str, initialize: Callable[[], Awaitable[Dict[str, Any]]]) -> Session:
+        """Get a valid session from asyncio code, initializing it if needed.
+        
+        Args:
+            base_url: URL of the MCP server
+            token: Authentication token
+            initialize: Coroutine function sending ``/initialize`` and
+                returning the decoded response body
+        
+        Returns:
+            The session
+        """
+        key = self._key(base_url, token)
+        session = self.peek(base_url, token)
+        if session is not None and not session.expired():
+            if session.refresh_due(self.refresh_margin):
+                task = self._initialize_task(key, initialize)
+                # Errors surface on the first call after expiry
+                task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            return session
+        return await asyncio.shield(self._initialize_task(key, initialize))
+    
+    def _initialize_task(
+        self,
+        key: Tuple[str, str],
+        initialize: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> "asyncio.Task":
+        """Get the in-flight ``/initialize`` task of a key on this loop."""
+        loop = asyncio.get_running_loop()
+        flight_key = (key, id(loop))
+        task = self._async_flights.get(flight_key)
+        if task is None:
+            async def run():
+                try:
+                    session = self._session(await initialize())
+                    self._store(key, session)
+                    return session
+                finally:
+                    self._async_flights.pop(flight_key, None)
+            
+            task = self._async_flights[flight_key] = loop.create_task(run())
+        return task
+    
+    def invalidate(self, base_url: str, token: str) -> None:
+        """Drop a session, e.g. after the server rejected its token."""
+        with self._lock:
+            self._sessions.pop(self._key(base_url, token), None)
+    
+    def clear(self) -> None:
+        """Drop every session."""
+        with self._lock:
+            self._sessions.clear()
+
+
+_session_manager = SessionManager()
+
+
+def get_session_manager() -> SessionManager:
+    """Get the process-wide session manager shared by all toolkits."""
+    return _session_manager
@@ -0,0 +1,125 @@
+"""
+Helpers for streamed tool results.
+"""
+import functools
+import itertools
+import json
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from shivonai.core.budget import OutputBudget, budget_callers
+from shivonai.core.catalog import catalog_callers
+from shivonai.core.credentials import token_callers
+from shivonai.core.pagination import paged_callers
+from shivonai.utils.validation import validating_callers
+
+# Content types of newline-delimited JSON responses
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Accept header asking for a streamed result, falling back to plain JSON
+STREAM_ACCEPT = "application/x-ndjson, application/json;q=0.9"
+
+_END = object()
+
+
+def is_ndjson(headers: Any) -> bool:
+    """Check whether a response carries newline-delimited JSON.
+    
+    Args:
+        headers: Response headers
+    
+    Returns:
+        True if the body is one JSON record per line
+    """
+    content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    return content_type in NDJSON_CONTENT_TYPES
+
+
+def iter_ndjson(lines: Iterable[Any], loads: Callable[[Any], Any] = json.loads) -> Iterator[Any]:
+    """Decode newline-delimited JSON records one at a time.
+    
+    Args:
+        lines: Lines of the response body, as bytes or str
+        loads: JSON decoder taking bytes or str
+    
+    Returns:
+        Iterator over the decoded records
+    """
+    for line in lines:
+        if line.strip():
+            yield loads(line)
+
+
+def truncate_records(records: Iterator[Any], max_items: int) -> Any:
+    """Take at most ``max_items`` records without consuming the rest.
+    
+    Args:
+        records: Iterator over the records of a result
+        max_items: Maximum number of records to keep
+    
+    Returns:
+        The records as a list when they all fit, otherwise a dict with the
+        first records and a note telling the agent the result was truncated
+    """
+    items = list(itertools.islice(records, max_items))
+    if next(records, _END) is _END:
+        return items
+    return {
+        "items": items,
+        "truncated": True,
+        "note": f"Showing the first {len(items)} records only. "
+                "Narrow the request to see the others."
+    }
+
+
+def tool_callers(
+    client: Any,
+    async_client: Any,
+    stream_limit: Optional[int] = None,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False,
+    tool_infos: Optional[List[Dict[str, Any]]] = None,
+    validate: bool = True,
+    auth_token: Optional[str] = None
+) -> Tuple[Callable, Callable]:
+    """Get the sync and async callables toolkit wrappers call tools with.
+    
+    Args:
+        client: MCPClient used by the sync wrappers
+        async_client: AsyncMCPClient used by the async wrappers, or None
+            if the toolkit has none
+        stream_limit: Maximum number of result records handed to the agent.
+            When set, results are streamed and cut short instead of being
+            fully materialized
+        budget: ``OutputBudget`` shaping the results handed to the agent
+        paged: Hand the agent one result page per call, with the cursor of
+            the next page. Takes precedence over ``stream_limit``
+        tool_infos: Tool definitions the toolkit was built from. The client
+            reads tool metadata from them during each call
+        validate: Check and coerce the arguments against ``tool_infos``
+            before each call
+        auth_token: Token the toolkit was built with. Calls are made with it
+            rather than the token of the clients' latest ``connect()``
+    
+    Returns:
+        Tuple of the sync and async callables, both taking the tool name and
+        its parameters. The async callable is None without an async client
+    """
+    if paged:
+        call_tool, acall_tool = paged_callers(client, async_client)
+    elif stream_limit is None:
+        call_tool = client.call_tool
+        acall_tool = async_client.call_tool if async_client is not None else None
+    else:
+        call_tool = functools.partial(client.call_tool_preview, max_items=stream_limit)
+        acall_tool = None
+        if async_client is not None:
+            acall_tool = functools.partial(async_client.call_tool_preview, max_items=stream_limit)
+    if auth_token is not None:
+        call_tool, acall_tool = token_callers(auth_token, call_tool, acall_tool)
+    if tool_infos is not None:
+        call_tool, acall_tool = catalog_callers(tool_infos, call_tool, acall_tool)
+    if budget is not None:
+        call_tool, acall_tool = budget_callers(budget, call_tool, acall_tool)
+    if tool_infos is not None and validate:
+        call_tool, acall_tool = validating_callers(tool_infos, call_tool, acall_tool)
+    return call_tool, acall_tool
@@ -0,0 +1,247 @@
+"""
+Local retrieval index used to pre-select tools from large catalogs.
+"""
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Callable, Optional, Sequence, Tuple
+
+from shivonai.core.catalog import catalog_version
+
+# Callable embedding a batch of texts, one vector per text
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_TOKEN_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking snake_case and camelCase.
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        List of terms, with a trailing plural ``s`` removed
+    """
+    terms = []
+    for term in _TOKEN_RE.findall(text):
+        term = term.lower()
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+def tool_text(tool_info: Dict[str, Any]) -> str:
+    """Get the searchable text of a tool: name, description and parameters."""
+    parts = [tool_info.get("name", ""), tool_info.get("description", "")]
+    for param in tool_info.get("parameters", []):
+        parts.append(param.get("name", ""))
+        parts.append(param.get("description", ""))
+    return " ".join(part for part in parts if part)
+
+
+class _Document:
+    """Indexed form of one tool definition."""
+    
+    __slots__ = ("name", "terms", "length", "vector")
+    
+    def __init__(self, tool_info: Dict[str, Any]):
+        self.name = tool_info["name"]
+        # The name counts twice, it is the strongest signal of what a tool does
+        terms = tokenize(tool_info["name"]) + tokenize(tool_text(tool_info))
+        self.terms = Counter(terms)
+        self.length = len(terms)
+        self.vector = None
+
+
+class ToolIndex:
+    """BM25 index over tool names, descriptions and parameters.
+    
+    With an ``embedder``, scores blend BM25 with the cosine similarity of
+    the query and tool embeddings. Building from a ``previous`` index reuses
+    its documents and embeddings for unchanged tools, so a refreshed catalog
+    only processes the tools that changed.
+    """
+    
+    def __init__(
+        self,
+        tools: List[Dict[str, Any]],
+        embedder: Optional[Embedder] = None,
+        embedding_weight: float = 0.5,
+        previous: Optional["ToolIndex"] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """Initialize the index.
+        
+        Args:
+            tools: Tool definitions from the catalog
+            embedder: Callable embedding a batch of texts
+            embedding_weight: Share of the score given to embeddings, from 0
+                to 1. Ignored without an ``embedder``
+            previous: Index of an earlier catalog to reuse documents from
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.embedder = embedder
+        self.embedding_weight = embedding_weight
+        self.k1 = k1
+        self.b = b
+        
+        # Embeddings are only comparable when they come from the same embedder
+        reusable = {}
+        if previous is not None and previous.embedder is embedder:
+            reusable = previous._fingerprints
+        self._fingerprints = {}
+        self._documents = []
+        pending = []
+        for tool_info in tools:
+            fingerprint = catalog_version([tool_info])
+            document = reusable.get(fingerprint)
+            if document is None:
+                document = _Document(tool_info)
+                if embedder is not None:
+                    pending.append((document, tool_text(tool_info)))
+            self._fingerprints[fingerprint] = document
+            self._documents.append(document)
+        
+        if pending:
+            vectors = embedder([text for _, text in pending])
+            for (document, _), vector in zip(pending, vectors):
+                document.vector = list(vector)
+        
+        self._postings = {}
+        for document in self._documents:
+            for term, count in document.terms.items():
+                self._postings.setdefault(term, []).append((document, count))
+        total = sum(document.length for document in self._documents)
+        self._average_length = total / len(self._documents) if self._documents else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def _bm25(self, query: str) -> Dict[str, float]:
+        scores = {}
+        count = len(self._documents)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for document, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * document.length / (self._average_length or 1))
+                score = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores[document.name] = scores.get(document.name, 0.0) + score
+        return scores
+    
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Rank tools by relevance to a query.
+        
+        Args:
+            query: Natural language description of the task
+            k: Maximum number of tools returned
+        
+        Returns:
+            List of ``(tool_name, score)``, best first. Tools that share no
+            term with the query are only returned when embeddings are used
+        """
+        scores = self._bm25(query)
+        if self.embedder is not None and self._documents:
+            top = max(scores.values()) if scores else 0.0
+            query_vector = list(self.embedder([query])[0])
+            query_norm = math.sqrt(sum(x * x for x in query_vector)) or 1.0
+            weight = self.embedding_weight
+            for document in self._documents:
+                vector = document.vector
+                norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+                cosine = sum(x * y for x, y in zip(query_vector, vector)) / (norm * query_norm)
+                lexical = scores.get(document.name, 0.0) / top if top else 0.0
+                scores[document.name] = (1 - weight) * lexical + weight * cosine
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+
+class ToolIndexCache:
+    """Cache of tool indexes keyed by catalog version.
+    
+    A toolkit built twice from the same catalog shares one index, and the
+    index of a changed catalog is built from the most recent one.
+    """
+    
+    def __init__(self, embedder: Optional[Embedder] = None, embedding_weight: float = 0.5, maxsize: int = 32):
+        """Initialize the cache.
+        
+        Args:
+            embedder: Callable embedding a batch of texts
+            embedding_weight: Share of the score given to embeddings
+            maxsize: Maximum number of indexes kept
+        """
+        self.embedder = embedder
+        self.embedding_weight = embedding_weight
+        self.maxsize = maxsize
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, tools: List[Dict[str, Any]]) -> ToolIndex:
+        """Get the index of a catalog, building it if needed.
+        
+        Args:
+            tools: Tool definitions from the catalog
+        
+        Returns:
+            The catalog's index
+        """
+        key = (catalog_version(tools), id(self.embedder))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+            previous = next(reversed(self._indexes.values()), None)
+        
+        index = ToolIndex(tools, self.embedder, self.embedding_weight, previous=previous)
+        with self._lock:
+            index = self._indexes.setdefault(key, index)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.maxsize:
+                self._indexes.popitem(last=False)
+        return index
+    
+    def clear(self) -> None:
+        """Drop every index."""
+        with self._lock:
+            self._indexes.clear()
+
+
+_tool_index_cache = ToolIndexCache()
+
+
+def get_tool_index_cache() -> ToolIndexCache:
+    """Get the process-wide tool index cache used by ``select_tools``."""
+    return _tool_index_cache
+
+
+def configure_tool_index(
+    embedder: Optional[Embedder] = None,
+    embedding_weight: Optional[float] = None
+) -> ToolIndexCache:
+    """Configure the process-wide tool index cache.
+    
+    Args:
+        embedder: Callable embedding a batch of texts, e.g. a wrapper around
+            a sentence-transformers model or an embeddings API
+        embedding_weight: Share of the score given to embeddings
+    
+    Returns:
+        The process-wide tool index cache
+    """
+    if embedder is not None:
+        _tool_index_cache.embedder = embedder
+        _tool_index_cache.clear()
+    if embedding_weight is not None:
+        _tool_index_cache.embedding_weight = embedding_weight
+        _tool_index_cache.clear()
+    return _tool_index_cache
@@ -0,0 +1,336 @@
+"""
+Record and replay transports for offline MCP traffic.
+"""
+import asyncio
+import base64
+import datetime
+import gzip
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Request headers that select a different response
+KEY_HEADERS = ("Accept", "If-None-Match")
+
+# Response headers describing the transfer rather than the body, which is
+# stored decoded
+TRANSFER_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"))
+
+# Request body fields never written to a cassette
+SECRET_FIELDS = ("auth_token",)
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed request was never recorded."""
+
+
+def _decode_body(body: Any, headers: Any) -> Optional[bytes]:
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if (headers.get("Content-Encoding") or "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return body
+
+
+def request_key(method: str, url: str, headers: Any, body: Any) -> str:
+    """Build the key matching a request to its recorded responses.
+    
+    The key holds the method, path, sorted query, the headers in
+    ``KEY_HEADERS`` and the JSON body with its keys sorted and secrets
+    removed. Credentials never reach it.
+    
+    Args:
+        method: HTTP method
+        url: Request URL
+        headers: Request headers
+        body: Request body, as bytes or str
+    
+    Returns:
+        The key
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    body = _decode_body(body, headers)
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = base64.b64encode(body).decode("ascii")
+        else:
+            if isinstance(data, dict):
+                data = {name: value for name, value in data.items() if name not in SECRET_FIELDS}
+        body = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    key_headers = {name: headers.get(name) for name in KEY_HEADERS if headers.get(name)}
+    return json.dumps([method.upper(), parts.path, query, key_headers, body or ""], separators=(",", ":"))
+
+
+class Exchange:
+    """A recorded response."""
+    
+    __slots__ = ("status", "headers", "content", "elapsed")
+    
+    def __init__(self, status: int, headers: Dict[str, str], content: bytes, elapsed: float = 0.0):
+        self.status = status
+        self.headers = {name: value for name, value in headers.items() if name.lower() not in TRANSFER_HEADERS}
+        self.content = content
+        self.elapsed = elapsed
+    
+    def to_dict(self, key: str) -> Dict[str, Any]:
+        try:
+            content, encoding = self.content.decode("utf-8"), None
+        except UnicodeDecodeError:
+            content, encoding = base64.b64encode(self.content).decode("ascii"), "base64"
+        record = {
+            "key": key,
+            "status": self.status,
+            "headers": self.headers,
+            "content": content,
+            "elapsed": round(self.elapsed, 6),
+        }
+        if encoding is not None:
+            record["encoding"] = encoding
+        return record
+    
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Exchange":
+        content = record["content"]
+        if record.get("encoding") == "base64":
+            content = base64.b64decode(content)
+        else:
+            content = content.encode("utf-8")
+        return cls(record["status"], record["headers"], content, record.get("elapsed", 0.0))
+
+
+class Cassette:
+    """Recorded exchanges, saved as gzip-compressed JSON lines.
+    
+    Identical requests recorded several times are replayed in order, and the
+    last response is repeated once they run out, so a replay can run longer
+    than the recording.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the cassette.
+        
+        Args:
+            path: File the exchanges are loaded from, if it exists, and saved
+                to. Files ending in ``.gz`` are gzip-compressed
+        """
+        self.path = path
+        self._exchanges = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Load a cassette from a file."""
+        cassette = cls(path)
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    cassette._exchanges.setdefault(record["key"], []).append(Exchange.from_dict(record))
+        return cassette
+    
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the exchanges to a file.
+        
+        Args:
+            path: File to write, defaulting to the cassette's path
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the cassette to.")
+        opener = gzip.open if path.endswith(".gz") else open
+        with self._lock:
+            records = [
+                exchange.to_dict(key)
+                for key, exchanges in self._exchanges.items()
+                for exchange in exchanges
+            ]
+        with opener(path, "wt", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")))
+                file.write("\n")
+    
+    def record(self, key: str, exchange: Exchange) -> None:
+        """Add a response to the cassette."""
+        with self._lock:
+            self._exchanges.setdefault(key, []).append(exchange)
+    
+    def play(self, key: str) -> Exchange:
+        """Get the next recorded response to a request.
+        
+        Raises:
+            ReplayMissError: If the request was never recorded
+        """
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise ReplayMissError(f"No recorded response for {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return exchanges[min(position, len(exchanges) - 1)]
+    
+    def rewind(self) -> None:
+        """Replay every request from its first response again."""
+        with self._lock:
+            self._positions.clear()
+    
+    def __len__(self) -> int:
+        return sum(len(exchanges) for exchanges in self._exchanges.values())
+
+
+def _build_requests_response(request: requests.PreparedRequest, exchange: Exchange) -> requests.Response:
+    response = requests.Response()
+    response.status_code = exchange.status
+    response.headers = CaseInsensitiveDict(exchange.headers)
+    response._content = exchange.content
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.elapsed = datetime.timedelta(seconds=exchange.elapsed)
+    return response
+
+
+def _build_httpx_response(request: Any, exchange: Exchange) -> Any:
+    import httpx
+    
+    return httpx.Response(exchange.status, headers=exchange.headers, content=exchange.content, request=request)
+
+
+class RecordTransport(BaseAdapter):
+    """Transport sending requests to the server and recording the exchanges.
+    
+    Usable as the ``transport`` of both ``MCPClient`` and
+    ``AsyncMCPClient``. Closing the client saves the cassette to its path.
+    """
+    
+    def __init__(self, cassette: Union[Cassette, str], adapter: Optional[BaseAdapter] = None, async_transport: Any = None):
+        """Initialize the recorder.
+        
+        Args:
+            cassette: Cassette, or path of the file to record to
+            adapter: ``requests`` adapter sending the sync requests.
+                Defaults to a pooled ``HTTPAdapter``
+            async_transport: ``httpx`` transport sending the async requests.
+                Defaults to ``httpx.AsyncHTTPTransport``
+        """
+        super().__init__()
+        self.cassette = Cassette(cassette) if isinstance(cassette, str) else cassette
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+        self._async_transport = async_transport
+    
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Send a request and record its response."""
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Reading the body here means recorded streams arrive all at once
+        content = response.content
+        self.cassette.record(
+            request_key(request.method, request.url, request.headers, request.body),
+            Exchange(response.status_code, dict(response.headers), content, time.perf_counter() - started)
+        )
+        return response
+    
+    async def handle_async_request(self, request: Any) -> Any:
+        """Send an ``httpx`` request and record its response."""
+        if self._async_transport is None:
+            import httpx
+            
+            self._async_transport = httpx.AsyncHTTPTransport()
+        started = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        exchange = Exchange(response.status_code, dict(response.headers), content, time.perf_counter() - started)
+        self.cassette.record(
+            request_key(request.method, str(request.url), request.headers, request.content),
+            exchange
+        )
+        return _build_httpx_response(request, exchange)
+    
+    def close(self) -> None:
+        """Close the sync adapter and save the cassette."""
+        self.adapter.close()
+        if self.cassette.path is not None:
+            self.cassette.save()
+    
+    async def aclose(self) -> None:
+        """Close the async transport and save the cassette."""
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+            # A client bound to another event loop opens a new one
+            self._async_transport = None
+        if self.cassette.path is not None:
+            self.cassette.save()
+
+
+class ReplayTransport(BaseAdapter):
+    """Transport answering requests from a cassette, without any network.
+    
+    Usable as the ``transport`` of both ``MCPClient`` and
+    ``AsyncMCPClient``. Responses are served at memory speed unless a
+    latency is injected.
+    """
+    
+    def __init__(
+        self,
+        cassette: Union[Cassette, str],
+        latency: float = 0.0,
+        timing: Optional[float] = None
+    ):
+        """Initialize the replay.
+        
+        Args:
+            cassette: Cassette, or path of a recorded file
+            latency: Seconds added to every response
+            timing: Replay the recorded response times scaled by this factor,
+                e.g. 1.0 for the original timing. Not replayed when None
+        """
+        super().__init__()
+        self.cassette = Cassette.load(cassette) if isinstance(cassette, str) else cassette
+        self.latency = latency
+        self.timing = timing
+    
+    def _delay(self, exchange: Exchange) -> float:
+        delay = self.latency
+        if self.timing is not None:
+            delay += exchange.elapsed * self.timing
+        return delay
+    
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Answer a request with its recorded response."""
+        exchange = self.cassette.play(request_key(request.method, request.url, request.headers, request.body))
+        delay = self._delay(exchange)
+        if delay > 0:
+            time.sleep(delay)
+        return _build_requests_response(request, exchange)
+    
+    async def handle_async_request(self, request: Any) -> Any:
+        """Answer an ``httpx`` request with its recorded response."""
+        await request.aread()
+        exchange = self.cassette.play(request_key(request.method, str(request.url), request.headers, request.content))
+        delay = self._delay(exchange)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return _build_httpx_response(request, exchange)
+    
+    def close(self) -> None:
+        pass
+    
+    async def aclose(self) -> None:
+        pass
@@ -1,4 +1,30 @@
-from shivonai.lyra.langchain_tools import langchain_toolkit
-from shivonai.lyra.llamaindex_tools import llamaindex_toolkit
-from shivonai.lyra.crew_tools import crew_toolkit
-from shivonai.lyra.agno_tools import agno_toolkit
\ No newline at end of file
+"""
+Lyra module for integration with different AI agent frameworks.
+
+Each toolkit is imported on first access, so using one framework does not
+pay the import cost of (or require) the others.
+"""
+import importlib
+
+_TOOLKIT_MODULES = {
+    "langchain_toolkit": "shivonai.lyra.langchain_tools",
+    "llamaindex_toolkit": "shivonai.lyra.llamaindex_tools",
+    "crew_toolkit": "shivonai.lyra.crew_tools",
+    "agno_toolkit": "shivonai.lyra.agno_tools",
+    "ToolkitFactory": "shivonai.lyra.factory",
+}
+
+__all__ = list(_TOOLKIT_MODULES)
+
+
+def __getattr__(name):
+    module_name = _TOOLKIT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -2,86 +2,73 @@
 Agno integration for MCP Server tools.
 """
 from typing import List, Dict, Any, Optional, Callable, Union
-import functools
-import inspect
-import json
 
 from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.budget import OutputBudget, with_page_tool
+from shivonai.core.catalog import get_catalog_cache
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import instrument_tool
+from shivonai.core.pagination import with_cursor_param
+from shivonai.core.sessions import get_session_manager
+from shivonai.core.streaming import tool_callers
 from shivonai.utils.helpers import create_tool_description
+from shivonai.utils.schemas import convert_parameters_to_schema
+from shivonai.utils.toolsets import build_tools
 
 
-def convert_parameters_to_schema(parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Convert MCP tool parameters to JSON Schema format.
-    
-    This converts the MCP parameter format to a format compatible with JSON Schema
-    that both OpenAI and Claude can understand.
-    
-    Args:
-        parameters: List of parameter definitions from MCP
-        
-    Returns:
-        JSON Schema object
-    """
-    properties = {}
-    required = []
-    
-    for param in parameters:
-        name = param.get("name", "")
-        description = param.get("description", "")
-        param_type = param.get("type", "string")
-        required_flag = param.get("required", False)
-        
-        # Map MCP parameter types to JSON Schema types
-        if param_type == "integer":
-            json_type = "integer"
-        elif param_type == "number":
-            json_type = "number"
-        elif param_type == "boolean":
-            json_type = "boolean"
-        elif param_type == "array":
-            json_type = "array"
-            # For arrays, we'd need to define items schema, defaulting to strings
-            properties[name] = {
-                "type": json_type,
-                "description": description,
-                "items": {"type": "string"}
-            }
-            continue
-        else:  # Default to string
-            json_type = "string"
-        
-        # Add property definition
-        properties[name] = {
-            "type": json_type,
-            "description": description
-        }
-        
-        # Add to required list if needed
-        if required_flag:
-            required.append(name)
-    
-    # Create the full schema
-    schema = {
-        "type": "object",
-        "properties": properties
-    }
-    
-    # Only add required field if there are required parameters
-    if required:
-        schema["required"] = required
-    
-    return schema
-
-
-def agno_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.com") -> Dict[str, Callable]:
+def agno_toolkit(
+    auth_token: str,
+    base_url: str = "https://mcp-server.shivonai.com",
+    client: Optional[MCPClient] = None,
+    async_client: Optional[AsyncMCPClient] = None,
+    use_async: bool = False,
+    stream_limit: Optional[int] = None,
+    indent: bool = False,
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    max_tools: Optional[int] = None,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False,
+    validate: bool = True
+) -> Dict[str, Callable]:
     """Create Agno tools from MCP Server.
     
     Args:
         auth_token: Authentication token for MCP Server
         base_url: URL of the MCP server
-        
+        client: Existing MCPClient to reuse, so its pooled connections are
+            shared with other toolkits. ``base_url`` is ignored when given
+        async_client: AsyncMCPClient used when ``use_async`` is set.
+            Defaults to one mirroring ``client``
+        use_async: Return coroutine functions, which Agno awaits natively in
+            ``Agent.arun`` instead of blocking the event loop
+        stream_limit: Maximum number of result records handed to the agent.
+            Larger results are streamed and truncated with a note
+        indent: Pretty-print list and dict results. They are serialized
+            compactly by default, which keeps the prompt small
+        lazy: Build each tool the first time it is accessed, so agents
+            using a few tools do not pay for the whole catalog
+        max_workers: Build the tools with this many threads instead of
+            serially. Ignored when ``lazy`` is set
+        include: Names or glob patterns of the tools to wrap, e.g.
+            ``["search_*"]``. Every tool is wrapped when None
+        exclude: Names or glob patterns of the tools to leave out
+        tags: Wrap only tools carrying at least one of these tags
+        max_tools: Maximum number of tools to wrap, in catalog order
+        budget: Limits on the size of the results handed to the agent.
+            Adds a ``read_more_results`` tool to page through cut results
+        paged: Hand the agent one page of a paginated result per call. The
+            tools take an optional ``cursor`` argument, and results with more
+            pages carry the cursor to pass for the next one
+        validate: Check and coerce the agent's arguments against the
+            catalog's parameter types before calling the server
+    
     Returns:
-        Dictionary of Agno tool functions
+        Dictionary of Agno tool functions, a ``LazyToolDict`` when ``lazy``
     """
     try:
         # Import required Agno modules
@@ -91,16 +78,35 @@ def agno_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
             "Could not import agno. "
             "Please install it with `pip install agno`."
         )
-
-    client = MCPClient(base_url)
-    client.authenticate(auth_token)
-    available_tools = client.list_tools()
     
-    # Dictionary to store our created tools
-    agno_tools = {}
+    if client is None:
+        client = MCPClient(
+            base_url,
+            catalog_cache=get_catalog_cache(),
+            session_manager=get_session_manager()
+        )
+    tool_filter = ToolFilter.from_options(include, exclude, tags, max_tools)
+    available_tools = client.connect(auth_token, tool_filter)
+    if paged:
+        available_tools = with_cursor_param(available_tools)
+    available_tools = with_page_tool(available_tools, budget)
+    
+    if use_async and async_client is None:
+        async_client = AsyncMCPClient.for_client(client)
+    call_tool, acall_tool = tool_callers(
+        client,
+        async_client,
+        stream_limit,
+        budget,
+        paged,
+        available_tools,
+        validate,
+        auth_token
+    )
+    codec = client.codec
     
-    # Create functions for each MCP tool
-    for tool_info in available_tools:
+    # Create the function for an MCP tool
+    def build_tool(tool_info):
         tool_name = tool_info["name"]
         tool_description = tool_info.get("description", "")
         tool_parameters = tool_info.get("parameters", [])
@@ -112,14 +118,16 @@ def agno_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
         def make_tool_func(name, description, parameters, schema):
             def tool_func(**kwargs):
                 # Call the MCP tool and get the response
-                response = client.call_tool(name, kwargs)
+                response = call_tool(name, kwargs)
                 
                 # Convert the response to a string if it's a list or dictionary
                 # This is important for compatibility with Agno and model expectations
                 if isinstance(response, (list, dict)):
-                    return json.dumps(response, indent=2)
+                    return codec.dumps_text(response, indent=indent)
                 return response
             
+            tool_func = instrument_tool(tool_func, name, client.metrics, "agno")
+            
             # Create full description with parameters for the docstring
             full_description = create_tool_description(name, description, parameters)
             tool_func.__doc__ = full_description
@@ -130,13 +138,30 @@ def agno_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
             
             return tool_func
         
+        def make_async_tool_func(name, description, parameters, schema):
+            async def tool_func(**kwargs):
+                response = await acall_tool(name, kwargs)
+                
+                if isinstance(response, (list, dict)):
+                    return codec.dumps_text(response, indent=indent)
+                return response
+            
+            tool_func = instrument_tool(tool_func, name, client.metrics, "agno")
+            tool_func.__doc__ = create_tool_description(name, description, parameters)
+            tool_func.__name__ = name
+            tool_func.schema = schema
+            
+            return tool_func
+        
         # Create the function for this specific tool
-        func = make_tool_func(tool_name, tool_description, tool_parameters, schema)
+        if use_async:
+            func = make_async_tool_func(tool_name, tool_description, tool_parameters, schema)
+        else:
+            func = make_tool_func(tool_name, tool_description, tool_parameters, schema)
         
-        # Store the function in our dictionary
-        agno_tools[tool_name] = func
+        return func
     
-    return agno_tools
+    return build_tools(available_tools, build_tool, lazy=lazy, max_workers=max_workers, as_dict=True)
 
 
 def create_agno_agent_with_mcp_tools(
@@ -146,7 +171,12 @@ def create_agno_agent_with_mcp_tools(
     instructions: Union[str, List[str]] = None,
     description: str = None,
     show_tool_calls: bool = True,
-    markdown: bool = True
+    markdown: bool = True,
+    client: Optional[MCPClient] = None,
+    use_async: bool = False,
+    indent: bool = False,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False
 ) -> Any:
     """Create an Agno agent with MCP tools.
     
@@ -158,7 +188,12 @@ def create_agno_agent_with_mcp_tools(
         description: Description of the agent
         show_tool_calls: Whether to show tool calls in the agent's response
         markdown: Whether to render responses as markdown
-        
+        client: Existing MCPClient to reuse for the agent's tool calls
+        use_async: Give the agent coroutine tools for use with ``Agent.arun``
+        indent: Pretty-print the tools' list and dict results
+        budget: Limits on the size of the results handed to the agent
+        paged: Hand the agent one page of a paginated result per call
+    
     Returns:
         An Agno agent with MCP tools
     """
@@ -168,7 +203,15 @@ def create_agno_agent_with_mcp_tools(
         raise ImportError("Could not import agno. Please install it with `pip install agno`.")
     
     # Get MCP tools as functions
-    tools_dict = agno_toolkit(auth_token, base_url)
+    tools_dict = agno_toolkit(
+        auth_token,
+        base_url,
+        client=client,
+        use_async=use_async,
+        indent=indent,
+        budget=budget,
+        paged=paged
+    )
     tools = list(tools_dict.values())
     
     # Print available tools for debugging
@@ -212,15 +255,25 @@ def create_agno_agent_with_mcp_tools(
 
 
 # Function to get the available tools
-def get_available_mcp_tools(auth_token: str, base_url: str = "https://mcp-server.shivonai.com") -> List[str]:
+def get_available_mcp_tools(
+    auth_token: str,
+    base_url: str = "https://mcp-server.shivonai.com",
+    client: Optional[MCPClient] = None
+) -> List[str]:
     """Get a list of available MCP tool names.
     
     Args:
         auth_token: Authentication token for MCP Server
         base_url: URL of the MCP server
-        
+        client: Existing MCPClient to reuse
+    
     Returns:
         List of tool names
     """
-    tools_dict = agno_toolkit(auth_token, base_url)
-    return list(tools_dict.keys())
\ No newline at end of file
+    if client is None:
+        client = MCPClient(
+            base_url,
+            catalog_cache=get_catalog_cache(),
+            session_manager=get_session_manager()
+        )
+    return [tool_info["name"] for tool_info in client.connect(auth_token)]
\ No newline at end of file
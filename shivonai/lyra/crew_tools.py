@@ -1,39 +1,105 @@
 """
 CrewAI integration for MCP Server tools.
 """
-from typing import List, Dict, Any, Optional, Type, Union, Annotated
-from pydantic import BaseModel, Field
+from typing import List, Any, Optional, Type
 
 from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.budget import OutputBudget, with_page_tool
+from shivonai.core.catalog import get_catalog_cache
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import instrument_tool
+from shivonai.core.pagination import with_cursor_param
+from shivonai.core.sessions import get_session_manager
+from shivonai.core.streaming import tool_callers
 from shivonai.utils.helpers import parse_tool_parameters, create_tool_description
+from shivonai.utils.schemas import get_args_model
+from shivonai.utils.toolsets import build_tools
 
 
-def crew_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.com") -> List[Any]:
+def crew_toolkit(
+    auth_token: str,
+    base_url: str = "https://mcp-server.shivonai.com",
+    client: Optional[MCPClient] = None,
+    async_client: Optional[AsyncMCPClient] = None,
+    stream_limit: Optional[int] = None,
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    max_tools: Optional[int] = None,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False,
+    validate: bool = True
+) -> List[Any]:
     """Create CrewAI tools from MCP Server.
     
     Args:
         auth_token: Authentication token for MCP Server
         base_url: URL of the MCP server
-        
+        client: Existing MCPClient to reuse, so its pooled connections are
+            shared with other toolkits. ``base_url`` is ignored when given
+        async_client: AsyncMCPClient used by the tools' ``_arun``.
+            Defaults to one mirroring ``client``
+        stream_limit: Maximum number of result records handed to the agent.
+            Larger results are streamed and truncated with a note
+        lazy: Build each tool the first time it is accessed, so agents
+            using a few tools do not pay for the whole catalog
+        max_workers: Build the tools with this many threads instead of
+            serially. Ignored when ``lazy`` is set
+        include: Names or glob patterns of the tools to wrap, e.g.
+            ``["search_*"]``. Every tool is wrapped when None
+        exclude: Names or glob patterns of the tools to leave out
+        tags: Wrap only tools carrying at least one of these tags
+        max_tools: Maximum number of tools to wrap, in catalog order
+        budget: Limits on the size of the results handed to the agent.
+            Adds a ``read_more_results`` tool to page through cut results
+        paged: Hand the agent one page of a paginated result per call. The
+            tools take an optional ``cursor`` argument, and results with more
+            pages carry the cursor to pass for the next one
+        validate: Check and coerce the agent's arguments against the
+            catalog's parameter types before calling the server
+    
     Returns:
-        List of CrewAI tools
+        List of CrewAI tools, a ``LazyToolList`` when ``lazy``
     """
     try:
         from crewai.tools import BaseTool
+        from pydantic import BaseModel
     except ImportError:
         raise ImportError(
             "Could not import crewai. "
             "Please install it with `pip install crewai`."
         )
-
-    client = MCPClient(base_url)
-    client.authenticate(auth_token)
-    available_tools = client.list_tools()
     
-    crew_tools = []
+    if client is None:
+        client = MCPClient(
+            base_url,
+            catalog_cache=get_catalog_cache(),
+            session_manager=get_session_manager()
+        )
+    tool_filter = ToolFilter.from_options(include, exclude, tags, max_tools)
+    available_tools = client.connect(auth_token, tool_filter)
+    if paged:
+        available_tools = with_cursor_param(available_tools)
+    available_tools = with_page_tool(available_tools, budget)
+    
+    if async_client is None:
+        async_client = AsyncMCPClient.for_client(client)
+    call_tool, acall_tool = tool_callers(
+        client,
+        async_client,
+        stream_limit,
+        budget,
+        paged,
+        available_tools,
+        validate,
+        auth_token
+    )
     
     # Create a tool class for each available MCP tool
-    for tool_info in available_tools:
+    def build_tool(tool_info):
         tool_name = tool_info["name"]
         tool_description = tool_info.get("description", "")
         tool_parameters = tool_info.get("parameters", [])
@@ -48,32 +114,12 @@ def crew_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
         # Create input schema class if there are parameters
         input_schema = None
         if tool_parameters:
-            # Create dynamic input schema class
-            input_schema_attrs = {
-                "__doc__": f"Input schema for {tool_name} tool.",
-                "__annotations__": {}  # This is important for Pydantic
-            }
-            
-            # Add fields for each parameter with type annotations
-            for param in tool_parameters:
-                param_name = param["name"]
-                param_desc = param.get("description", "")
-                required = param.get("required", False)
-                
-                # Add type annotation to __annotations__ dict
-                input_schema_attrs["__annotations__"][param_name] = str
-                
-                # Define Field with or without default value based on required flag
-                if required:
-                    input_schema_attrs[param_name] = Field(..., description=param_desc)
-                else:
-                    input_schema_attrs[param_name] = Field(None, description=param_desc)
-            
-            # Create the dynamic input schema class
-            input_schema = type(
+            # Get the input schema class from the shared schema cache, so an
+            # unchanged catalog reuses the same class across toolkit builds
+            input_schema = get_args_model(
                 f"{tool_name.capitalize()}ToolInput",
-                (BaseModel,),
-                input_schema_attrs
+                tool_parameters,
+                doc=f"Input schema for {tool_name} tool."
             )
         
         # Define the _run method
@@ -81,14 +127,26 @@ def crew_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
             if input_schema:
                 # For tools with input schema
                 def _run(self, **kwargs):
-                    return client.call_tool(name, kwargs)
+                    return call_tool(name, kwargs)
             else:
                 # For tools without input schema
                 def _run(self, input_str=""):
                     args = parse_tool_parameters(input_str)
-                    return client.call_tool(name, args)
+                    return call_tool(name, args)
             
-            return _run
+            return instrument_tool(_run, name, client.metrics, "crewai")
+        
+        # Define the _arun coroutine used by async crews
+        def create_arun_method(name=tool_name):
+            if input_schema:
+                async def _arun(self, **kwargs):
+                    return await acall_tool(name, kwargs)
+            else:
+                async def _arun(self, input_str=""):
+                    args = parse_tool_parameters(input_str)
+                    return await acall_tool(name, args)
+            
+            return instrument_tool(_arun, name, client.metrics, "crewai")
         
         # Create a custom tool class that inherits from BaseTool
         class CustomToolClass(BaseTool):
@@ -101,9 +159,9 @@ def crew_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.c
             
             # Add the _run method
             _run = create_run_method()
-            
+            _arun = create_arun_method()
+        
         # Instantiate the tool
-        tool_instance = CustomToolClass()
-        crew_tools.append(tool_instance)
+        return CustomToolClass()
     
-    return crew_tools
\ No newline at end of file
+    return build_tools(available_tools, build_tool, lazy=lazy, max_workers=max_workers)
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Toolkit factory sharing framework tool objects between tenants.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.catalog import get_catalog_cache, catalog_version
+from shivonai.core.credentials import get_auth_token, use_auth_token
+from shivonai.core.sessions import get_session_manager
+from shivonai.lyra.langchain_tools import langchain_toolkit
+from shivonai.lyra.llamaindex_tools import llamaindex_toolkit
+from shivonai.lyra.crew_tools import crew_toolkit
+from shivonai.lyra.agno_tools import agno_toolkit
+
+
+class _Build:
+    """A toolkit build shared by every caller waiting on it."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.tools = None
+        self.error = None
+
+
+class ToolkitFactory:
+    """Build framework tools once per catalog and share them between tenants.
+    
+    Tools built by the factory do not hold a token. Every call resolves it
+    through ``credential_provider``, by default the token bound with
+    ``use_auth_token``, so tenants seeing the same catalog share the same
+    tool objects::
+        
+        factory = ToolkitFactory()
+        tools = factory.langchain_toolkit(tenant_token)
+        
+        with use_auth_token(tenant_token):
+            agent.run("what listings I have?")
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "https://mcp-server.shivonai.com",
+        credential_provider: Callable[[], Optional[str]] = get_auth_token,
+        client: Optional[MCPClient] = None,
+        async_client: Optional[AsyncMCPClient] = None,
+        max_catalogs: int = 64
+    ):
+        """Initialize the toolkit factory.
+        
+        Args:
+            base_url: URL of the MCP server
+            credential_provider: Callable returning the token of the tenant
+                being served
+            client: Shared MCPClient. It must resolve tokens through a
+                credential provider rather than a stored token
+            async_client: Shared AsyncMCPClient, with the same requirement
+            max_catalogs: Maximum number of built toolkits kept
+        """
+        if client is None:
+            client = MCPClient(
+                base_url,
+                catalog_cache=get_catalog_cache(),
+                credential_provider=credential_provider,
+                session_manager=get_session_manager()
+            )
+        if async_client is None:
+            async_client = AsyncMCPClient.for_client(client)
+        if client.credential_provider is None or async_client.credential_provider is None:
+            raise ValueError("Shared clients must resolve tokens through a credential_provider.")
+        
+        self.client = client
+        self.async_client = async_client
+        self.credential_provider = credential_provider
+        self.max_catalogs = max_catalogs
+        self._toolkits = OrderedDict()
+        self._builds = {}
+        self._lock = threading.Lock()
+    
+    def _catalog_version(self, token: str) -> str:
+        """Get the version of the catalog the tenant sees."""
+        with use_auth_token(token):
+            tools = self.client.connect(token)
+        entry = None
+        if self.client.catalog_cache is not None:
+            entry = self.client.catalog_cache.get(self.client.base_url, token)
+        return entry.version if entry is not None else catalog_version(tools)
+    
+    def _get(self, toolkit: Callable[..., Any], auth_token: Optional[str], **kwargs: Any) -> Any:
+        """Get the toolkit for the tenant's catalog, building it once.
+        
+        Builds run outside the factory lock, so a slow tenant does not hold
+        up the others. Concurrent callers for the same catalog wait for one
+        build instead of starting their own.
+        """
+        token = auth_token or self.credential_provider()
+        if not token:
+            raise ValueError("No auth token given and none available from the credential provider.")
+        
+        key = (toolkit.__name__, self._catalog_version(token), repr(sorted(kwargs.items())))
+        with self._lock:
+            tools = self._toolkits.get(key)
+            if tools is not None:
+                self._toolkits.move_to_end(key)
+                return tools
+            build = self._builds.get(key)
+            leader = build is None
+            if leader:
+                build = self._builds[key] = _Build()
+        
+        if not leader:
+            build.done.wait()
+            if build.error is not None:
+                raise build.error
+            return build.tools
+        
+        try:
+            with use_auth_token(token):
+                build.tools = toolkit(
+                    token,
+                    client=self.client,
+                    async_client=self.async_client,
+                    **kwargs
+                )
+            with self._lock:
+                self._toolkits[key] = build.tools
+                while len(self._toolkits) > self.max_catalogs:
+                    self._toolkits.popitem(last=False)
+            return build.tools
+        except Exception as e:
+            build.error = e
+            raise
+        finally:
+            with self._lock:
+                self._builds.pop(key, None)
+            build.done.set()
+    
+    def langchain_toolkit(self, auth_token: Optional[str] = None, **kwargs: Any) -> Any:
+        """Get shared LangChain tools for the tenant's catalog.
+        
+        Args:
+            auth_token: Token used to look up the tenant's catalog. Defaults
+                to the credential provider's token
+            kwargs: Extra arguments for ``langchain_toolkit``
+        
+        Returns:
+            List of LangChain tools
+        """
+        return self._get(langchain_toolkit, auth_token, **kwargs)
+    
+    def llamaindex_toolkit(self, auth_token: Optional[str] = None, **kwargs: Any) -> Any:
+        """Get shared LlamaIndex tools for the tenant's catalog.
+        
+        Args:
+            auth_token: Token used to look up the tenant's catalog. Defaults
+                to the credential provider's token
+            kwargs: Extra arguments for ``llamaindex_toolkit``
+        
+        Returns:
+            Dictionary of LlamaIndex tools
+        """
+        return self._get(llamaindex_toolkit, auth_token, **kwargs)
+    
+    def crew_toolkit(self, auth_token: Optional[str] = None, **kwargs: Any) -> Any:
+        """Get shared CrewAI tools for the tenant's catalog.
+        
+        Args:
+            auth_token: Token used to look up the tenant's catalog. Defaults
+                to the credential provider's token
+            kwargs: Extra arguments for ``crew_toolkit``
+        
+        Returns:
+            List of CrewAI tools
+        """
+        return self._get(crew_toolkit, auth_token, **kwargs)
+    
+    def agno_toolkit(self, auth_token: Optional[str] = None, **kwargs: Any) -> Any:
+        """Get shared Agno tools for the tenant's catalog.
+        
+        Args:
+            auth_token: Token used to look up the tenant's catalog. Defaults
+                to the credential provider's token
+            kwargs: Extra arguments for ``agno_toolkit``
+        
+        Returns:
+            Dictionary of Agno tool functions
+        """
+        return self._get(agno_toolkit, auth_token, **kwargs)
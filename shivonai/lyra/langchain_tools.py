@@ -2,11 +2,18 @@
 LangChain integration for MCP Server tools.
 """
 from typing import List, Dict, Any, Optional
-from langchain.tools import Tool, StructuredTool
-from pydantic import create_model, Field, BaseModel
-import json
 from shivonai.core.mcp_client import MCPClient
-from shivonai.utils.helpers import parse_tool_parameters, create_tool_description
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.budget import OutputBudget, with_page_tool
+from shivonai.core.catalog import get_catalog_cache
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import instrument_tool
+from shivonai.core.pagination import with_cursor_param
+from shivonai.core.sessions import get_session_manager
+from shivonai.core.streaming import tool_callers
+from shivonai.utils.helpers import create_tool_description
+from shivonai.utils.schemas import get_args_model
+from shivonai.utils.toolsets import build_tools
 
 def create_tool_description(name: str, description: str, parameters: List[Dict[str, Any]]) -> str:
     """Create a detailed description for a tool including its parameters."""
@@ -23,23 +30,25 @@ def create_tool_description(name: str, description: str, parameters: List[Dict[s
 
 def create_args_schema(parameters: List[Dict[str, Any]]):
     """Create a Pydantic model for tool arguments."""
-    fields = {}
-    for param in parameters:
-        param_name = param["name"]
-        required = param.get("required", False)
-        description = param.get("description", "")
-        
-        # Default to string type, but you can expand this logic
-        # to handle different parameter types
-        if required:
-            fields[param_name] = (str, Field(..., description=description))
-        else:
-            fields[param_name] = (str, Field(None, description=description))
-    
-    return create_model("ArgsSchema", **fields)
+    return get_args_model("ArgsSchema", parameters)
 
 
-def langchain_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.com") -> List[Tool]:
+def langchain_toolkit(
+    auth_token: str,
+    base_url: str = "https://mcp-server.shivonai.com",
+    client: Optional[MCPClient] = None,
+    async_client: Optional[AsyncMCPClient] = None,
+    stream_limit: Optional[int] = None,
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    max_tools: Optional[int] = None,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False,
+    validate: bool = True
+) -> List[Any]:
     """Create LangChain tools from MCP Server.
     
     This function creates LangChain tools from available tools in MCP Server,
@@ -48,44 +57,102 @@ def langchain_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivo
     Args:
         auth_token: Authentication token for MCP Server
         base_url: URL of the MCP server
-        
+        client: Existing MCPClient to reuse, so its pooled connections are
+            shared with other toolkits. ``base_url`` is ignored when given
+        async_client: AsyncMCPClient used by the tools' coroutines
+            (``ainvoke``). Defaults to one mirroring ``client``
+        stream_limit: Maximum number of result records handed to the agent.
+            Larger results are streamed and truncated with a note
+        lazy: Build each tool the first time it is accessed, so agents
+            using a few tools do not pay for the whole catalog
+        max_workers: Build the tools with this many threads instead of
+            serially. Ignored when ``lazy`` is set
+        include: Names or glob patterns of the tools to wrap, e.g.
+            ``["search_*"]``. Every tool is wrapped when None
+        exclude: Names or glob patterns of the tools to leave out
+        tags: Wrap only tools carrying at least one of these tags
+        max_tools: Maximum number of tools to wrap, in catalog order
+        budget: Limits on the size of the results handed to the agent.
+            Adds a ``read_more_results`` tool to page through cut results
+        paged: Hand the agent one page of a paginated result per call. The
+            tools take an optional ``cursor`` argument, and results with more
+            pages carry the cursor to pass for the next one
+        validate: Check and coerce the agent's arguments against the
+            catalog's parameter types before calling the server
+    
     Returns:
-        List of LangChain tools
+        List of LangChain tools, a ``LazyToolList`` when ``lazy``
     """
-    client = MCPClient(base_url)
-    client.authenticate(auth_token)
-    available_tools = client.list_tools()
+    try:
+        from langchain.tools import Tool, StructuredTool
+    except ImportError:
+        raise ImportError(
+            "Could not import langchain. "
+            "Please install it with `pip install langchain`."
+        )
     
-    langchain_tools = []
+    if client is None:
+        client = MCPClient(
+            base_url,
+            catalog_cache=get_catalog_cache(),
+            session_manager=get_session_manager()
+        )
+    tool_filter = ToolFilter.from_options(include, exclude, tags, max_tools)
+    available_tools = client.connect(auth_token, tool_filter)
+    if paged:
+        available_tools = with_cursor_param(available_tools)
+    available_tools = with_page_tool(available_tools, budget)
     
-    for tool_info in available_tools:
+    if async_client is None:
+        async_client = AsyncMCPClient.for_client(client)
+    call_tool, acall_tool = tool_callers(
+        client,
+        async_client,
+        stream_limit,
+        budget,
+        paged,
+        available_tools,
+        validate,
+        auth_token
+    )
+    
+    def build_tool(tool_info):
         name = tool_info["name"]
         description = tool_info.get("description", "")
         parameters = tool_info.get("parameters", [])
         
         if len(parameters) == 0:
             # For tools with no parameters, create a function that ignores inputs
-            def create_no_param_func(tool_name, client_instance):
+            def create_no_param_func(tool_name, call_tool_func):
                 def no_param_func(*args, **kwargs):
                     """Function that ignores inputs and calls the tool with empty params."""
                     # Ignore any arguments and just call the tool with empty params
-                    return client_instance.call_tool(tool_name, {})
+                    return call_tool_func(tool_name, {})
                 return no_param_func
             
-            tool_func = create_no_param_func(name, client)
+            def create_async_no_param_func(tool_name, call_tool_func):
+                async def async_no_param_func(*args, **kwargs):
+                    """Coroutine that ignores inputs and calls the tool with empty params."""
+                    return await call_tool_func(tool_name, {})
+                return async_no_param_func
+            
+            tool_func = create_no_param_func(name, call_tool)
             
             langchain_tool = Tool(
                 name=name,
                 description=create_tool_description(name, description, parameters),
-                func=tool_func
+                func=instrument_tool(tool_func, name, client.metrics, "langchain"),
+                coroutine=instrument_tool(
+                    create_async_no_param_func(name, acall_tool), name, client.metrics, "langchain"
+                )
             )
-            
+        
         elif len(parameters) == 1:
             # For tools with exactly 1 parameter, create a special handler
             param = parameters[0]
             param_name = param["name"]
             
-            def create_single_param_func(tool_name, client_instance, param_key):
+            def create_single_param_func(tool_name, call_tool_func, param_key):
                 def single_param_func(tool_input):
                     """Function that handles a single parameter tool."""
                     # Handle different ways the parameter might be provided
@@ -93,65 +160,76 @@ def langchain_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivo
                         # If it's a dict, check if it has the expected parameter name
                         if param_key in tool_input:
                             # Use the value of the expected parameter
-                            return client_instance.call_tool(tool_name, {param_key: tool_input[param_key]})
+                            return call_tool_func(tool_name, {param_key: tool_input[param_key]})
                         elif len(tool_input) == 1:
                             # If there's only one value in the dict, use that regardless of key
                             # This handles cases where agent uses "__arg1" or other unexpected keys
                             value = next(iter(tool_input.values()))
-                            return client_instance.call_tool(tool_name, {param_key: value})
+                            return call_tool_func(tool_name, {param_key: value})
                         else:
                             # If multiple values, just pass the whole dict
-                            return client_instance.call_tool(tool_name, tool_input)
+                            return call_tool_func(tool_name, tool_input)
                     else:
                         # If it's not a dict, use it directly as the parameter value
-                        return client_instance.call_tool(tool_name, {param_key: tool_input})
+                        return call_tool_func(tool_name, {param_key: tool_input})
                 
                 return single_param_func
             
+            def create_async_single_param_func(tool_name, call_tool_func, param_key):
+                sync_func = create_single_param_func(tool_name, call_tool_func, param_key)
+                
+                async def async_single_param_func(tool_input):
+                    """Coroutine that handles a single parameter tool."""
+                    # The async caller returns a coroutine, so the
+                    # sync handler's argument resolution can be reused as-is
+                    return await sync_func(tool_input)
+                
+                return async_single_param_func
+            
             # Create the tool with the single parameter handler
-            tool_func = create_single_param_func(name, client, param_name)
+            tool_func = create_single_param_func(name, call_tool, param_name)
             
             langchain_tool = Tool(
                 name=name,
                 description=create_tool_description(name, description, parameters),
-                func=tool_func
+                func=instrument_tool(tool_func, name, client.metrics, "langchain"),
+                coroutine=instrument_tool(
+                    create_async_single_param_func(name, acall_tool, param_name), name, client.metrics, "langchain"
+                )
             )
-            
+        
         else:
             # For tools with multiple parameters, create a Pydantic model and use StructuredTool
-            # First, create a proper Pydantic model for the tool's parameters
-            fields = {}
-            for param in parameters:
-                param_name = param["name"]
-                param_desc = param.get("description", "")
-                param_required = param.get("required", False)
-                
-                if param_required:
-                    fields[param_name] = (str, Field(..., description=param_desc))
-                else:
-                    fields[param_name] = (str, Field(None, description=param_desc))
-            
-            # Create the model dynamically
-            model_name = f"{name}Schema"
-            args_schema = create_model(model_name, **fields)
+            # The model comes from the shared schema cache, so an unchanged
+            # catalog reuses the same class across toolkit builds
+            args_schema = get_args_model(f"{name}Schema", parameters)
             
             # Create a function that will handle multiple parameters
-            def create_multi_param_func(tool_name, client_instance):
+            def create_multi_param_func(tool_name, call_tool_func):
                 def multi_param_func(**kwargs):
                     """Function that takes multiple parameters and passes them to the tool."""
-                    return client_instance.call_tool(tool_name, kwargs)
+                    return call_tool_func(tool_name, kwargs)
                 return multi_param_func
             
-            multi_param_func = create_multi_param_func(name, client)
+            def create_async_multi_param_func(tool_name, call_tool_func):
+                async def async_multi_param_func(**kwargs):
+                    """Coroutine that takes multiple parameters and passes them to the tool."""
+                    return await call_tool_func(tool_name, kwargs)
+                return async_multi_param_func
+            
+            multi_param_func = create_multi_param_func(name, call_tool)
             
             # Create a StructuredTool with the schema
             langchain_tool = StructuredTool(
                 name=name,
                 description=create_tool_description(name, description, parameters),
-                func=multi_param_func,
+                func=instrument_tool(multi_param_func, name, client.metrics, "langchain"),
+                coroutine=instrument_tool(
+                    create_async_multi_param_func(name, acall_tool), name, client.metrics, "langchain"
+                ),
                 args_schema=args_schema
             )
         
-        langchain_tools.append(langchain_tool)
+        return langchain_tool
     
-    return langchain_tools
\ No newline at end of file
+    return build_tools(available_tools, build_tool, lazy=lazy, max_workers=max_workers)
\ No newline at end of file
@@ -1,22 +1,68 @@
 """
 LlamaIndex integration for MCP Server tools.
 """
-from typing import List, Dict, Any, Optional, Callable, Union
-import functools
+from typing import List, Dict, Any, Optional
 
 from shivonai.core.mcp_client import MCPClient
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.budget import OutputBudget, with_page_tool
+from shivonai.core.catalog import get_catalog_cache
+from shivonai.core.filters import ToolFilter
+from shivonai.core.metrics import instrument_tool
+from shivonai.core.pagination import with_cursor_param
+from shivonai.core.sessions import get_session_manager
+from shivonai.core.streaming import tool_callers
 from shivonai.utils.helpers import create_tool_description
+from shivonai.utils.toolsets import build_tools
 
 
-def llamaindex_toolkit(auth_token: str, base_url: str = "https://mcp-server.shivonai.com") -> Dict[str, Any]:
+def llamaindex_toolkit(
+    auth_token: str,
+    base_url: str = "https://mcp-server.shivonai.com",
+    client: Optional[MCPClient] = None,
+    async_client: Optional[AsyncMCPClient] = None,
+    stream_limit: Optional[int] = None,
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    max_tools: Optional[int] = None,
+    budget: Optional[OutputBudget] = None,
+    paged: bool = False,
+    validate: bool = True
+) -> Dict[str, Any]:
     """Create LlamaIndex tools from MCP Server.
     
     Args:
         auth_token: Authentication token for MCP Server
         base_url: URL of the MCP server
-        
+        client: Existing MCPClient to reuse, so its pooled connections are
+            shared with other toolkits. ``base_url`` is ignored when given
+        async_client: AsyncMCPClient used by the tools' ``async_fn``.
+            Defaults to one mirroring ``client``
+        stream_limit: Maximum number of result records handed to the agent.
+            Larger results are streamed and truncated with a note
+        lazy: Build each tool the first time it is accessed, so agents
+            using a few tools do not pay for the whole catalog
+        max_workers: Build the tools with this many threads instead of
+            serially. Ignored when ``lazy`` is set
+        include: Names or glob patterns of the tools to wrap, e.g.
+            ``["search_*"]``. Every tool is wrapped when None
+        exclude: Names or glob patterns of the tools to leave out
+        tags: Wrap only tools carrying at least one of these tags
+        max_tools: Maximum number of tools to wrap, in catalog order
+        budget: Limits on the size of the results handed to the agent.
+            Adds a ``read_more_results`` tool to page through cut results
+        paged: Hand the agent one page of a paginated result per call. The
+            tools take an optional ``cursor`` argument, and results with more
+            pages carry the cursor to pass for the next one
+        validate: Check and coerce the agent's arguments against the
+            catalog's parameter types before calling the server
+    
     Returns:
-        Dictionary of LlamaIndex tool functions
+        Dictionary of LlamaIndex tool functions, a ``LazyToolDict`` when
+        ``lazy``
     """
     try:
         # Import from llama_index.core for newer versions
@@ -30,18 +76,37 @@ def llamaindex_toolkit(auth_token: str, base_url: str = "https://mcp-server.shiv
             "Could not import llama_index. "
             "Please install it with `pip install llama-index`."
         )
-
-    client = MCPClient(base_url)
-    client.authenticate(auth_token)
-    available_tools = client.list_tools()
     
-    llamaindex_tools = {}
+    if client is None:
+        client = MCPClient(
+            base_url,
+            catalog_cache=get_catalog_cache(),
+            session_manager=get_session_manager()
+        )
+    tool_filter = ToolFilter.from_options(include, exclude, tags, max_tools)
+    available_tools = client.connect(auth_token, tool_filter)
+    if paged:
+        available_tools = with_cursor_param(available_tools)
+    available_tools = with_page_tool(available_tools, budget)
     
-    for tool_info in available_tools:
+    if async_client is None:
+        async_client = AsyncMCPClient.for_client(client)
+    call_tool, acall_tool = tool_callers(
+        client,
+        async_client,
+        stream_limit,
+        budget,
+        paged,
+        available_tools,
+        validate,
+        auth_token
+    )
+    
+    def build_tool(tool_info):
         # Create a function that will handle the tool
         def make_tool_func(name, description, parameters):
             def tool_func(**kwargs):
-                return client.call_tool(name, kwargs)
+                return call_tool(name, kwargs)
             
             # Update function metadata for better integration with LlamaIndex
             tool_func.__name__ = name
@@ -52,6 +117,15 @@ def llamaindex_toolkit(auth_token: str, base_url: str = "https://mcp-server.shiv
             
             return tool_func
         
+        def make_async_tool_func(name, description, parameters):
+            async def async_tool_func(**kwargs):
+                return await acall_tool(name, kwargs)
+            
+            async_tool_func.__name__ = name
+            async_tool_func.__doc__ = create_tool_description(name, description, parameters)
+            
+            return async_tool_func
+        
         # Create the tool function
         func = make_tool_func(
             tool_info["name"],
@@ -59,6 +133,12 @@ def llamaindex_toolkit(auth_token: str, base_url: str = "https://mcp-server.shiv
             tool_info.get("parameters", [])
         )
         
+        async_func = make_async_tool_func(
+            tool_info["name"],
+            tool_info.get("description", ""),
+            tool_info.get("parameters", [])
+        )
+        
         # Create the full description including parameters
         full_description = create_tool_description(
             tool_info["name"],
@@ -70,9 +150,10 @@ def llamaindex_toolkit(auth_token: str, base_url: str = "https://mcp-server.shiv
         llamaindex_tool = FunctionTool.from_defaults(
             name=tool_info["name"],
             description=full_description,
-            fn=func,
+            fn=instrument_tool(func, tool_info["name"], client.metrics, "llamaindex"),
+            async_fn=instrument_tool(async_func, tool_info["name"], client.metrics, "llamaindex"),
         )
         
-        llamaindex_tools[tool_info["name"]] = llamaindex_tool
+        return llamaindex_tool
     
-    return llamaindex_tools
\ No newline at end of file
+    return build_tools(available_tools, build_tool, lazy=lazy, max_workers=max_workers, as_dict=True)
\ No newline at end of file
@@ -1 +1,2 @@
-from shivonai.utils.helpers import parse_tool_parameters, format_parameter_description
\ No newline at end of file
+from shivonai.utils.helpers import parse_tool_parameters, format_parameter_description
+from shivonai.utils.validation import ToolArgumentError, get_validator
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Cache of argument schemas generated from MCP tool parameters.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Optional, Union
+
+
+# JSON Schema types of MCP parameter types, and the Python types of the
+# generated argument models. Parameters of other types accept any value.
+# Arrays also accept text, e.g. "a, b", which the validator splits
+JSON_TYPES = ("string", "integer", "number", "boolean", "array", "object")
+PYTHON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": Union[List[Any], str],
+}
+
+
+def parameter_json_type(param: Dict[str, Any]) -> Optional[str]:
+    """Map an MCP parameter's type to a JSON Schema type.
+    
+    Returns:
+        The JSON Schema type, or None when the parameter has no type or one
+        JSON Schema does not define, so its values are passed through as is
+    """
+    param_type = param.get("type")
+    return param_type if param_type in JSON_TYPES else None
+
+
+def parameters_key(parameters: List[Dict[str, Any]], *extra: str) -> str:
+    """Compute a stable hash of a tool's parameter spec.
+    
+    Args:
+        parameters: List of parameter definitions
+        extra: Additional strings that distinguish schemas built from the
+            same spec, e.g. a model name
+    
+    Returns:
+        Hex digest identifying the spec
+    """
+    payload = json.dumps([parameters, extra], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SchemaCache:
+    """Thread-safe LRU cache of generated schemas and argument models."""
+    
+    def __init__(self, maxsize: int = 1024):
+        """Initialize the schema cache.
+        
+        Args:
+            maxsize: Maximum number of schemas kept
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Get a cached schema, building it with ``factory`` on a miss.
+        
+        Args:
+            key: Cache key, usually from ``parameters_key``
+            factory: Callable building the schema
+        
+        Returns:
+            The cached schema
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        
+        value = factory()
+        
+        with self._lock:
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every cached schema."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_schema_cache = SchemaCache()
+
+
+def get_schema_cache() -> SchemaCache:
+    """Get the process-wide schema cache shared by all toolkits."""
+    return _schema_cache
+
+
+def build_args_model(model_name: str, parameters: List[Dict[str, Any]], doc: Optional[str] = None) -> Any:
+    """Create a Pydantic model for tool arguments.
+    
+    Args:
+        model_name: Name of the generated model class
+        parameters: List of parameter definitions
+        doc: Docstring of the generated model class
+    
+    Returns:
+        Pydantic model class
+    """
+    from pydantic import BaseModel, Field
+    
+    attrs = {"__annotations__": {}}
+    if doc is not None:
+        attrs["__doc__"] = doc
+    
+    for param in parameters:
+        param_name = param["name"]
+        description = param.get("description", "")
+        
+        attrs["__annotations__"][param_name] = PYTHON_TYPES.get(parameter_json_type(param), Any)
+        if param.get("required", False):
+            attrs[param_name] = Field(..., description=description)
+        else:
+            attrs[param_name] = Field(None, description=description)
+    
+    return type(model_name, (BaseModel,), attrs)
+
+
+def get_args_model(model_name: str, parameters: List[Dict[str, Any]], doc: Optional[str] = None) -> Any:
+    """Get the cached Pydantic argument model for a parameter spec.
+    
+    An unchanged spec returns the same class, so rebuilding a toolkit does
+    not create new model classes.
+    
+    Args:
+        model_name: Name of the generated model class
+        parameters: List of parameter definitions
+        doc: Docstring of the generated model class
+    
+    Returns:
+        Pydantic model class
+    """
+    key = parameters_key(parameters, "args-model", model_name, doc or "")
+    return _schema_cache.get_or_create(
+        key,
+        lambda: build_args_model(model_name, parameters, doc)
+    )
+
+
+def convert_parameters_to_schema(parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert MCP tool parameters to JSON Schema format.
+    
+    This converts the MCP parameter format to a format compatible with JSON Schema
+    that both OpenAI and Claude can understand. Schemas are kept in the shared
+    schema cache, so the returned object is shared and must not be modified.
+    
+    Args:
+        parameters: List of parameter definitions from MCP
+    
+    Returns:
+        JSON Schema object
+    """
+    return get_schema_cache().get_or_create(
+        parameters_key(parameters, "json-schema"),
+        lambda: build_parameters_schema(parameters)
+    )
+
+
+def build_parameters_schema(parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the JSON Schema for MCP tool parameters without caching.
+    
+    Args:
+        parameters: List of parameter definitions from MCP
+    
+    Returns:
+        JSON Schema object
+    """
+    properties = {}
+    required = []
+    
+    for param in parameters:
+        name = param.get("name", "")
+        description = param.get("description", "")
+        required_flag = param.get("required", False)
+        
+        json_type = parameter_json_type(param)
+        if json_type is None:
+            # Untyped in JSON Schema, so the model may send any value
+            properties[name] = {"description": description}
+        else:
+            properties[name] = {"type": json_type, "description": description}
+        if json_type == "array":
+            # For arrays, we'd need to define items schema, defaulting to strings
+            properties[name]["items"] = {"type": "string"}
+        
+        # Add to required list if needed
+        if required_flag:
+            required.append(name)
+    
+    # Create the full schema
+    schema = {
+        "type": "object",
+        "properties": properties
+    }
+    
+    # Only add required field if there are required parameters
+    if required:
+        schema["required"] = required
+    
+    return schema
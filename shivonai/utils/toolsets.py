@@ -0,0 +1,225 @@
+"""
+Lazy and parallel construction of framework tools.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from shivonai.core.tool_index import ToolIndex, get_tool_index_cache
+
+
+class _ToolSelection:
+    """Relevance-based selection shared by the toolkit containers.
+    
+    Subclasses set ``_tool_infos`` and index their tools by name when they
+    are mappings, or by catalog position otherwise.
+    """
+    
+    _tool_index = None
+    
+    @property
+    def tool_index(self) -> ToolIndex:
+        """Retrieval index over the catalog, shared through the index cache."""
+        if self._tool_index is None:
+            tool_infos = self._tool_infos
+            if isinstance(tool_infos, dict):
+                tool_infos = list(tool_infos.values())
+            self._tool_index = get_tool_index_cache().get(tool_infos)
+        return self._tool_index
+    
+    def select_tools(self, query: str, k: int = 5) -> Union[List[Any], Dict[str, Any]]:
+        """Get the tools most relevant to a query.
+        
+        Only the selected tools are built in lazy toolkits, so an agent can
+        be handed a handful of relevant tools on each turn.
+        
+        Args:
+            query: Natural language description of the task
+            k: Maximum number of tools returned
+        
+        Returns:
+            The top ``k`` tools, best first, in the toolkit's shape: a list
+            for list toolkits and a dict for dict toolkits
+        """
+        return self._select_names([name for name, _ in self.tool_index.search(query, k)])
+    
+    def _select_names(self, names: List[str]) -> Union[List[Any], Dict[str, Any]]:
+        """Get the tools with the given names, in the toolkit's shape.
+        
+        Lazy toolkits build only these tools.
+        
+        Args:
+            names: Names of the selected tools, best first
+        
+        Returns:
+            The tools, as a list or a dict like the toolkit itself
+        """
+        if isinstance(self, Mapping):
+            return {name: self[name] for name in names}
+        positions = {tool_info["name"]: i for i, tool_info in enumerate(self._tool_infos)}
+        return [self[positions[name]] for name in names]
+
+
+class ToolList(_ToolSelection, list):
+    """List of framework tools that can also be searched by relevance."""
+    
+    def __init__(self, tool_infos: List[Dict[str, Any]], tools: Iterable[Any]):
+        """Initialize the list.
+        
+        Args:
+            tool_infos: Tool definitions from the catalog
+            tools: Framework tools, in the order of ``tool_infos``
+        """
+        super().__init__(tools)
+        self._tool_infos = list(tool_infos)
+
+
+class ToolDict(_ToolSelection, dict):
+    """Mapping of tool names to framework tools that can also be searched."""
+    
+    def __init__(self, tool_infos: List[Dict[str, Any]], tools: Iterable[Any]):
+        """Initialize the mapping.
+        
+        Args:
+            tool_infos: Tool definitions from the catalog
+            tools: Framework tools, in the order of ``tool_infos``
+        """
+        super().__init__((tool_info["name"], tool) for tool_info, tool in zip(tool_infos, tools))
+        self._tool_infos = list(tool_infos)
+
+
+class LazyToolList(_ToolSelection, Sequence):
+    """List of framework tools, each built the first time it is accessed.
+    
+    Iterating over the list builds every tool. Use ``get`` or ``select`` to
+    hand an agent a subset without paying for the rest of the catalog.
+    """
+    
+    def __init__(self, tool_infos: List[Dict[str, Any]], build_tool: Callable[[Dict[str, Any]], Any]):
+        """Initialize the lazy list.
+        
+        Args:
+            tool_infos: Tool definitions from the catalog
+            build_tool: Callable building the framework tool of a definition
+        """
+        self._tool_infos = list(tool_infos)
+        self._build_tool = build_tool
+        self._tools = [None] * len(self._tool_infos)
+        self._index = {tool_info["name"]: i for i, tool_info in enumerate(self._tool_infos)}
+        self._lock = threading.Lock()
+    
+    @property
+    def names(self) -> List[str]:
+        """Names of the tools, in catalog order."""
+        return [tool_info["name"] for tool_info in self._tool_infos]
+    
+    def _materialize(self, index: int) -> Any:
+        with self._lock:
+            tool = self._tools[index]
+            if tool is None:
+                tool = self._build_tool(self._tool_infos[index])
+                self._tools[index] = tool
+            return tool
+    
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("tool index out of range")
+        return self._materialize(index)
+    
+    def __len__(self) -> int:
+        return len(self._tool_infos)
+    
+    def get(self, name: str) -> Optional[Any]:
+        """Get a tool by name, building only that tool.
+        
+        Args:
+            name: Name of the tool
+        
+        Returns:
+            The framework tool, or None if the catalog has no such tool
+        """
+        index = self._index.get(name)
+        return self._materialize(index) if index is not None else None
+    
+    def select(self, names: Iterable[str]) -> List[Any]:
+        """Build and return only the named tools.
+        
+        Args:
+            names: Names of the tools to return. Unknown names are skipped
+        
+        Returns:
+            List of framework tools, in the order of ``names``
+        """
+        return [self._materialize(self._index[name]) for name in names if name in self._index]
+
+
+class LazyToolDict(_ToolSelection, Mapping):
+    """Mapping of tool names to framework tools, each built on first access."""
+    
+    def __init__(self, tool_infos: List[Dict[str, Any]], build_tool: Callable[[Dict[str, Any]], Any]):
+        """Initialize the lazy mapping.
+        
+        Args:
+            tool_infos: Tool definitions from the catalog
+            build_tool: Callable building the framework tool of a definition
+        """
+        self._tool_infos = {tool_info["name"]: tool_info for tool_info in tool_infos}
+        self._build_tool = build_tool
+        self._tools = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str) -> Any:
+        tool_info = self._tool_infos[name]
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is None:
+                tool = self._build_tool(tool_info)
+                self._tools[name] = tool
+            return tool
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tool_infos)
+    
+    def __len__(self) -> int:
+        return len(self._tool_infos)
+
+
+def build_tools(
+    tool_infos: List[Dict[str, Any]],
+    build_tool: Callable[[Dict[str, Any]], Any],
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    as_dict: bool = False
+) -> Union[ToolList, ToolDict, LazyToolList, LazyToolDict]:
+    """Build the framework tools of a catalog.
+    
+    Args:
+        tool_infos: Tool definitions from the catalog
+        build_tool: Callable building the framework tool of a definition
+        lazy: Build each tool on first access instead of up front
+        max_workers: Build eagerly with this many threads. Building is
+            serial when None or 1
+        as_dict: Return a mapping of tool names to tools instead of a list
+    
+    Returns:
+        List or dict of tools, or their lazy counterparts when ``lazy``.
+        All of them support ``select_tools(query, k)``
+    """
+    if lazy:
+        if as_dict:
+            return LazyToolDict(tool_infos, build_tool)
+        return LazyToolList(tool_infos, build_tool)
+    
+    if max_workers is not None and max_workers > 1 and len(tool_infos) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tools = list(executor.map(build_tool, tool_infos))
+    else:
+        tools = [build_tool(tool_info) for tool_info in tool_infos]
+    
+    if as_dict:
+        return ToolDict(tool_infos, tools)
+    return ToolList(tool_infos, tools)
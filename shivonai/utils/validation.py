@@ -0,0 +1,216 @@
+"""
+Client-side validation and coercion of tool arguments.
+"""
+import json
+import re
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from shivonai.utils.schemas import convert_parameters_to_schema, get_schema_cache, parameters_key
+
+_INTEGER = re.compile(r"^[+-]?\d+$")
+_TRUE = frozenset(("true", "yes", "y", "1", "on"))
+_FALSE = frozenset(("false", "no", "n", "0", "off"))
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool arguments do not match the catalog's parameters."""
+    
+    def __init__(self, tool_name: str, errors: List[str]):
+        super().__init__(f"Invalid arguments for {tool_name}: {'; '.join(errors)}")
+        self.tool_name = tool_name
+        self.errors = errors
+
+
+def _coerce_string(value: Any) -> Any:
+    # Numbers are sent as text, other values are passed through for the
+    # server to judge
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+def _coerce_integer(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise ValueError("expected an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and _INTEGER.match(value.strip()):
+        return int(value)
+    raise ValueError("expected an integer")
+
+
+def _coerce_number(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if _INTEGER.match(text):
+            return int(text)
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    raise ValueError("expected a number")
+
+
+def _coerce_boolean(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+    raise ValueError("expected a boolean")
+
+
+def _array_coercer(items: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def coerce(value):
+        if isinstance(value, str):
+            text = value.strip()
+            if text.startswith("["):
+                try:
+                    value = json.loads(text)
+                except ValueError:
+                    raise ValueError("expected an array")
+            else:
+                # Agents often pass lists as comma-separated text
+                value = [item.strip() for item in text.split(",") if item.strip()]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("expected an array")
+        return [items(item) for item in value]
+    return coerce
+
+
+_COERCERS = {
+    "string": _coerce_string,
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+}
+
+
+def _coercer(property_schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    if property_schema.get("type") == "array":
+        return _array_coercer(_coercer(property_schema.get("items") or {}))
+    # Objects and parameters without a known type are passed through
+    return _COERCERS.get(property_schema.get("type"), _keep)
+
+
+class ArgumentValidator:
+    """Validator compiled once from a tool's parameter schema.
+    
+    Arguments are coerced to the declared types (``"5"`` to ``5``,
+    ``"true"`` to ``True``, ``"a, b"`` to ``["a", "b"]``), optional
+    arguments set to None are dropped, and missing required arguments or
+    values that cannot be coerced are rejected before any request is sent.
+    Arguments the catalog does not declare are passed through.
+    """
+    
+    def __init__(self, schema: Dict[str, Any]):
+        """Compile the validator.
+        
+        Args:
+            schema: JSON Schema of the parameters, as built by
+                ``convert_parameters_to_schema``
+        """
+        required = set(schema.get("required", ()))
+        self.fields = [
+            (name, _coercer(property_schema), name in required)
+            for name, property_schema in schema.get("properties", {}).items()
+        ]
+    
+    def validate(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce a tool's arguments to their declared types.
+        
+        Args:
+            tool_name: Name of the tool, for error messages
+            arguments: Arguments from the agent
+        
+        Returns:
+            New dict of coerced arguments
+        
+        Raises:
+            ToolArgumentError: If arguments are missing or cannot be coerced
+        """
+        coerced = dict(arguments)
+        errors = []
+        for name, coerce, required in self.fields:
+            value = coerced.get(name)
+            if value is None:
+                coerced.pop(name, None)
+                if required:
+                    errors.append(f"{name}: missing required argument")
+                continue
+            try:
+                coerced[name] = coerce(value)
+            except ValueError as e:
+                errors.append(f"{name}: {e}, got {value!r}")
+        if errors:
+            raise ToolArgumentError(tool_name, errors)
+        return coerced
+
+
+def get_validator(parameters: List[Dict[str, Any]]) -> ArgumentValidator:
+    """Get the cached validator for a parameter spec.
+    
+    Args:
+        parameters: List of parameter definitions from MCP
+    
+    Returns:
+        The compiled validator, shared by tools with the same spec
+    """
+    return get_schema_cache().get_or_create(
+        parameters_key(parameters, "validator"),
+        lambda: ArgumentValidator(convert_parameters_to_schema(parameters))
+    )
+
+
+def validating_callers(
+    tool_infos: List[Dict[str, Any]],
+    call_tool: Callable[..., Any],
+    acall_tool: Optional[Callable[..., Any]]
+) -> Tuple[Callable[..., Any], Optional[Callable[..., Any]]]:
+    """Wrap toolkit callables so arguments are validated before each call.
+    
+    Each tool's validator is looked up once, on its first call.
+    
+    Args:
+        tool_infos: Tool definitions the toolkit was built from
+        call_tool: Sync callable taking the tool name and its parameters
+        acall_tool: Async callable with the same signature, or None
+    
+    Returns:
+        Tuple of the wrapped sync and async callables
+    """
+    parameters_by_tool = {tool_info["name"]: tool_info.get("parameters", []) for tool_info in tool_infos}
+    validators = {}
+    
+    def validate(tool_name, parameters):
+        validator = validators.get(tool_name)
+        if validator is None:
+            if tool_name not in parameters_by_tool:
+                return parameters
+            validator = validators[tool_name] = get_validator(parameters_by_tool[tool_name])
+        return validator.validate(tool_name, parameters)
+    
+    def validated_call_tool(tool_name, parameters, *args, **kwargs):
+        return call_tool(tool_name, validate(tool_name, parameters), *args, **kwargs)
+    
+    validated_acall_tool = None
+    if acall_tool is not None:
+        async def validated_acall_tool(tool_name, parameters, *args, **kwargs):
+            return await acall_tool(tool_name, validate(tool_name, parameters), *args, **kwargs)
+    
+    return validated_call_tool, validated_acall_tool
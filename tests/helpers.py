@@ -0,0 +1,27 @@
+import json
+from unittest.mock import MagicMock
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from shivonai.core.mcp_client import MCPClient
+
+
+def make_response(data=None, status_code=200, headers=None):
+    """Build a mocked ``requests`` response with a JSON body."""
+    response = MagicMock(status_code=status_code)
+    response.content = json.dumps(data).encode()
+    response.headers = headers or {}
+    return response
+
+
+def connect_error():
+    """Build the error ``requests`` raises when the server refuses a connection."""
+    return requests.exceptions.ConnectionError(NewConnectionError(None, "refused"))
+
+
+def make_client(**kwargs):
+    """Build an MCPClient that already holds a test token."""
+    client = MCPClient(**kwargs)
+    client.token = "test-token"
+    return client
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.result_cache import ToolResultCache
+from tests.helpers import make_client
+
+
+class TestAsyncMCPClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncMCPClient class."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.requests = []
+        
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path == "/initialize":
+                return httpx.Response(200, json={"server_info": {"name": "Test Server"}})
+            if request.url.path == "/tools/list":
+                return httpx.Response(200, json={"tools": [{"name": "tool1"}]})
+            return httpx.Response(200, json={"result": "Tool executed successfully"})
+        
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.client = AsyncMCPClient(base_url="https://mcp-server.shivonai.com", http_client=http_client)
+        self.test_token = "test-token"
+    
+    async def asyncTearDown(self):
+        await self.client.http_client.aclose()
+    
+    async def test_authenticate(self):
+        """Test authenticate coroutine."""
+        result = await self.client.authenticate(self.test_token)
+        
+        self.assertEqual(result, {"name": "Test Server"})
+        self.assertEqual(self.client.token, self.test_token)
+        self.assertEqual(json.loads(self.requests[0].content), {"auth_token": self.test_token})
+    
+    async def test_list_tools(self):
+        """Test list_tools coroutine."""
+        self.client.token = self.test_token
+        
+        result = await self.client.list_tools()
+        
+        self.assertEqual(result, [{"name": "tool1"}])
+        self.assertEqual(self.requests[0].headers["Authorization"], f"Bearer {self.test_token}")
+    
+    async def test_call_tool(self):
+        """Test call_tool coroutine."""
+        self.client.token = self.test_token
+        
+        result = await self.client.call_tool("test_tool", {"param1": "value1"})
+        
+        self.assertEqual(result, "Tool executed successfully")
+        self.assertEqual(
+            json.loads(self.requests[0].content),
+            {"name": "test_tool", "parameters": {"param1": "value1"}}
+        )
+    
+    async def test_call_tool_not_authenticated(self):
+        """Test call_tool coroutine when not authenticated."""
+        with self.assertRaises(ValueError):
+            await self.client.call_tool("test_tool", {})
+    
+    async def test_aclose_keeps_external_client(self):
+        """Test that a client passed in is not closed by aclose()."""
+        await self.client.aclose()
+        
+        self.assertFalse(self.client.http_client.is_closed)
+    
+    async def test_call_tool_uses_result_cache(self):
+        """Test that read-only results are served from the result cache."""
+        self.client.token = self.test_token
+        self.client.result_cache = ToolResultCache()
+        self.client.available_tools = [{"name": "test_tool", "annotations": {"readOnlyHint": True}}]
+        
+        await self.client.call_tool("test_tool", {})
+        await self.client.call_tool("test_tool", {})
+        
+        self.assertEqual(len(self.requests), 1)
+    
+    def test_from_client(self):
+        """Test that from_client mirrors the sync client's settings."""
+        cache = ToolResultCache()
+        client = MCPClient(base_url="https://other-server", result_cache=cache)
+        client.token = self.test_token
+        
+        async_client = AsyncMCPClient.from_client(client)
+        
+        self.assertEqual(async_client.base_url, "https://other-server")
+        self.assertEqual(async_client.token, self.test_token)
+        self.assertIs(async_client.result_cache, cache)
+
+
+class TestOwnedHTTPClient(unittest.TestCase):
+    """Test cases for the httpx client owned by AsyncMCPClient."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"result": "ok"}))
+        self.sync_client = make_client(base_url="https://mcp-server.shivonai.com")
+    
+    def test_each_event_loop_gets_its_own_client(self):
+        """Test that calls succeed under separate asyncio.run calls."""
+        client = AsyncMCPClient(transport=self.transport)
+        client.token = "test-token"
+        http_clients = []
+        
+        async def call():
+            http_clients.append(client.http_client)
+            return await client.call_tool("test_tool", {})
+        
+        self.assertEqual(asyncio.run(call()), "ok")
+        self.assertEqual(asyncio.run(call()), "ok")
+        self.assertIsNot(http_clients[0], http_clients[1])
+        self.assertTrue(all(http_client.is_closed for http_client in http_clients))
+    
+    def test_event_loops_in_threads_keep_their_clients(self):
+        """Test that loops in other threads never close each other's client."""
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"result": "ok"})
+        
+        client = AsyncMCPClient(transport=httpx.MockTransport(handler))
+        client.token = "test-token"
+        
+        async def calls():
+            return await asyncio.gather(*(client.call_tool("test_tool", {}) for _ in range(3)))
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: asyncio.run(calls()), range(4)))
+        
+        self.assertEqual(results, [["ok"] * 3] * 4)
+        self.assertEqual(client._http_clients, {})
+    
+    def test_shared_by_client_and_closed_with_it(self):
+        """Test that toolkits share one async client per sync client."""
+        async_client = AsyncMCPClient.for_client(self.sync_client)
+        self.assertIs(AsyncMCPClient.for_client(self.sync_client), async_client)
+        async_client.transport = self.transport
+        
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(loop.run_until_complete(async_client.call_tool("test_tool", {})), "ok")
+            http_client, _ = async_client._http_clients[loop]
+            self.sync_client.close()
+            loop.run_until_complete(asyncio.sleep(0))
+            self.assertTrue(http_client.is_closed)
+        finally:
+            loop.close()
+        self.assertIsNot(AsyncMCPClient.for_client(self.sync_client), async_client)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from benchmarks.fake_server import FakeMCPServer
+from benchmarks.run import compare, percentile
+from shivonai.core.mcp_client import MCPClient
+
+
+class TestFakeServer(unittest.TestCase):
+    """Test cases for the benchmark fake MCP server."""
+    
+    def test_client_against_fake_server(self):
+        """Test the client talks to the fake server over real HTTP."""
+        with FakeMCPServer(num_tools=5, payload_items=3) as server:
+            with MCPClient(server.url) as client:
+                client.authenticate("token")
+                
+                self.assertEqual(len(client.list_tools()), 5)
+                self.assertEqual(len(client.call_tool("tool_1", {"param_0": "x"})), 3)
+                self.assertEqual(len(list(client.call_tool_stream("tool_1", {}))), 3)
+        
+        self.assertEqual(server.calls, 2)
+    
+    def test_compare(self):
+        """Test numeric results are compared against the baseline."""
+        lines = compare({"calls": {"p50_ms": 12.0}}, {"calls": {"p50_ms": 10.0}})
+        
+        self.assertEqual(lines, ["calls.p50_ms: 10.000 -> 12.000 (+20.0%)"])
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
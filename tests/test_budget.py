@@ -0,0 +1,130 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from shivonai.core.budget import PAGE_TOOL_NAME, OutputBudget, project, with_page_tool
+from shivonai.core.streaming import tool_callers
+
+
+LISTINGS = [
+    {"id": i, "title": f"Listing {i}", "description": "x" * 200, "address": {"city": "Paris", "zip": "75001"}}
+    for i in range(50)
+]
+
+
+class TestOutputBudget(unittest.TestCase):
+    """Test cases for tool result budgets."""
+    
+    def test_small_results_are_unchanged(self):
+        """Test that results within budget are returned as they are."""
+        budget = OutputBudget(max_bytes=10000, max_items=10)
+        
+        self.assertEqual(budget.apply("tool", LISTINGS[:3]), LISTINGS[:3])
+        self.assertEqual(budget.apply("tool", {"count": 3}), {"count": 3})
+    
+    def test_byte_budget_cuts_lists_with_handle(self):
+        """Test that a list stops growing once the byte budget is spent."""
+        budget = OutputBudget(max_bytes=1000)
+        
+        result = budget.apply("search", LISTINGS)
+        
+        self.assertTrue(result["truncated"])
+        self.assertLessEqual(len(json.dumps(result["items"])), 1000)
+        self.assertEqual(len(result["items"]) + result["more"], 50)
+        self.assertIn(result["handle"], result["note"])
+    
+    def test_byte_budget_applies_to_dict_results(self):
+        """Test that values of dict results are charged and strings cut."""
+        budget = OutputBudget(max_bytes=100)
+        
+        result = budget.apply("read", {"doc": "x" * 5000, "pages": 12})
+        
+        # Separators between keys are not charged
+        self.assertLessEqual(len(json.dumps(result, separators=(",", ":"))), 120)
+        self.assertTrue(result["doc"].endswith("more chars)"))
+        self.assertEqual(result["pages"], 12)
+    
+    def test_oversized_first_record_cut_to_budget(self):
+        """Test that a first record over the budget is cut, not kept whole."""
+        budget = OutputBudget(max_bytes=100)
+        
+        result = budget.apply("read", [{"id": 1, "body": "x" * 5000}, {"id": 2, "body": "y"}])
+        
+        self.assertEqual(result["items"][0]["id"], 1)
+        self.assertTrue(result["items"][0]["body"].endswith("more chars)"))
+        self.assertLessEqual(len(json.dumps(result["items"][0], separators=(",", ":"))), 100)
+        self.assertEqual(result["more"], 1)
+    
+    def test_token_budget_and_field_projection(self):
+        """Test token budgets with a token counter and projected records."""
+        budget = OutputBudget(max_tokens=10, fields=["id", "address.city"], token_counter=lambda text: 5)
+        
+        result = budget.apply("search", LISTINGS)
+        
+        self.assertEqual(result["items"], [{"id": 0, "address": {"city": "Paris"}}, {"id": 1, "address": {"city": "Paris"}}])
+    
+    def test_per_tool_limits(self):
+        """Test that per-tool overrides only apply to their tool."""
+        budget = OutputBudget(tools={"search": {"max_items": 5, "max_string_chars": 10}})
+        
+        result = budget.apply("search", {"listings": LISTINGS, "total": 50})
+        
+        self.assertEqual(len(result["listings"]["items"]), 5)
+        self.assertEqual(result["listings"]["items"][0]["description"], "x" * 10 + "... (190 more chars)")
+        self.assertEqual(result["total"], 50)
+        self.assertEqual(budget.apply("other", LISTINGS), LISTINGS)
+        with self.assertRaises(ValueError):
+            OutputBudget(tools={"search": {"max_rows": 5}})
+    
+    def test_page_through_rest(self):
+        """Test paging through a truncated list with its handle."""
+        budget = OutputBudget(max_items=20)
+        first = budget.apply("search", LISTINGS)
+        
+        second = budget.page(first["handle"], offset=20)
+        last = budget.page(first["handle"], offset=40)
+        
+        self.assertEqual([item["id"] for item in second["items"]], list(range(20, 40)))
+        self.assertEqual(second["more"], 10)
+        self.assertEqual([item["id"] for item in last["items"]], list(range(40, 50)))
+        self.assertNotIn("truncated", last)
+        self.assertIn("error", budget.page("r_unknown"))
+    
+    def test_project_nested_fields(self):
+        """Test dotted field projection."""
+        self.assertEqual(project(LISTINGS[0], ["title", "address.zip", "missing"]), {"title": "Listing 0", "address": {"zip": "75001"}})
+
+
+class TestBudgetCallers(unittest.TestCase):
+    """Test cases for budgets applied by the toolkit callables."""
+    
+    def test_tool_callers_apply_budget_and_serve_pages(self):
+        """Test that toolkit callables shape results and page locally."""
+        client = MagicMock()
+        client.call_tool.return_value = LISTINGS
+        async_client = MagicMock()
+        async_client.call_tool = AsyncMock(return_value=LISTINGS)
+        budget = OutputBudget(max_items=10)
+        
+        call_tool, acall_tool = tool_callers(client, async_client, budget=budget)
+        result = call_tool("search", {})
+        page = call_tool(PAGE_TOOL_NAME, {"handle": result["handle"], "offset": "10", "limit": "5"})
+        async_result = asyncio.run(acall_tool("search", {}))
+        
+        self.assertEqual(len(result["items"]), 10)
+        self.assertEqual([item["id"] for item in page["items"]], list(range(10, 15)))
+        self.assertEqual(len(async_result["items"]), 10)
+        self.assertEqual(client.call_tool.call_count, 1)
+    
+    def test_page_tool_added_to_catalog(self):
+        """Test that paging budgets add the read_more_results tool."""
+        tools = [{"name": "search"}]
+        
+        self.assertEqual([tool["name"] for tool in with_page_tool(tools, OutputBudget())], ["search", PAGE_TOOL_NAME])
+        self.assertEqual(with_page_tool(tools, OutputBudget(paging=False)), tools)
+        self.assertEqual(with_page_tool(tools, None), tools)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from shivonai.core.catalog import CatalogCache, CatalogEntry, catalog_version
+from shivonai.core.mcp_client import MCPClient
+from tests.helpers import make_response
+
+
+TOOLS = [{"name": "tool1", "description": "Test Tool 1"}]
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Test cases for the tool catalog cache."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.cache = CatalogCache(ttl=60)
+        self.client = MCPClient(catalog_cache=self.cache)
+        self.test_token = "test-token"
+    
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    def test_connect_serves_fresh_catalog(self, mock_post, mock_get):
+        """Test that a fresh catalog skips initialize and tools/list."""
+        mock_post.return_value = make_response({"server_info": {}})
+        mock_get.return_value = make_response({"tools": TOOLS}, headers={"ETag": '"v1"'})
+        
+        self.assertEqual(self.client.connect(self.test_token), TOOLS)
+        
+        other = MCPClient(catalog_cache=self.cache)
+        self.assertEqual(other.connect(self.test_token), TOOLS)
+        self.assertEqual(other.token, self.test_token)
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_get.call_count, 1)
+    
+    @patch('requests.Session.get')
+    def test_list_tools_revalidates_with_etag(self, mock_get):
+        """Test that a known catalog is revalidated and reused on 304."""
+        self.cache.set(self.client.base_url, self.test_token, CatalogEntry(TOOLS, etag='"v1"', fetched_at=0))
+        mock_get.return_value = make_response(status_code=304)
+        self.client.token = self.test_token
+        
+        result = self.client.list_tools()
+        
+        mock_get.assert_called_once_with(
+            "https://mcp-server.shivonai.com/tools/list",
+            timeout=(10.0, 60.0),
+            headers={"Authorization": f"Bearer {self.test_token}", "If-None-Match": '"v1"'}
+        )
+        self.assertEqual(result, TOOLS)
+        entry = self.cache.get(self.client.base_url, self.test_token)
+        self.assertTrue(self.cache.is_fresh(entry))
+    
+    def test_version_hash_used_without_etag(self):
+        """Test that the catalog hash is the validator when there is no ETag."""
+        entry = CatalogEntry(TOOLS)
+        
+        self.assertEqual(entry.validator(), f'"{catalog_version(TOOLS)}"')
+    
+    def test_persisted_catalog_survives_new_cache(self):
+        """Test that a cold cache starts from the catalog on disk."""
+        with tempfile.TemporaryDirectory() as persist_dir:
+            CatalogCache(persist_dir=persist_dir).set("https://server", "token", CatalogEntry(TOOLS, etag='"v1"'))
+            
+            cold = CatalogCache(persist_dir=persist_dir)
+            entry = cold.get("https://server", "token")
+            
+            self.assertEqual(entry.tools, TOOLS)
+            self.assertEqual(entry.etag, '"v1"')
+            self.assertIsNone(cold.get("https://server", "other-token"))
+
+
+if __name__ == '__main__':
+    unittest.main()
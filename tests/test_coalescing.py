@@ -0,0 +1,109 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from shivonai.core.coalescing import CallCoalescer
+from tests.helpers import make_client, make_response
+
+
+def slow_response(*args, **kwargs):
+    time.sleep(0.05)
+    return make_response({"result": ["listing"]})
+
+
+class TestCallCoalescer(unittest.TestCase):
+    """Test cases for coalescing identical concurrent tool calls."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.coalescer = CallCoalescer(tools=["listings"])
+        self.client = make_client(coalescer=self.coalescer)
+    
+    def call_concurrently(self, tool_name, parameters, count=6):
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lambda _: self.client.call_tool(tool_name, parameters), range(count)))
+    
+    @patch('requests.Session.post', side_effect=slow_response)
+    def test_identical_calls_share_one_request(self, mock_post):
+        """Test that identical in-flight calls reach the server once."""
+        results = self.call_concurrently("listings", {"city": "Paris"})
+        
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(results, [["listing"]] * 6)
+        self.assertEqual(self.coalescer.coalesced, 5)
+    
+    @patch('requests.Session.post', side_effect=slow_response)
+    def test_only_opted_in_tools_are_coalesced(self, mock_post):
+        """Test that other tools and different parameters are not coalesced."""
+        self.call_concurrently("book_viewing", {"id": 1}, count=3)
+        self.assertEqual(mock_post.call_count, 3)
+        
+        mock_post.reset_mock()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda city: self.client.call_tool("listings", {"city": city}), ["Paris", "Rome"]))
+        self.assertEqual(mock_post.call_count, 2)
+    
+    @patch('requests.Session.post')
+    def test_identical_batch_calls_sent_once(self, mock_post):
+        """Test that identical coalesced calls of a batch are sent once."""
+        mock_post.return_value = make_response({"results": [{"result": "a"}, {"result": "b"}, {"result": "c"}]})
+        
+        results = self.client.call_tools_batch([
+            ("listings", {"city": "Paris"}),
+            ("book_viewing", {"id": 1}),
+            ("listings", {"city": "Paris"}),
+            ("book_viewing", {"id": 1})
+        ])
+        
+        self.assertEqual(results, ["a", "b", "a", "c"])
+        self.assertEqual(len(mock_post.call_args.kwargs["json"]["calls"]), 3)
+    
+    def test_read_only_opt_in_respects_annotations(self):
+        """Test that destructive tools are never coalesced."""
+        coalescer = CallCoalescer(tools=["delete"], read_only=True)
+        
+        self.assertTrue(coalescer.enabled_for("search", {"annotations": {"readOnlyHint": True}}))
+        self.assertFalse(coalescer.enabled_for("delete", {"annotations": {"destructiveHint": True}}))
+        self.assertFalse(coalescer.enabled_for("other"))
+    
+    def test_errors_are_shared(self):
+        """Test that waiters get the error of the shared call."""
+        calls = []
+        
+        def failing_call():
+            calls.append(1)
+            time.sleep(0.05)
+            raise ValueError("server error")
+        
+        def run(_):
+            try:
+                return self.coalescer.call("key", failing_call)
+            except ValueError as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(run, range(4)))
+        
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+    
+    def test_async_calls_share_one_request(self):
+        """Test single-flight for asyncio callers."""
+        calls = []
+        
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+        
+        async def run():
+            return await asyncio.gather(*(self.coalescer.acall("key", call) for _ in range(5)))
+        
+        self.assertEqual(asyncio.run(run()), ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
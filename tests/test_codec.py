@@ -0,0 +1,71 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+
+from shivonai.core.codec import JSONCodec, BACKENDS
+
+
+def installed_backends():
+    """Get the codec backends available in this environment."""
+    backends = []
+    for backend in BACKENDS:
+        try:
+            JSONCodec(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+class TestJSONCodec(unittest.TestCase):
+    """Test cases for the JSON codec."""
+    
+    def test_round_trip(self):
+        """Test every installed backend decodes what it encodes."""
+        value = {"name": "Zoë", "items": [1, 2.5, None, True]}
+        for backend in installed_backends():
+            with self.subTest(backend=backend):
+                codec = JSONCodec(backend)
+                self.assertEqual(codec.loads(codec.dumps(value)), value)
+                self.assertEqual(codec.loads(codec.dumps(value).decode("utf-8")), value)
+    
+    def test_compact_by_default(self):
+        """Test output is compact unless indentation is asked for."""
+        for backend in installed_backends():
+            with self.subTest(backend=backend):
+                codec = JSONCodec(backend)
+                self.assertEqual(codec.dumps_text({"a": [1, 2]}), '{"a":[1,2]}')
+                self.assertIn("\n  ", codec.dumps_text({"a": [1, 2]}, indent=True))
+    
+    def test_unsupported_values_as_str(self):
+        """Test values JSON cannot represent are encoded as strings."""
+        day = datetime.date(2024, 1, 2)
+        for backend in installed_backends():
+            with self.subTest(backend=backend):
+                codec = JSONCodec(backend)
+                self.assertEqual(codec.loads(codec.dumps({"day": day}))["day"], str(day))
+    
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            JSONCodec("yaml")
+    
+    def test_agno_output_is_compact(self):
+        """Test Agno tools serialize results compactly unless indent is set."""
+        try:
+            import agno  # noqa: F401
+        except ImportError:
+            self.skipTest("agno is not installed")
+        from shivonai.lyra.agno_tools import agno_toolkit
+        
+        client = MagicMock()
+        client.metrics = None
+        client.codec = JSONCodec("json")
+        client.connect.return_value = [{"name": "search", "parameters": []}]
+        client.call_tool.return_value = {"items": [1, 2]}
+        
+        self.assertEqual(agno_toolkit("token", client=client)["search"](), '{"items":[1,2]}')
+
+
+if __name__ == '__main__':
+    unittest.main()
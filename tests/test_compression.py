@@ -0,0 +1,97 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from shivonai.core.compression import Compression, requests_encodings
+from shivonai.core.mcp_client import MCPClient
+from tests.helpers import make_client, make_response
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class TestCompression(unittest.TestCase):
+    """Test cases for the wire encoding settings."""
+    
+    def test_small_bodies_not_compressed(self):
+        """Test that bodies under the threshold are sent as is."""
+        compression = Compression(request_encoding="gzip", min_size=100)
+        client = MCPClient()
+        
+        body, headers = compression.encode_body({"name": "search"}, client.codec)
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual(json.loads(body), {"name": "search"})
+        
+        large = {"name": "search", "parameters": {"query": "x" * 200}}
+        body, headers = compression.encode_body(large, client.codec)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body)), large)
+    
+    def test_accept_encoding_limited_to_supported(self):
+        """Test that only encodings the HTTP library decodes are offered."""
+        compression = Compression()
+        
+        self.assertEqual(compression.accept_encoding(["gzip", "deflate"]), "gzip")
+        self.assertEqual(compression.accept_encoding(["gzip", "br", "zstd"]), "zstd, br, gzip")
+        self.assertEqual(compression.accept_encoding([]), "identity")
+
+
+class TestClientCompression(unittest.TestCase):
+    """Test cases for compression in MCPClient requests."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client(compression=Compression(request_encoding="gzip", min_size=10))
+    
+    @patch('requests.Session.post')
+    def test_request_body_compressed(self, mock_post):
+        """Test that tool calls are sent compressed with negotiation headers."""
+        mock_post.return_value = make_response({"result": "ok"})
+        
+        self.assertEqual(self.client.call_tool("search", {"query": "flats in Paris"}), "ok")
+        
+        kwargs = mock_post.call_args.kwargs
+        self.assertNotIn("json", kwargs)
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(kwargs["headers"]["Authorization"], "Bearer test-token")
+        self.assertEqual(kwargs["headers"]["Accept-Encoding"], Compression().accept_encoding(requests_encodings()))
+        self.assertEqual(json.loads(gzip.decompress(kwargs["data"]))["parameters"], {"query": "flats in Paris"})
+    
+    @patch('requests.Session.post')
+    def test_unsupported_encoding_falls_back(self, mock_post):
+        """Test that a 415 answer switches the client to plain bodies."""
+        mock_post.side_effect = [
+            make_response({"error": "unsupported"}, 415),
+            make_response({"result": "ok"}),
+            make_response({"result": "ok"})
+        ]
+        
+        self.assertEqual(self.client.call_tool("search", {"query": "flats in Paris"}), "ok")
+        self.client.call_tool("search", {"query": "flats in Rome"})
+        
+        encodings = [call.kwargs["headers"].get("Content-Encoding") for call in mock_post.call_args_list]
+        self.assertEqual(encodings, ["gzip", None, None])
+    
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    @patch('requests.Session.post')
+    def test_msgpack_negotiated(self, mock_post):
+        """Test that MessagePack responses are decoded and then used for bodies."""
+        client = make_client(compression=Compression(msgpack=True))
+        mock_post.return_value = MagicMock(
+            status_code=200,
+            content=msgpack.packb({"result": [1, 2]}),
+            headers={"Content-Type": "application/msgpack"}
+        )
+        
+        self.assertEqual(client.call_tool("search", {}), [1, 2])
+        self.assertIn("application/msgpack", mock_post.call_args.kwargs["headers"]["Accept"])
+        client.call_tool("search", {"query": "Paris"})
+        self.assertEqual(mock_post.call_args.kwargs["headers"]["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(mock_post.call_args.kwargs["data"])["parameters"], {"query": "Paris"})
+
+
+if __name__ == '__main__':
+    unittest.main()
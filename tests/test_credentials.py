@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.catalog import CatalogCache, catalog_callers
+from shivonai.core.credentials import get_auth_token, use_auth_token
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.streaming import tool_callers
+from shivonai.lyra.factory import ToolkitFactory
+from tests.helpers import make_response
+
+
+class TestCredentials(unittest.TestCase):
+    """Test cases for per-call credentials and the toolkit factory."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = MCPClient(credential_provider=get_auth_token)
+    
+    @patch('requests.Session.post')
+    def test_call_tool_uses_bound_token(self, mock_post):
+        """Test that call_tool resolves the token bound to the context."""
+        mock_post.return_value = make_response({"result": "ok"})
+        self.client.token = "stale-token"
+        
+        with use_auth_token("tenant-a"):
+            self.client.call_tool("test_tool", {})
+        
+        self.assertEqual(
+            mock_post.call_args[1]["headers"],
+            {"Authorization": "Bearer tenant-a"}
+        )
+        self.assertIsNone(get_auth_token())
+    
+    def test_provider_never_falls_back_to_stored_token(self):
+        """Test that a shared client does not reuse another tenant's token."""
+        self.client.token = "stale-token"
+        
+        with self.assertRaises(ValueError):
+            self.client.call_tool("test_tool", {})
+    
+    @patch('requests.Session.post')
+    def test_toolkit_calls_use_their_own_token(self, mock_post):
+        """Test that toolkits sharing clients keep the token they were built with."""
+        mock_post.return_value = make_response({"result": "ok"})
+        headers = []
+        
+        def handler(request):
+            headers.append(request.headers["Authorization"])
+            return httpx.Response(200, json={"result": "ok"})
+        
+        client = MCPClient()
+        async_client = AsyncMCPClient.for_client(client)
+        async_client.transport = httpx.MockTransport(handler)
+        call_tool, acall_tool = tool_callers(client, async_client, auth_token="tenant-a")
+        # A second toolkit connecting the shared clients with another token
+        client.token = async_client.token = "tenant-b"
+        
+        call_tool("test_tool", {})
+        asyncio.run(acall_tool("test_tool", {}))
+        
+        self.assertEqual(mock_post.call_args[1]["headers"], {"Authorization": "Bearer tenant-a"})
+        self.assertEqual(headers, ["Bearer tenant-a"])
+        client.close()
+    
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    def test_factory_builds_once_per_catalog(self, mock_post, mock_get):
+        """Test that tenants with the same catalog share the built toolkit."""
+        mock_post.return_value = make_response({"server_info": {}})
+        mock_get.return_value = make_response({"tools": [{"name": "tool1"}]})
+        
+        builds = []
+        
+        def fake_toolkit(auth_token, client=None, async_client=None):
+            builds.append(auth_token)
+            return [object()]
+        
+        client = MCPClient(catalog_cache=CatalogCache(), credential_provider=get_auth_token)
+        factory = ToolkitFactory(client=client)
+        
+        first = factory._get(fake_toolkit, "tenant-a")
+        second = factory._get(fake_toolkit, "tenant-b")
+        
+        self.assertIs(first, second)
+        self.assertEqual(builds, ["tenant-a"])
+        
+        mock_get.return_value = make_response({"tools": [{"name": "tool2"}]})
+        third = factory._get(fake_toolkit, "tenant-c")
+        
+        self.assertIsNot(first, third)
+        self.assertEqual(builds, ["tenant-a", "tenant-c"])
+    
+    def test_factory_builds_outside_lock(self):
+        """Test that a slow build neither blocks other catalogs nor runs twice."""
+        started, release = threading.Event(), threading.Event()
+        builds = []
+        
+        def fake_toolkit(auth_token, client=None, async_client=None):
+            builds.append(auth_token)
+            if auth_token == "slow":
+                started.set()
+                release.wait(5)
+            return [auth_token]
+        
+        factory = ToolkitFactory(client=MCPClient(credential_provider=get_auth_token))
+        factory._catalog_version = lambda token: "v-slow" if token.startswith("slow") else "v-fast"
+        results = []
+        waiters = [
+            threading.Thread(target=lambda token=token: results.append(factory._get(fake_toolkit, token)))
+            for token in ("slow", "slow-2")
+        ]
+        waiters[0].start()
+        started.wait(5)
+        waiters[1].start()
+        
+        fast = threading.Thread(target=lambda: results.append(factory._get(fake_toolkit, "fast")))
+        fast.start()
+        fast.join(2)
+        self.assertFalse(fast.is_alive())
+        release.set()
+        for waiter in waiters:
+            waiter.join()
+        
+        self.assertEqual(sorted(builds), ["fast", "slow"])
+        self.assertEqual(results, [["fast"], ["slow"], ["slow"]])
+    
+    def test_tool_metadata_from_toolkit_catalog(self):
+        """Test that calls read tool metadata from their toolkit's catalog."""
+        self.client.available_tools = [{"name": "search"}]
+        tenant_catalog = [{"name": "search", "annotations": {"readOnlyHint": True}}]
+        call_tool, _ = catalog_callers(tenant_catalog, lambda name, parameters: self.client._is_idempotent_tool(name), None)
+        
+        self.assertTrue(call_tool("search", {}))
+        self.assertFalse(self.client._is_idempotent_tool("search"))
+    
+    def test_factory_requires_provider(self):
+        """Test that the factory rejects a client with a stored token only."""
+        with self.assertRaises(ValueError):
+            ToolkitFactory(client=MCPClient())
+
+
+if __name__ == '__main__':
+    unittest.main()
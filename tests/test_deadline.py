@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from shivonai.core.deadline import Deadline, DeadlineExceeded, get_deadline, use_deadline
+from shivonai.core.resilience import CircuitBreaker, RetryPolicy
+from tests.helpers import make_client, make_response
+
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for timeouts and deadline propagation."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client(
+            connect_timeout=3.0,
+            read_timeout=20.0,
+            retry_policy=RetryPolicy(max_retries=3, backoff_factor=1.0),
+            circuit_breaker=CircuitBreaker()
+        )
+        self.client.available_tools = [{"name": "list_jobs", "annotations": {"readOnlyHint": True}}]
+    
+    @patch('requests.Session.post')
+    def test_client_timeouts_sent(self, mock_post):
+        """Test that every request carries connect and read timeouts."""
+        mock_post.return_value = make_response({"result": "ok"})
+        
+        self.client.call_tool("list_jobs", {})
+        
+        self.assertEqual(mock_post.call_args[1]["timeout"], (3.0, 20.0))
+    
+    @patch('requests.Session.post')
+    def test_deadline_caps_timeouts(self, mock_post):
+        """Test that a short deadline lowers the per-request timeouts."""
+        mock_post.return_value = make_response({"result": "ok"})
+        
+        self.client.call_tool("list_jobs", {}, deadline=2.0)
+        
+        connect_timeout, read_timeout = mock_post.call_args[1]["timeout"]
+        self.assertLessEqual(connect_timeout, 2.0)
+        self.assertLessEqual(read_timeout, 2.0)
+    
+    @patch('requests.Session.post')
+    def test_expired_deadline_not_sent(self, mock_post):
+        """Test that no request is sent once the budget is spent."""
+        with self.assertRaises(DeadlineExceeded):
+            self.client.call_tool("list_jobs", {}, deadline=0)
+        mock_post.assert_not_called()
+    
+    @patch('shivonai.core.mcp_client.time.sleep')
+    @patch('requests.Session.post')
+    def test_retry_skipped_when_budget_too_small(self, mock_post, mock_sleep):
+        """Test that retries whose backoff would overrun the deadline are skipped."""
+        mock_post.side_effect = requests.exceptions.ConnectionError("reset")
+        self.client.retry_policy = RetryPolicy(max_retries=3, backoff_factor=100.0)
+        
+        with patch('shivonai.core.resilience.random.uniform', return_value=50.0):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.call_tool("list_jobs", {}, deadline=5.0)
+        
+        self.assertEqual(mock_post.call_count, 1)
+        mock_sleep.assert_not_called()
+    
+    def test_nested_deadline_never_extends(self):
+        """Test that an inner deadline cannot outlive the outer one."""
+        with use_deadline(1.0) as outer:
+            with use_deadline(100.0) as inner:
+                self.assertIs(inner, outer)
+            with use_deadline(0.5) as inner:
+                self.assertLess(inner.expires_at, outer.expires_at)
+            self.assertIs(get_deadline(), outer)
+        self.assertIsNone(get_deadline())
+    
+    @patch('requests.Session.post')
+    def test_batch_workers_see_deadline(self, mock_post):
+        """Test that the batch deadline reaches the worker threads."""
+        def post(url, timeout=None, headers=None, json=None):
+            if url.endswith("/tools/call_batch"):
+                return make_response(status_code=404)
+            return make_response({"result": timeout[1]})
+        
+        mock_post.side_effect = post
+        
+        results = self.client.call_tools_batch([("list_jobs", {"i": i}) for i in range(3)], deadline=Deadline(5.0))
+        
+        for read_timeout in results:
+            self.assertLessEqual(read_timeout, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.credentials import get_auth_token, use_auth_token
+from shivonai.core.deadline import get_deadline
+from shivonai.core.federation import AsyncFederatedMCPClient, FederatedMCPClient, server_name
+from shivonai.core.mcp_client import MCPClient
+
+
+def make_member(tools, base_url="https://mcp.example.com"):
+    client = MagicMock(spec=MCPClient)
+    client.base_url = base_url
+    client.connect.return_value = tools
+    return client
+
+
+class TestFederatedMCPClient(unittest.TestCase):
+    """Test cases for the federated multi-server client."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.eu = make_member([{"name": "search"}, {"name": "eu_report"}])
+        self.us = make_member([{"name": "search"}, {"name": "us_report"}])
+        self.test_token = "test-token"
+    
+    def names(self, tools):
+        return [tool_info["name"] for tool_info in tools]
+    
+    def test_server_names_from_urls(self):
+        """Test that sequence members are named after their hosts."""
+        client = FederatedMCPClient([make_member([], "https://mcp-eu.example.com"), make_member([], "https://mcp-eu.example.org")])
+        
+        self.assertEqual(server_name("https://mcp-eu.example.com:8443"), "mcp-eu")
+        self.assertEqual(list(client.members), ["mcp-eu", "mcp-eu_2"])
+    
+    def test_connect_merges_replicas(self):
+        """Test that a tool offered twice is listed once and routed to both."""
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        
+        tools = client.connect(self.test_token)
+        
+        self.assertEqual(self.names(tools), ["search", "eu_report", "us_report"])
+        self.assertEqual(client.replicas("search"), [("eu", "search"), ("us", "search")])
+        self.eu.connect.assert_called_once_with(self.test_token, None)
+    
+    def test_conflict_modes(self):
+        """Test namespacing and rejecting conflicting tools."""
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us}, conflict="namespace")
+        self.assertEqual(self.names(client.connect(self.test_token)), ["eu__search", "eu_report", "us__search", "us_report"])
+        self.assertEqual(client.replicas("us__search"), [("us", "search")])
+        
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us}, conflict="error")
+        with self.assertRaises(ValueError):
+            client.connect(self.test_token)
+    
+    def test_failed_server_is_left_out(self):
+        """Test that one unreachable server does not fail the catalog."""
+        self.us.connect.side_effect = requests.exceptions.ConnectionError("down")
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        
+        self.assertEqual(self.names(client.connect(self.test_token)), ["search", "eu_report"])
+        self.assertIn("us", client.errors)
+    
+    def test_call_routes_to_owner_and_fails_over(self):
+        """Test routing, failover and latency-aware replica ranking."""
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        client.connect(self.test_token)
+        self.us.call_tool.return_value = "us result"
+        
+        self.assertEqual(client.call_tool("us_report", {}), "us result")
+        self.eu.call_tool.assert_not_called()
+        
+        self.eu.call_tool.side_effect = requests.exceptions.ConnectionError(NewConnectionError(None, "refused"))
+        self.assertEqual(client.call_tool("search", {"q": "x"}), "us result")
+        self.us.call_tool.assert_called_with("search", {"q": "x"})
+        self.assertEqual(client.replicas("search")[0], ("us", "search"))
+    
+    def test_tool_errors_are_not_failed_over(self):
+        """Test that errors about the call itself are raised directly."""
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        client.connect(self.test_token)
+        self.eu.call_tool.side_effect = ValueError("bad parameters")
+        
+        with self.assertRaises(ValueError):
+            client.call_tool("search", {})
+        self.us.call_tool.assert_not_called()
+    
+    def test_timeouts_failed_over_only_when_idempotent(self):
+        """Test that a call that may have run is not resent to a replica."""
+        self.eu.connect.return_value = [{"name": "search"}, {"name": "lookup", "annotations": {"readOnlyHint": True}}]
+        self.us.connect.return_value = [{"name": "search"}, {"name": "lookup"}]
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        client.connect(self.test_token)
+        self.eu.call_tool.side_effect = requests.exceptions.ReadTimeout("slow")
+        self.us.call_tool.return_value = "us result"
+        
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.call_tool("search", {})
+        self.us.call_tool.assert_not_called()
+        
+        client.latency = MagicMock(rank=lambda servers: servers)
+        self.assertEqual(client.call_tool("lookup", {}), "us result")
+    
+    def test_members_see_caller_context(self):
+        """Test that member threads get the caller's deadline and token."""
+        seen = []
+        
+        def capture(value, result):
+            def side_effect(*args):
+                seen.append(value())
+                return result
+            return side_effect
+        
+        self.eu.connect.side_effect = capture(get_auth_token, [{"name": "search"}])
+        self.us.connect.side_effect = capture(get_auth_token, [{"name": "us_report"}])
+        for member in (self.eu, self.us):
+            member.call_tools_batch.side_effect = capture(get_deadline, ["ok"])
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        
+        with use_auth_token("tenant-token"):
+            client.connect(self.test_token)
+        client.call_tools_batch([("search", {}), ("us_report", {})], deadline=30)
+        
+        self.assertEqual(seen[:2], ["tenant-token", "tenant-token"])
+        self.assertTrue(all(deadline is not None for deadline in seen[2:]))
+    
+    def test_credential_provider_given_to_members(self):
+        """Test that a federated credential provider reaches the members."""
+        eu = MCPClient("https://mcp-eu.example.com")
+        client = FederatedMCPClient([eu], credential_provider=get_auth_token)
+        
+        self.assertIs(eu.credential_provider, get_auth_token)
+        self.assertIs(AsyncMCPClient.from_client(client).credential_provider, get_auth_token)
+    
+    def test_batch_groups_calls_per_server(self):
+        """Test that batched calls are sent to each server in one batch."""
+        client = FederatedMCPClient({"eu": self.eu, "us": self.us})
+        client.connect(self.test_token)
+        self.eu.call_tools_batch.return_value = ["a", "b"]
+        self.us.call_tools_batch.return_value = ["c"]
+        
+        results = client.call_tools_batch([("search", {}), ("us_report", {}), ("eu_report", {}), ("missing", {})])
+        
+        self.assertEqual(results[:3], ["a", "c", "b"])
+        self.assertIsInstance(results[3], ValueError)
+        self.eu.call_tools_batch.assert_called_once_with([("search", {}), ("eu_report", {})], 8)
+
+
+class TestAsyncFederatedMCPClient(unittest.TestCase):
+    """Test cases for the async federated client."""
+    
+    def test_from_client_mirrors_federation(self):
+        """Test that async calls are routed with the sync client's catalog."""
+        eu = MCPClient("https://mcp-eu.example.com")
+        federated = FederatedMCPClient([eu])
+        async_client = AsyncMCPClient.from_client(federated)
+        self.assertIsInstance(async_client, AsyncFederatedMCPClient)
+        
+        member = MagicMock(spec=AsyncMCPClient)
+        member.call_tool = AsyncMock(return_value="eu result")
+        federated._routes = {"search": [("mcp-eu", "search")]}
+        async_client = AsyncFederatedMCPClient(federated, {"mcp-eu": member})
+        
+        self.assertEqual(asyncio.run(async_client.call_tool("search", {})), "eu result")
+        member.call_tool.assert_awaited_once_with("search", {})
+
+
+if __name__ == '__main__':
+    unittest.main()
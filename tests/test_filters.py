@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+from shivonai.core.catalog import CatalogCache, CatalogEntry
+from shivonai.core.filters import ToolFilter
+from shivonai.core.mcp_client import MCPClient
+from tests.helpers import make_response
+
+
+TOOLS = [
+    {"name": "search_users", "tags": ["users", "read"]},
+    {"name": "search_orders", "tags": ["orders", "read"]},
+    {"name": "delete_user", "tags": ["users", "write"]},
+    {"name": "ping"},
+]
+
+
+class TestToolFilter(unittest.TestCase):
+    """Test cases for tool catalog filters."""
+    
+    def names(self, tool_filter):
+        return [tool_info["name"] for tool_info in tool_filter.apply(TOOLS)]
+    
+    def test_include_and_exclude_globs(self):
+        """Test that include and exclude accept names and glob patterns."""
+        self.assertEqual(self.names(ToolFilter(include=["search_*", "ping"])), ["search_users", "search_orders", "ping"])
+        self.assertEqual(self.names(ToolFilter(include=["search_*"], exclude=["*orders"])), ["search_users"])
+    
+    def test_tags_and_max_tools(self):
+        """Test that tags match any tag and max_tools keeps catalog order."""
+        self.assertEqual(self.names(ToolFilter(tags=["users"])), ["search_users", "delete_user"])
+        self.assertEqual(self.names(ToolFilter(tags=["read"], max_tools=1)), ["search_users"])
+    
+    def test_from_options_without_options(self):
+        """Test that no filter is built when no option is set."""
+        self.assertIsNone(ToolFilter.from_options())
+        self.assertIsNotNone(ToolFilter.from_options(max_tools=5))
+    
+    def test_query_params_and_key(self):
+        """Test the query parameters sent to the server."""
+        tool_filter = ToolFilter(include=["a", "b*"], tags=["y", "x"], max_tools=3)
+        
+        self.assertEqual(tool_filter.query_params(), {"include": "a,b*", "tags": "x,y", "limit": "3"})
+        self.assertEqual(tool_filter.key(), ToolFilter(include=["a", "b*"], tags=["x", "y"], max_tools=3).key())
+
+
+class TestClientToolFilter(unittest.TestCase):
+    """Test cases for filtered catalog requests."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.cache = CatalogCache(ttl=60)
+        self.client = MCPClient(catalog_cache=self.cache)
+        self.test_token = "test-token"
+    
+    @patch('requests.Session.get')
+    def test_list_tools_pushes_filter_down(self, mock_get):
+        """Test that the filter is sent as query parameters and re-applied."""
+        # The server ignores the filter and returns the whole catalog
+        mock_get.return_value = make_response({"tools": TOOLS})
+        self.client.token = self.test_token
+        tool_filter = ToolFilter(include=["search_*"])
+        
+        result = self.client.list_tools(tool_filter)
+        
+        self.assertEqual(mock_get.call_args[1]["params"], {"include": "search_*"})
+        self.assertEqual([tool_info["name"] for tool_info in result], ["search_users", "search_orders"])
+        self.assertEqual(self.cache.get(self.client.base_url, self.test_token, tool_filter.key()).tools, result)
+        self.assertIsNone(self.cache.get(self.client.base_url, self.test_token))
+    
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    def test_connect_filters_fresh_full_catalog(self, mock_post, mock_get):
+        """Test that a fresh full catalog serves filtered requests locally."""
+        self.cache.set(self.client.base_url, self.test_token, CatalogEntry(TOOLS))
+        
+        result = self.client.connect(self.test_token, ToolFilter(exclude=["search_*"]))
+        
+        self.assertEqual([tool_info["name"] for tool_info in result], ["delete_user", "ping"])
+        mock_post.assert_not_called()
+        mock_get.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+import unittest
+
+
+FRAMEWORK_MODULES = ["langchain", "llama_index", "crewai", "agno", "pydantic"]
+
+IMPORT_SCRIPT = """
+import json, sys
+import shivonai.lyra
+print(json.dumps([name for name in %r if name in sys.modules]))
+""" % (FRAMEWORK_MODULES,)
+
+
+def loaded_frameworks():
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT])
+    return json.loads(output)
+
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for the import cost of shivonai.lyra.
+    
+    The import time itself is measured by ``benchmarks/run.py``.
+    """
+    
+    def test_import_does_not_load_frameworks(self):
+        """Test that importing lyra does not import any agent framework."""
+        self.assertEqual(loaded_frameworks(), [])
+    
+    def test_toolkits_resolve_lazily(self):
+        """Test that toolkits are still importable from lyra."""
+        from shivonai.lyra import langchain_toolkit, agno_toolkit
+        
+        self.assertTrue(callable(langchain_toolkit))
+        self.assertTrue(callable(agno_toolkit))
+
+
+if __name__ == '__main__':
+    unittest.main()
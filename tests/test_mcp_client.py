@@ -1,6 +1,7 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
-from shivonai.core.mcp_client import MCPClient
+from shivonai.core.mcp_client import MCPClient, MCPToolError
 
 
 class TestMCPClient(unittest.TestCase):
@@ -11,12 +12,12 @@ class TestMCPClient(unittest.TestCase):
         self.client = MCPClient(base_url="https://mcp-server.shivonai.com")
         self.test_token = "test-token"
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_authenticate(self, mock_post):
         """Test authenticate method."""
         # Configure mock
         mock_response = MagicMock()
-        mock_response.json.return_value = {"server_info": {"name": "Test Server", "version": "1.0"}}
+        mock_response.content = json.dumps({"server_info": {"name": "Test Server", "version": "1.0"}}).encode()
         mock_post.return_value = mock_response
         
         # Call the method
@@ -25,12 +26,13 @@ class TestMCPClient(unittest.TestCase):
         # Assert
         mock_post.assert_called_once_with(
             "https://mcp-server.shivonai.com/initialize",
+            timeout=(10.0, 60.0),
             json={"auth_token": self.test_token}
         )
         self.assertEqual(result, {"name": "Test Server", "version": "1.0"})
         self.assertEqual(self.client.token, self.test_token)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_list_tools(self, mock_get):
         """Test list_tools method."""
         # Set token
@@ -38,12 +40,12 @@ class TestMCPClient(unittest.TestCase):
         
         # Configure mock
         mock_response = MagicMock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "tools": [
                 {"name": "tool1", "description": "Test Tool 1"},
                 {"name": "tool2", "description": "Test Tool 2"}
             ]
-        }
+        }).encode()
         mock_get.return_value = mock_response
         
         # Call the method
@@ -52,6 +54,7 @@ class TestMCPClient(unittest.TestCase):
         # Assert
         mock_get.assert_called_once_with(
             "https://mcp-server.shivonai.com/tools/list",
+            timeout=(10.0, 60.0),
             headers={"Authorization": f"Bearer {self.test_token}"}
         )
         self.assertEqual(len(result), 2)
@@ -65,7 +68,7 @@ class TestMCPClient(unittest.TestCase):
         
         self.assertTrue("Not authenticated. Call authenticate() first." in str(context.exception))
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_call_tool(self, mock_post):
         """Test call_tool method."""
         # Set token
@@ -73,7 +76,7 @@ class TestMCPClient(unittest.TestCase):
         
         # Configure mock
         mock_response = MagicMock()
-        mock_response.json.return_value = {"result": "Tool executed successfully"}
+        mock_response.content = json.dumps({"result": "Tool executed successfully"}).encode()
         mock_post.return_value = mock_response
         
         # Call the method
@@ -82,6 +85,7 @@ class TestMCPClient(unittest.TestCase):
         # Assert
         mock_post.assert_called_once_with(
             "https://mcp-server.shivonai.com/tools/call",
+            timeout=(10.0, 60.0),
             headers={"Authorization": f"Bearer {self.test_token}"},
             json={"name": "test_tool", "parameters": {"param1": "value1"}}
         )
@@ -93,6 +97,108 @@ class TestMCPClient(unittest.TestCase):
             self.client.call_tool("test_tool", {"param1": "value1"})
         
         self.assertTrue("Not authenticated. Call authenticate() first." in str(context.exception))
+    
+    def test_session_is_pooled(self):
+        """Test that the client mounts a pooled adapter on its session."""
+        client = MCPClient(pool_connections=4, pool_maxsize=32)
+        adapter = client.session.get_adapter("https://mcp-server.shivonai.com")
+        
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        client.close()
+    
+    @patch('requests.Session.post')
+    def test_session_reused_across_calls(self, mock_post):
+        """Test that every call goes through the same session."""
+        mock_response = MagicMock()
+        mock_response.content = json.dumps({"server_info": {}, "result": "ok"}).encode()
+        mock_post.return_value = mock_response
+        
+        session = self.client.session
+        self.client.authenticate(self.test_token)
+        self.client.call_tool("test_tool", {})
+        self.client.call_tool("test_tool", {})
+        
+        self.assertIs(self.client.session, session)
+        self.assertEqual(mock_post.call_count, 3)
+    
+    @patch('requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close):
+        """Test that leaving the context manager closes the owned session."""
+        with MCPClient() as client:
+            self.assertIsInstance(client, MCPClient)
+        
+        mock_close.assert_called_once_with()
+    
+    @patch('requests.Session.close')
+    def test_external_session_not_closed(self, mock_close):
+        """Test that a session passed in by the caller is left open."""
+        import requests
+        session = requests.Session()
+        
+        with MCPClient(session=session) as client:
+            self.assertIs(client.session, session)
+        
+        mock_close.assert_not_called()
+    
+    @patch('requests.Session.post')
+    def test_call_tools_batch_endpoint(self, mock_post):
+        """Test call_tools_batch using the multi-call endpoint."""
+        self.client.token = self.test_token
+        
+        mock_response = MagicMock(status_code=200)
+        mock_response.content = json.dumps({
+            "results": [{"result": "first"}, {"error": "bad params"}]
+        }).encode()
+        mock_post.return_value = mock_response
+        
+        result = self.client.call_tools_batch([("tool1", {"a": 1}), ("tool2", {})])
+        
+        mock_post.assert_called_once_with(
+            "https://mcp-server.shivonai.com/tools/call_batch",
+            timeout=(10.0, 60.0),
+            headers={"Authorization": f"Bearer {self.test_token}"},
+            json={"calls": [
+                {"name": "tool1", "parameters": {"a": 1}},
+                {"name": "tool2", "parameters": {}}
+            ]}
+        )
+        self.assertEqual(result[0], "first")
+        self.assertIsInstance(result[1], MCPToolError)
+        self.assertEqual(result[1].tool_name, "tool2")
+    
+    @patch('requests.Session.post')
+    def test_call_tools_batch_fallback(self, mock_post):
+        """Test call_tools_batch falling back to parallel calls."""
+        self.client.token = self.test_token
+        
+        def post(url, timeout=None, headers=None, json=None):
+            response = MagicMock(status_code=200)
+            if url.endswith("/tools/call_batch"):
+                response.status_code = 404
+            elif json["name"] == "broken":
+                response.raise_for_status.side_effect = RuntimeError("boom")
+            else:
+                response.content = b'{"result": %d}' % json["parameters"]["i"]
+            return response
+        
+        mock_post.side_effect = post
+        
+        calls = [("tool", {"i": i}) for i in range(5)] + [("broken", {})]
+        result = self.client.call_tools_batch(calls, max_concurrency=3)
+        
+        self.assertEqual(result[:5], [0, 1, 2, 3, 4])
+        self.assertIsInstance(result[5], RuntimeError)
+        
+        # The missing endpoint is remembered
+        mock_post.reset_mock()
+        self.client.call_tools_batch([("tool", {"i": 0})])
+        self.assertEqual(mock_post.call_count, 1)
+    
+    def test_call_tools_batch_not_authenticated(self):
+        """Test call_tools_batch method when not authenticated."""
+        with self.assertRaises(ValueError):
+            self.client.call_tools_batch([("test_tool", {})])
 
 
 if __name__ == '__main__':
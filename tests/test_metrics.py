@@ -0,0 +1,223 @@
+import datetime
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.metrics import (
+    InMemoryMetrics,
+    PrometheusMetrics,
+    instrument_tool,
+    server_seconds,
+    TOOL_CALLS,
+    TOOL_ERRORS,
+    TOOL_CALL_SECONDS,
+    TOOL_PHASE_SECONDS,
+    ADAPTER_SECONDS,
+    RESPONSE_BYTES,
+    CONNECTIONS_OPENED,
+    BATCH_TOOL,
+)
+from tests.helpers import make_client
+
+
+def tool_response(content=b'{"result": "ok"}', server_timing=None):
+    """Build a mocked tool call response."""
+    response = MagicMock()
+    response.status_code = 200
+    response.elapsed = datetime.timedelta(milliseconds=50)
+    response.headers = {"Server-Timing": server_timing} if server_timing else {}
+    response.request.body = b'{"name": "search", "parameters": {}}'
+    response.content = content
+    return response
+
+
+class TestMetricsSinks(unittest.TestCase):
+    """Test cases for the metrics sinks."""
+    
+    def test_histogram_buckets(self):
+        """Test values land in the first bucket they fit."""
+        metrics = InMemoryMetrics(latency_buckets=(0.1, 1.0))
+        
+        metrics.observe("latency_seconds", 0.05, {"tool": "a"})
+        metrics.observe("latency_seconds", 0.5, {"tool": "a"})
+        metrics.observe("latency_seconds", 5.0, {"tool": "a"})
+        
+        histogram = metrics.histogram("latency_seconds", tool="a")
+        self.assertEqual(histogram["buckets"], [1, 1])
+        self.assertEqual(histogram["count"], 3)
+    
+    def test_prometheus_render(self):
+        """Test the text exposition format."""
+        metrics = PrometheusMetrics(latency_buckets=(0.1, 1.0))
+        metrics.increment("calls_total", {"tool": "a"})
+        metrics.observe("latency_seconds", 0.5, {"tool": "a"})
+        
+        text = metrics.render()
+        
+        self.assertIn("# TYPE calls_total counter", text)
+        self.assertIn('calls_total{tool="a"} 1', text)
+        self.assertIn('latency_seconds_bucket{tool="a",le="0.1"} 0', text)
+        self.assertIn('latency_seconds_bucket{tool="a",le="1"} 1', text)
+        self.assertIn('latency_seconds_bucket{tool="a",le="+Inf"} 1', text)
+        self.assertIn('latency_seconds_count{tool="a"} 1', text)
+    
+    def test_server_timing(self):
+        """Test the server time is read from Server-Timing."""
+        self.assertEqual(server_seconds({"Server-Timing": "db;dur=5, app;dur=20"}), 0.02)
+        self.assertIsNone(server_seconds({}))
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Test cases for MCPClient instrumentation."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.metrics = InMemoryMetrics()
+        self.client = make_client(base_url="https://mcp-server.shivonai.com", metrics=self.metrics)
+    
+    @patch('requests.Session.post')
+    def test_call_tool_records_phases(self, mock_post):
+        """Test a tool call records its count, phases and sizes."""
+        mock_post.return_value = tool_response(server_timing="app;dur=30")
+        
+        self.client.call_tool("search", {})
+        
+        self.assertEqual(self.metrics.counter(TOOL_CALLS, tool="search"), 1)
+        for phase in ("response", "server", "network", "decode"):
+            self.assertIsNotNone(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase=phase))
+        self.assertEqual(self.metrics.histogram(RESPONSE_BYTES, tool="search")["sum"], 16)
+    
+    @patch('requests.Session.post')
+    def test_call_tool_records_errors(self, mock_post):
+        """Test a failed tool call is counted as an error."""
+        mock_post.return_value = tool_response()
+        mock_post.return_value.raise_for_status.side_effect = ValueError("boom")
+        
+        with self.assertRaises(ValueError):
+            self.client.call_tool("search", {})
+        
+        self.assertEqual(self.metrics.counter(TOOL_ERRORS, tool="search", error="ValueError"), 1)
+    
+    @patch('requests.Session.post')
+    def test_new_connections_counted(self, mock_post):
+        """Test that calls opening a connection are counted apart."""
+        url = self.client.base_url
+        pool = self.client.session.get_adapter(url).poolmanager.connection_from_url(url)
+        
+        def post(*args, **kwargs):
+            if not pool.num_connections:
+                pool.num_connections += 1
+            return tool_response()
+        
+        mock_post.side_effect = post
+        self.client.call_tool("search", {})
+        self.client.call_tool("search", {})
+        
+        self.assertEqual(self.metrics.counter(CONNECTIONS_OPENED, tool="search"), 1)
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="response")["count"], 2)
+    
+    @patch('requests.Session.post')
+    def test_stream_records_phases(self, mock_post):
+        """Test a streamed call is counted and its reading recorded as decode."""
+        response = tool_response()
+        response.headers = {"Content-Type": "application/x-ndjson"}
+        response.iter_lines.return_value = iter([b'{"id": 1}', b'{"id": 2}'])
+        response.raw.tell.return_value = 20
+        mock_post.return_value = response
+        
+        records = self.client.call_tool_stream("search", {})
+        self.assertEqual(self.metrics.counter(TOOL_CALLS, tool="search"), 1)
+        self.assertIsNone(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="decode"))
+        
+        self.assertEqual(list(records), [{"id": 1}, {"id": 2}])
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="decode")["count"], 1)
+        self.assertEqual(self.metrics.histogram(RESPONSE_BYTES, tool="search")["sum"], 20)
+    
+    @patch('requests.Session.post')
+    def test_batch_records_each_call(self, mock_post):
+        """Test that batched calls are counted under their own tools."""
+        mock_post.return_value = tool_response()
+        mock_post.return_value.content = b'{"results": [{"result": 1}, {"result": 2}, {"error": "bad"}]}'
+        
+        self.client.call_tools_batch([("search", {}), ("search", {"q": "x"}), ("book", {})])
+        
+        self.assertEqual(self.metrics.counter(TOOL_CALLS, tool="search"), 2)
+        self.assertEqual(self.metrics.counter(TOOL_CALLS, tool="book"), 1)
+        self.assertEqual(self.metrics.counter(TOOL_ERRORS, tool="book", error="MCPToolError"), 1)
+        self.assertEqual(self.metrics.histogram(TOOL_CALL_SECONDS, tool="search")["count"], 2)
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool=BATCH_TOOL, phase="response")["count"], 1)
+    
+    @patch('requests.Session.post')
+    def test_adapter_overhead(self, mock_post):
+        """Test toolkit wrappers record their overhead around the client call."""
+        mock_post.return_value = tool_response()
+        
+        def tool_func(**kwargs):
+            return self.client.call_tool("search", kwargs)
+        
+        wrapped = instrument_tool(tool_func, "search", self.metrics, "langchain")
+        
+        self.assertEqual(wrapped(q="python"), "ok")
+        histogram = self.metrics.histogram(ADAPTER_SECONDS, tool="search", framework="langchain")
+        self.assertEqual(histogram["count"], 1)
+    
+    def test_disabled_instrumentation(self):
+        """Test nothing is wrapped without a sink."""
+        def tool_func():
+            return "ok"
+        
+        self.assertIs(instrument_tool(tool_func, "search", None, "langchain"), tool_func)
+
+
+class TestAsyncClientMetrics(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncMCPClient instrumentation."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.connections = 0
+        
+        async def handler(request):
+            trace = request.extensions["trace"]
+            if not self.connections:
+                # Open a connection for the first request only
+                self.connections += 1
+                await trace("connection.connect_tcp.started", {})
+                await trace("connection.connect_tcp.complete", {})
+                await trace("connection.start_tls.started", {})
+                await trace("connection.start_tls.complete", {})
+            if "application/x-ndjson" in request.headers["Accept"]:
+                body = httpx.ByteStream(b'{"id": 1}\n{"id": 2}\n')
+                return httpx.Response(200, headers={"Content-Type": "application/x-ndjson"}, stream=body)
+            return httpx.Response(200, json={"result": "ok"})
+        
+        self.metrics = InMemoryMetrics()
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.client = AsyncMCPClient(base_url="https://mcp-server.shivonai.com", http_client=http_client, metrics=self.metrics)
+        self.client.token = "test-token"
+    
+    async def asyncTearDown(self):
+        await self.client.http_client.aclose()
+    
+    async def test_connection_setup_recorded(self):
+        """Test that connection setup is traced and recorded as its own phase."""
+        await self.client.call_tool("search", {})
+        await self.client.call_tool("search", {})
+        
+        self.assertEqual(self.metrics.counter(CONNECTIONS_OPENED, tool="search"), 1)
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="connect")["count"], 1)
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="response")["count"], 2)
+    
+    async def test_stream_records_phases(self):
+        """Test a streamed call is counted and recorded once read."""
+        records = [record async for record in self.client.call_tool_stream("search", {})]
+        
+        self.assertEqual(records, [{"id": 1}, {"id": 2}])
+        self.assertEqual(self.metrics.counter(TOOL_CALLS, tool="search"), 1)
+        self.assertEqual(self.metrics.histogram(TOOL_PHASE_SECONDS, tool="search", phase="decode")["count"], 1)
+        self.assertEqual(self.metrics.histogram(RESPONSE_BYTES, tool="search")["sum"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
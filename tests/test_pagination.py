@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.filters import ToolFilter
+from shivonai.core.pagination import iter_pages, page_result, paged_callers, with_cursor_param
+from tests.helpers import make_client, make_response
+
+RECORDS = list(range(25))
+TOOLS = [{"name": f"tool_{i}"} for i in range(7)]
+
+
+def paged(items, cursor, size):
+    start = int(cursor or 0)
+    end = start + size
+    return items[start:end], str(end) if end < len(items) else None
+
+
+def page_response(key, items, cursor, size):
+    page, next_cursor = paged(items, cursor, size)
+    return make_response({key: page, "next_cursor": next_cursor})
+
+
+class TestIterPages(unittest.TestCase):
+    """Test cases for the prefetching page iterator."""
+    
+    def test_yields_every_page(self):
+        """Test that pages are followed until there is no cursor."""
+        pages = list(iter_pages(lambda cursor: paged(RECORDS, cursor, 10)))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+    
+    def test_prefetches_next_page(self):
+        """Test that the next page is fetched while the current one is used."""
+        fetched = []
+        
+        def fetch(cursor):
+            fetched.append(cursor)
+            return paged(RECORDS, cursor, 10)
+        
+        pages = iter_pages(fetch)
+        next(pages)
+        time.sleep(0.05)
+        self.assertEqual(fetched, [None, "10"])
+        pages.close()
+        
+        fetched.clear()
+        list(iter_pages(fetch, prefetch=False, max_pages=2))
+        self.assertEqual(fetched, [None, "10"])
+    
+    def test_prefetch_overlaps_consumption(self):
+        """Test that fetching and consuming pages run concurrently."""
+        def fetch(cursor):
+            time.sleep(0.05)
+            return paged(RECORDS, cursor, 10)
+        
+        started = time.perf_counter()
+        for _ in iter_pages(fetch):
+            time.sleep(0.05)
+        self.assertLess(time.perf_counter() - started, 0.25)
+    
+    def test_async_pages(self):
+        """Test the asyncio iterator."""
+        async def fetch(cursor):
+            return paged(RECORDS, cursor, 10)
+        
+        async def collect():
+            from shivonai.core.pagination import aiter_pages
+            return [page async for page in aiter_pages(fetch, max_pages=2)]
+        
+        self.assertEqual([len(page) for page in asyncio.run(collect())], [10, 10])
+
+
+class TestMCPClientPagination(unittest.TestCase):
+    """Test cases for the paginated client calls."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client()
+    
+    @patch('requests.Session.get')
+    def test_list_tools_follows_cursors(self, mock_get):
+        """Test that the full catalog is assembled from every page."""
+        mock_get.side_effect = lambda *args, **kwargs: page_response(
+            "tools", TOOLS, kwargs.get("params", {}).get("cursor"), 3
+        )
+        
+        tools = self.client.list_tools()
+        
+        self.assertEqual(tools, TOOLS)
+        self.assertEqual(mock_get.call_count, 3)
+    
+    @patch('requests.Session.get')
+    def test_iter_tools_stops_early(self, mock_get):
+        """Test that iteration applies the filter and stops with max_tools."""
+        mock_get.side_effect = lambda *args, **kwargs: page_response(
+            "tools", TOOLS, kwargs.get("params", {}).get("cursor"), 3
+        )
+        
+        tools = list(self.client.iter_tools(ToolFilter(exclude=["tool_0"], max_tools=2), prefetch=False))
+        
+        self.assertEqual([tool["name"] for tool in tools], ["tool_1", "tool_2"])
+        self.assertEqual(mock_get.call_count, 1)
+    
+    @patch('requests.Session.post')
+    def test_call_tool_paged(self, mock_post):
+        """Test that records of every page are yielded and cursors are sent."""
+        mock_post.side_effect = lambda *args, **kwargs: page_response(
+            "result", RECORDS, kwargs["json"].get("cursor"), 10
+        )
+        
+        self.assertEqual(list(self.client.call_tool_paged("listings", {"city": "Paris"})), RECORDS)
+        sent = [call.kwargs["json"] for call in mock_post.call_args_list]
+        self.assertNotIn("cursor", sent[0])
+        self.assertEqual([body.get("cursor") for body in sent[1:]], ["10", "20"])
+        
+        self.assertEqual(self.client.call_tool_page("listings", {}, "20"), (RECORDS[20:], None))
+    
+    @patch('requests.Session.post')
+    def test_paged_callers(self, mock_post):
+        """Test that toolkit callers take the cursor from the agent's arguments."""
+        mock_post.side_effect = lambda *args, **kwargs: page_response(
+            "result", RECORDS, kwargs["json"].get("cursor"), 10
+        )
+        call_tool, acall_tool = paged_callers(self.client, None)
+        
+        first = call_tool("listings", {"city": "Paris", "cursor": None})
+        last = call_tool("listings", {"city": "Paris", "cursor": "20"})
+        
+        self.assertEqual(first["next_cursor"], "10")
+        self.assertEqual(first["items"], RECORDS[:10])
+        self.assertEqual(last, RECORDS[20:])
+        self.assertEqual(mock_post.call_args.kwargs["json"]["parameters"], {"city": "Paris"})
+        self.assertIsNone(acall_tool)
+    
+    def test_cursor_param(self):
+        """Test that tools get an optional string cursor parameter once."""
+        tools = with_cursor_param([{"name": "search", "parameters": [{"name": "q", "required": True}]}])
+        
+        self.assertEqual([param["name"] for param in tools[0]["parameters"]], ["q", "cursor"])
+        self.assertFalse(tools[0]["parameters"][1]["required"])
+        self.assertEqual(with_cursor_param(tools), tools)
+        self.assertEqual(page_result([1], None), [1])
+
+
+class TestAsyncMCPClientPagination(unittest.TestCase):
+    """Test cases for the paginated async client calls."""
+    
+    def test_call_tool_paged(self):
+        """Test async paged calls and catalog assembly."""
+        def handler(request):
+            if request.url.path == "/tools/list":
+                page, cursor = paged(TOOLS, request.url.params.get("cursor"), 3)
+                return httpx.Response(200, json={"tools": page, "nextCursor": cursor})
+            cursor = json.loads(request.content).get("cursor")
+            page, cursor = paged(RECORDS, cursor, 10)
+            return httpx.Response(200, json={"result": page, "next_cursor": cursor})
+        
+        async def run():
+            client = AsyncMCPClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            client.token = "test-token"
+            records = [record async for record in client.call_tool_paged("listings", {})]
+            return records, await client.list_tools()
+        
+        records, tools = asyncio.run(run())
+        self.assertEqual(records, RECORDS)
+        self.assertEqual(tools, TOOLS)
+
+
+if __name__ == '__main__':
+    unittest.main()
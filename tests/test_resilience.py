@@ -0,0 +1,164 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from shivonai.core.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from tests.helpers import connect_error, make_client, make_response
+
+
+@patch('shivonai.core.mcp_client.time.sleep')
+class TestRetries(unittest.TestCase):
+    """Test cases for retries in MCPClient."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client(
+            retry_policy=RetryPolicy(max_retries=2),
+            circuit_breaker=CircuitBreaker()
+        )
+        self.client.available_tools = [
+            {"name": "list_jobs", "annotations": {"readOnlyHint": True}},
+            {"name": "create_job"}
+        ]
+    
+    @patch('requests.Session.get')
+    def test_list_tools_retried_on_503(self, mock_get, mock_sleep):
+        """Test that idempotent requests are retried on transient statuses."""
+        mock_get.side_effect = [
+            make_response(status_code=503),
+            make_response({"tools": []})
+        ]
+        
+        self.assertEqual(self.client.list_tools(), [])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+    
+    @patch('requests.Session.post')
+    def test_write_tool_not_retried_on_503(self, mock_post, mock_sleep):
+        """Test that a non-idempotent tool is not resent after a 503."""
+        response = make_response(status_code=503)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        mock_post.return_value = response
+        
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.call_tool("create_job", {})
+        self.assertEqual(mock_post.call_count, 1)
+    
+    @patch('requests.Session.post')
+    def test_read_only_tool_retried_on_reset(self, mock_post, mock_sleep):
+        """Test that a read-only tool is retried after a connection reset."""
+        mock_post.side_effect = [
+            requests.exceptions.ConnectionError("Connection reset by peer"),
+            make_response({"result": "ok"})
+        ]
+        
+        self.assertEqual(self.client.call_tool("list_jobs", {}), "ok")
+    
+    @patch('requests.Session.post')
+    def test_any_tool_retried_on_429_with_retry_after(self, mock_post, mock_sleep):
+        """Test that 429 is retried for any call and honours Retry-After."""
+        mock_post.side_effect = [
+            make_response(status_code=429, headers={"Retry-After": "3"}),
+            make_response({"result": "created"})
+        ]
+        
+        self.assertEqual(self.client.call_tool("create_job", {}), "created")
+        mock_sleep.assert_called_once_with(3.0)
+    
+    @patch('requests.Session.post')
+    def test_any_tool_retried_on_connect_error(self, mock_post, mock_sleep):
+        """Test that a call that never reached the server is retried."""
+        mock_post.side_effect = [connect_error(), make_response({"result": "created"})]
+        
+        self.assertEqual(self.client.call_tool("create_job", {}), "created")
+    
+    @patch('requests.Session.get')
+    def test_retries_exhausted(self, mock_get, mock_sleep):
+        """Test that the final response is returned once retries run out."""
+        response = make_response(status_code=503)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        mock_get.return_value = response
+        
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.list_tools()
+        self.assertEqual(mock_get.call_count, 3)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the per-endpoint circuit breaker."""
+    
+    @patch('requests.Session.post')
+    def test_circuit_opens_after_failures(self, mock_post):
+        """Test that an unhealthy endpoint fails fast."""
+        mock_post.side_effect = connect_error()
+        client = make_client(retry_policy=None, circuit_breaker=CircuitBreaker(failure_threshold=2))
+        
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.call_tool("create_job", {})
+        with self.assertRaises(CircuitOpenError):
+            client.call_tool("create_job", {})
+        self.assertEqual(mock_post.call_count, 2)
+    
+    @patch('shivonai.core.resilience.time.monotonic')
+    def test_half_open_trial(self, mock_monotonic):
+        """Test that one trial call is let through after the recovery timeout."""
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.record_failure("endpoint")
+        
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call("endpoint")
+        
+        mock_monotonic.return_value = 111.0
+        breaker.before_call("endpoint")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call("endpoint")
+        
+        breaker.record_success("endpoint")
+        breaker.before_call("endpoint")
+        self.assertFalse(breaker.is_open("endpoint"))
+    
+    @patch('requests.Session.post')
+    @patch('shivonai.core.resilience.time.monotonic')
+    def test_interrupted_trial_released(self, mock_monotonic, mock_post):
+        """Test that a trial ending in a non-transport error frees the endpoint."""
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        client = make_client(retry_policy=None, circuit_breaker=breaker)
+        breaker.record_failure(f"{client.base_url}/tools/call")
+        
+        mock_monotonic.return_value = 111.0
+        mock_post.side_effect = LookupError("no recording")
+        with self.assertRaises(LookupError):
+            client.call_tool("create_job", {})
+        
+        mock_post.side_effect = None
+        mock_post.return_value = make_response({"result": "ok"})
+        self.assertEqual(client.call_tool("create_job", {}), "ok")
+        self.assertFalse(breaker.is_open(f"{client.base_url}/tools/call"))
+    
+    @patch('requests.Session.post')
+    def test_application_errors_do_not_open(self, mock_post):
+        """Test that 500s from a broken tool leave the endpoint closed."""
+        mock_post.return_value = make_response({"error": "tool failed"}, 500)
+        breaker = CircuitBreaker(failure_threshold=2)
+        client = make_client(retry_policy=None, circuit_breaker=breaker)
+        
+        for _ in range(3):
+            with self.assertRaises(Exception):
+                client.call_tool("create_job", {})
+        self.assertFalse(breaker.is_open(f"{client.base_url}/tools/call"))
+    
+    def test_endpoints_are_independent(self):
+        """Test that failures of one endpoint do not open another."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure("https://server/tools/call")
+        
+        self.assertTrue(breaker.is_open("https://server/tools/call"))
+        self.assertFalse(breaker.is_open("https://server/tools/list"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+
+from shivonai.core.result_cache import MISSING, ToolResultCache
+from tests.helpers import make_client, make_response
+
+
+TOOLS = [
+    {"name": "list_jobs", "annotations": {"readOnlyHint": True}},
+    {"name": "create_job", "annotations": {"destructiveHint": True}},
+    {"name": "get_report", "cache_ttl": 5},
+    {"name": "unknown_tool"}
+]
+
+
+class TestToolResultCache(unittest.TestCase):
+    """Test cases for the tool result cache."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.cache = ToolResultCache(default_ttl=60)
+        self.client = make_client(result_cache=self.cache)
+        self.client.available_tools = TOOLS
+    
+    @patch('requests.Session.post')
+    def test_read_only_tool_cached(self, mock_post):
+        """Test that identical read-only calls hit the server once."""
+        mock_post.return_value = make_response({"result": ["job1"]})
+        
+        first = self.client.call_tool("list_jobs", {"status": "open", "limit": 5})
+        second = self.client.call_tool("list_jobs", {"limit": 5, "status": "open"})
+        
+        self.assertEqual(first, ["job1"])
+        self.assertEqual(second, ["job1"])
+        self.assertEqual(mock_post.call_count, 1)
+    
+    @patch('requests.Session.post')
+    def test_batch_serves_cached_calls(self, mock_post):
+        """Test that batched calls read and fill the cache."""
+        mock_post.return_value = make_response({"result": ["job1"]})
+        self.client.call_tool("list_jobs", {"status": "open"})
+        
+        mock_post.return_value = make_response({"results": [{"result": ["job2"]}]})
+        results = self.client.call_tools_batch([("list_jobs", {"status": "open"}), ("list_jobs", {"status": "closed"})])
+        
+        self.assertEqual(results, [["job1"], ["job2"]])
+        self.assertEqual(mock_post.call_args.kwargs["json"], {"calls": [{"name": "list_jobs", "parameters": {"status": "closed"}}]})
+        self.assertEqual(self.client.call_tool("list_jobs", {"status": "closed"}), ["job2"])
+        self.assertEqual(mock_post.call_count, 2)
+    
+    @patch('requests.Session.post')
+    def test_cache_keyed_by_tenant(self, mock_post):
+        """Test that tenants do not share cached results."""
+        mock_post.return_value = make_response({"result": ["job1"]})
+        
+        self.client.call_tool("list_jobs", {})
+        self.client.token = "other-token"
+        self.client.call_tool("list_jobs", {})
+        
+        self.assertEqual(mock_post.call_count, 2)
+    
+    @patch('requests.Session.post')
+    def test_writes_and_undeclared_tools_not_cached(self, mock_post):
+        """Test that destructive and undeclared tools always hit the server."""
+        mock_post.return_value = make_response({"result": "done"})
+        self.cache.tool_ttls["create_job"] = 30
+        
+        for _ in range(2):
+            self.client.call_tool("create_job", {"title": "x"})
+            self.client.call_tool("unknown_tool", {})
+        
+        self.assertEqual(mock_post.call_count, 4)
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_ttl_policy(self):
+        """Test the per-tool TTL resolution."""
+        cache = ToolResultCache(default_ttl=60, tool_ttls={"unknown_tool": 10, "list_jobs": None})
+        
+        self.assertIsNone(cache.ttl_for("list_jobs", TOOLS[0]))
+        self.assertEqual(cache.ttl_for("get_report", TOOLS[2]), 5)
+        self.assertEqual(cache.ttl_for("unknown_tool", TOOLS[3]), 10)
+        self.assertEqual(ToolResultCache(default_ttl=60).ttl_for("list_jobs", TOOLS[0]), 60)
+    
+    @patch('shivonai.core.result_cache.time.monotonic')
+    def test_expired_entry_dropped(self, mock_monotonic):
+        """Test that entries expire after their TTL."""
+        mock_monotonic.return_value = 100.0
+        self.cache.set("key", "value", 10)
+        
+        mock_monotonic.return_value = 111.0
+        
+        self.assertIs(self.cache.get("key"), MISSING)
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_memory_bound(self):
+        """Test that the least recently used results are evicted by size."""
+        cache = ToolResultCache(max_bytes=25)
+        cache.set("a", "x" * 10, 60)
+        cache.set("b", "y" * 10, 60)
+        cache.set("c", "z" * 10, 60)
+        
+        self.assertIs(cache.get("a"), MISSING)
+        self.assertEqual(cache.get("c"), "z" * 10)
+        
+        cache.set("huge", "x" * 100, 60)
+        self.assertIs(cache.get("huge"), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from shivonai.utils.schemas import SchemaCache, get_args_model, parameters_key
+from shivonai.lyra.agno_tools import convert_parameters_to_schema
+
+
+PARAMETERS = [
+    {"name": "query", "description": "Search query", "required": True},
+    {"name": "limit", "description": "Maximum results", "type": "integer"}
+]
+
+
+class TestSchemaCache(unittest.TestCase):
+    """Test cases for the generated schema cache."""
+    
+    def test_args_model_reused_for_same_spec(self):
+        """Test that an unchanged spec returns the same model class."""
+        first = get_args_model("searchSchema", PARAMETERS)
+        second = get_args_model("searchSchema", [dict(param) for param in PARAMETERS])
+        
+        self.assertIs(first, second)
+        self.assertEqual(first.__name__, "searchSchema")
+        self.assertEqual(set(first.model_fields), {"query", "limit"})
+    
+    def test_args_model_rebuilt_for_changed_spec(self):
+        """Test that a changed spec or name gets its own model class."""
+        first = get_args_model("searchSchema", PARAMETERS)
+        
+        self.assertIsNot(first, get_args_model("searchSchema", PARAMETERS[:1]))
+        self.assertIsNot(first, get_args_model("SearchToolInput", PARAMETERS))
+    
+    def test_args_model_doc(self):
+        """Test that the model docstring is set."""
+        model = get_args_model("SearchToolInput", PARAMETERS, doc="Input schema for search tool.")
+        
+        self.assertEqual(model.__doc__, "Input schema for search tool.")
+    
+    def test_json_schema_reused(self):
+        """Test that agno JSON schemas come from the cache."""
+        schema = convert_parameters_to_schema(PARAMETERS)
+        
+        self.assertIs(schema, convert_parameters_to_schema(list(PARAMETERS)))
+        self.assertEqual(schema["required"], ["query"])
+        self.assertEqual(schema["properties"]["limit"]["type"], "integer")
+    
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SchemaCache(maxsize=2)
+        cache.get_or_create("a", lambda: 1)
+        cache.get_or_create("b", lambda: 2)
+        cache.get_or_create("a", lambda: 3)
+        cache.get_or_create("c", lambda: 4)
+        
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_or_create("a", lambda: 5), 1)
+        self.assertEqual(cache.get_or_create("b", lambda: 6), 6)
+    
+    def test_parameters_key_ignores_key_order(self):
+        """Test that the spec hash does not depend on dict ordering."""
+        reordered = [{"required": True, "description": "Search query", "name": "query"}]
+        
+        self.assertEqual(parameters_key(PARAMETERS[:1]), parameters_key(reordered))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from urllib.parse import urlsplit
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.sessions import SessionManager
+from tests.helpers import make_response
+
+
+SERVER_INFO = {"name": "MCP Server", "version": "1.0"}
+
+
+class TestSessionManager(unittest.TestCase):
+    """Test cases for shared MCP sessions."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.manager = SessionManager(ttl=60, refresh_margin=10)
+        self.base_url = "https://server"
+        self.test_token = "test-token"
+    
+    def test_concurrent_callers_share_one_initialize(self):
+        """Test that a starting worker pool sends a single /initialize."""
+        started = threading.Event()
+        initialize = MagicMock(side_effect=lambda: started.wait(0.05) or {"server_info": SERVER_INFO})
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(executor.map(
+                lambda _: self.manager.get(self.base_url, self.test_token, initialize),
+                range(8)
+            ))
+        
+        self.assertEqual(initialize.call_count, 1)
+        self.assertTrue(all(session is sessions[0] for session in sessions))
+    
+    def test_failures_are_not_cached(self):
+        """Test that a failed /initialize is retried by the next caller."""
+        initialize = MagicMock(side_effect=[ValueError("unauthorized"), {"server_info": SERVER_INFO}])
+        
+        with self.assertRaises(ValueError):
+            self.manager.get(self.base_url, self.test_token, initialize)
+        session = self.manager.get(self.base_url, self.test_token, initialize)
+        
+        self.assertEqual(session.server_info, SERVER_INFO)
+    
+    def test_invalid_expires_in_uses_default_ttl(self):
+        """Test that a null or malformed lifetime falls back to the default."""
+        for expires_in in (None, "soon", True, [5], float("nan")):
+            session = self.manager._session({"server_info": SERVER_INFO, "expires_in": expires_in})
+            self.assertAlmostEqual(session.expires_at, time.time() + 60, delta=1)
+        
+        session = self.manager._session({"server_info": SERVER_INFO, "expires_in": "120"})
+        self.assertAlmostEqual(session.expires_at, time.time() + 120, delta=1)
+    
+    def test_refresh_in_background_before_expiry(self):
+        """Test that a session close to expiry is served while it is renewed."""
+        initialize = MagicMock(side_effect=[
+            {"server_info": SERVER_INFO, "expires_in": 5},
+            {"server_info": {"name": "renewed"}},
+        ])
+        first = self.manager.get(self.base_url, self.test_token, initialize)
+        
+        self.assertIs(self.manager.get(self.base_url, self.test_token, initialize), first)
+        for _ in range(100):
+            if self.manager.peek(self.base_url, self.test_token) is not first:
+                break
+            time.sleep(0.01)
+        
+        self.assertEqual(self.manager.peek(self.base_url, self.test_token).server_info, {"name": "renewed"})
+        self.assertEqual(initialize.call_count, 2)
+    
+    def test_async_callers_share_one_initialize(self):
+        """Test single-flight /initialize for asyncio callers."""
+        calls = []
+        
+        async def initialize():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"server_info": SERVER_INFO}
+        
+        async def run():
+            return await asyncio.gather(*(
+                self.manager.aget(self.base_url, self.test_token, initialize) for _ in range(5)
+            ))
+        
+        sessions = asyncio.run(run())
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sessions[0].server_info, SERVER_INFO)
+    
+    @patch('requests.Session.post')
+    def test_clients_share_sessions(self, mock_post):
+        """Test that clients with the same manager authenticate once."""
+        mock_post.return_value = make_response({"server_info": SERVER_INFO})
+        
+        for _ in range(3):
+            client = MCPClient(session_manager=self.manager)
+            self.assertEqual(client.authenticate(self.test_token), SERVER_INFO)
+            self.assertEqual(client.token, self.test_token)
+        
+        self.assertEqual(mock_post.call_count, 1)
+    
+    @patch('requests.Session.post')
+    def test_rejected_token_reinitializes_once(self, mock_post):
+        """Test that a 401 drops the cached session and retries after /initialize."""
+        mock_post.side_effect = [
+            make_response({"server_info": SERVER_INFO}),
+            make_response({"error": "expired"}, 401),
+            make_response({"server_info": SERVER_INFO}),
+            make_response({"result": "ok"})
+        ]
+        client = MCPClient(session_manager=self.manager)
+        client.authenticate(self.test_token)
+        stale = self.manager.peek(client.base_url, self.test_token)
+        
+        self.assertEqual(client.call_tool("test_tool", {}), "ok")
+        
+        paths = [urlsplit(call[0][0]).path for call in mock_post.call_args_list]
+        self.assertEqual(paths, ["/initialize", "/tools/call", "/initialize", "/tools/call"])
+        self.assertIsNot(self.manager.peek(client.base_url, self.test_token), stale)
+    
+    def test_async_rejected_token_reinitializes_once(self):
+        """Test that the async client recovers from a 401 the same way."""
+        paths = []
+        
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == "/initialize":
+                return httpx.Response(200, json={"server_info": SERVER_INFO})
+            if paths.count("/tools/call") == 1:
+                return httpx.Response(401, json={"error": "expired"})
+            return httpx.Response(200, json={"result": "ok"})
+        
+        async def run():
+            async with AsyncMCPClient(session_manager=self.manager, transport=httpx.MockTransport(handler)) as client:
+                await client.authenticate(self.test_token)
+                return await client.call_tool("test_tool", {})
+        
+        self.assertEqual(asyncio.run(run()), "ok")
+        self.assertEqual(paths, ["/initialize", "/tools/call", "/initialize", "/tools/call"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.streaming import iter_ndjson, truncate_records
+from tests.helpers import make_client
+
+
+def ndjson_response(records):
+    """Build a mocked streamed response carrying NDJSON records."""
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "application/x-ndjson"}
+    response.iter_lines.return_value = iter(json.dumps(record).encode() for record in records)
+    return response
+
+
+class TestStreamingHelpers(unittest.TestCase):
+    """Test cases for the streaming helpers."""
+    
+    def test_iter_ndjson_skips_blank_lines(self):
+        """Test records are decoded one per line."""
+        records = list(iter_ndjson([b'{"id": 1}', b"", "null", '{"id": 2}']))
+        
+        self.assertEqual(records, [{"id": 1}, None, {"id": 2}])
+    
+    def test_truncate_records(self):
+        """Test truncation stops reading past the limit."""
+        records = iter(range(10))
+        
+        result = truncate_records(records, 3)
+        
+        self.assertEqual(result["items"], [0, 1, 2])
+        self.assertTrue(result["truncated"])
+        self.assertEqual(next(records), 4)
+        self.assertEqual(truncate_records(iter([1, 2]), 3), [1, 2])
+
+
+class TestMCPClientStreaming(unittest.TestCase):
+    """Test cases for MCPClient streaming calls."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client(base_url="https://mcp-server.shivonai.com")
+    
+    @patch('requests.Session.post')
+    def test_call_tool_stream_ndjson(self, mock_post):
+        """Test records are yielded from an NDJSON response."""
+        response = ndjson_response([{"id": 1}, {"id": 2}])
+        mock_post.return_value = response
+        
+        records = list(self.client.call_tool_stream("search", {"q": "python"}))
+        
+        self.assertEqual(records, [{"id": 1}, {"id": 2}])
+        _, kwargs = mock_post.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertIn("application/x-ndjson", kwargs["headers"]["Accept"])
+        response.close.assert_called_once()
+    
+    @patch('requests.Session.post')
+    def test_call_tool_stream_json_fallback(self, mock_post):
+        """Test a plain JSON list result is yielded item by item."""
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        response.content = json.dumps({"result": [1, 2, 3]}).encode()
+        mock_post.return_value = response
+        
+        self.assertEqual(list(self.client.call_tool_stream("search", {})), [1, 2, 3])
+    
+    @patch('requests.Session.post')
+    def test_call_tool_preview(self, mock_post):
+        """Test a preview keeps the first records and closes the response."""
+        response = ndjson_response([{"id": i} for i in range(100)])
+        mock_post.return_value = response
+        
+        result = self.client.call_tool_preview("search", {}, max_items=2)
+        
+        self.assertEqual(result["items"], [{"id": 0}, {"id": 1}])
+        self.assertTrue(result["truncated"])
+        response.close.assert_called_once()
+
+
+class TestAsyncMCPClientStreaming(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncMCPClient streaming calls."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.requests = []
+        
+        def handler(request):
+            self.requests.append(request)
+            body = "\n".join(json.dumps({"id": i}) for i in range(5))
+            return httpx.Response(200, headers={"Content-Type": "application/x-ndjson"}, text=body)
+        
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.client = AsyncMCPClient(base_url="https://mcp-server.shivonai.com", http_client=http_client)
+        self.client.token = "test-token"
+    
+    async def asyncTearDown(self):
+        await self.client.http_client.aclose()
+    
+    async def test_call_tool_stream(self):
+        """Test records are yielded from an NDJSON response."""
+        records = [record async for record in self.client.call_tool_stream("search", {})]
+        
+        self.assertEqual(records, [{"id": i} for i in range(5)])
+        self.assertIn("application/x-ndjson", self.requests[0].headers["Accept"])
+    
+    async def test_call_tool_preview(self):
+        """Test a preview keeps the first records."""
+        result = await self.client.call_tool_preview("search", {}, max_items=3)
+        
+        self.assertEqual(result["items"], [{"id": 0}, {"id": 1}, {"id": 2}])
+        self.assertTrue(result["truncated"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import MagicMock
+
+from shivonai.core.tool_index import ToolIndex, ToolIndexCache, tokenize
+from shivonai.utils.toolsets import build_tools
+
+
+TOOLS = [
+    {"name": "search_candidates", "description": "Find candidates matching a job profile",
+     "parameters": [{"name": "skills", "description": "Required skills"}]},
+    {"name": "get_interview", "description": "Get the transcript of an interview",
+     "parameters": [{"name": "interview_id", "description": "Interview identifier"}]},
+    {"name": "send_email", "description": "Send an email to a recipient"},
+    {"name": "listJobOpenings", "description": "List open job positions"},
+]
+
+
+class TestToolIndex(unittest.TestCase):
+    """Test cases for the tool pre-selection index."""
+    
+    def test_tokenize_splits_identifiers(self):
+        """Test that snake_case, camelCase and plurals are normalized."""
+        self.assertEqual(tokenize("listJobOpenings"), ["list", "job", "opening"])
+        self.assertEqual(tokenize("search_candidates"), ["search", "candidate"])
+    
+    def test_search_ranks_relevant_tools(self):
+        """Test that BM25 ranks tools by name, description and parameters."""
+        index = ToolIndex(TOOLS)
+        
+        self.assertEqual(index.search("interview transcript", 1)[0][0], "get_interview")
+        self.assertEqual(index.search("candidates with python skills", 1)[0][0], "search_candidates")
+        self.assertEqual(index.search("unrelated words"), [])
+    
+    def test_embeddings_blend_with_bm25(self):
+        """Test that embeddings find tools sharing no term with the query."""
+        embedder = MagicMock(side_effect=lambda texts: [[1.0, 0.0] if "email" in text or "mail" in text else [0.0, 1.0] for text in texts])
+        index = ToolIndex(TOOLS, embedder=embedder)
+        
+        self.assertEqual(index.search("write a mail", 1)[0][0], "send_email")
+    
+    def test_rebuild_reuses_unchanged_tools(self):
+        """Test that a changed catalog only embeds the changed tools."""
+        embedder = MagicMock(side_effect=lambda texts: [[float(len(text)), 1.0] for text in texts])
+        cache = ToolIndexCache(embedder=embedder)
+        cache.get(TOOLS)
+        
+        changed = TOOLS[:3] + [{"name": "listJobOpenings", "description": "List job openings by team"}]
+        self.assertIs(cache.get(TOOLS), cache.get(TOOLS))
+        cache.get(changed)
+        
+        self.assertEqual(embedder.call_count, 2)
+        self.assertEqual(len(embedder.call_args[0][0]), 1)
+
+
+class TestSelectTools(unittest.TestCase):
+    """Test cases for selecting framework tools by relevance."""
+    
+    def test_select_tools_on_every_toolkit_shape(self):
+        """Test select_tools on eager and lazy lists and dicts."""
+        build_tool = MagicMock(side_effect=lambda tool_info: tool_info["name"].upper())
+        
+        self.assertEqual(build_tools(TOOLS, build_tool).select_tools("send an email", 1), ["SEND_EMAIL"])
+        self.assertEqual(
+            build_tools(TOOLS, build_tool, as_dict=True).select_tools("job openings", 1),
+            {"listJobOpenings": "LISTJOBOPENINGS"}
+        )
+        
+        build_tool.reset_mock()
+        lazy = build_tools(TOOLS, build_tool, lazy=True)
+        self.assertEqual(lazy.select_tools("interview", 1), ["GET_INTERVIEW"])
+        self.assertEqual(build_tool.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
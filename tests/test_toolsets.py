@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from benchmarks.fake_server import FakeMCPServer
+from shivonai.core.mcp_client import MCPClient
+
+from shivonai.utils.toolsets import LazyToolDict, LazyToolList, build_tools
+
+
+TOOLS = [{"name": f"tool{i}"} for i in range(5)]
+
+
+class TestBuildTools(unittest.TestCase):
+    """Test cases for lazy and parallel toolkit construction."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.built = []
+        
+        def build_tool(tool_info):
+            self.built.append(tool_info["name"])
+            return tool_info["name"].upper()
+        
+        self.build_tool = build_tool
+    
+    def test_eager(self):
+        """Test every tool is built up front, in catalog order."""
+        self.assertEqual(build_tools(TOOLS, self.build_tool), ["TOOL0", "TOOL1", "TOOL2", "TOOL3", "TOOL4"])
+        self.assertEqual(build_tools(TOOLS, self.build_tool, as_dict=True)["tool3"], "TOOL3")
+    
+    def test_parallel_keeps_order(self):
+        """Test a parallel build returns the tools in catalog order."""
+        tools = build_tools(TOOLS, self.build_tool, max_workers=4)
+        
+        self.assertEqual(tools, ["TOOL0", "TOOL1", "TOOL2", "TOOL3", "TOOL4"])
+    
+    def test_lazy_list(self):
+        """Test a lazy list only builds the tools that are accessed."""
+        tools = build_tools(TOOLS, self.build_tool, lazy=True)
+        
+        self.assertIsInstance(tools, LazyToolList)
+        self.assertEqual(len(tools), 5)
+        self.assertEqual(self.built, [])
+        
+        self.assertEqual(tools.select(["tool3", "missing", "tool1"]), ["TOOL3", "TOOL1"])
+        self.assertEqual(tools[-2], "TOOL3")
+        self.assertEqual(tools.get("tool1"), "TOOL1")
+        self.assertEqual(self.built, ["tool3", "tool1"])
+        
+        self.assertEqual(list(tools)[0], "TOOL0")
+        self.assertEqual(len(self.built), 5)
+    
+    def test_lazy_dict(self):
+        """Test a lazy dict only builds the tools that are looked up."""
+        tools = build_tools(TOOLS, self.build_tool, lazy=True, as_dict=True)
+        
+        self.assertIsInstance(tools, LazyToolDict)
+        self.assertEqual(list(tools), ["tool0", "tool1", "tool2", "tool3", "tool4"])
+        self.assertEqual(tools["tool2"], "TOOL2")
+        self.assertEqual(self.built, ["tool2"])
+        with self.assertRaises(KeyError):
+            tools["missing"]
+    
+    def test_lazy_langchain_toolkit(self):
+        """Test a lazy LangChain toolkit builds tools on access."""
+        try:
+            import langchain  # noqa: F401
+        except ImportError:
+            self.skipTest("langchain is not installed")
+        from shivonai.lyra.langchain_tools import langchain_toolkit
+        
+        client = MagicMock()
+        client.metrics = None
+        client.connect.return_value = [
+            {"name": "search", "parameters": [{"name": "q"}, {"name": "limit"}]},
+            {"name": "ping", "parameters": []}
+        ]
+        
+        tools = langchain_toolkit("token", client=client, async_client=MagicMock(), lazy=True)
+        
+        self.assertEqual(tools.names, ["search", "ping"])
+        self.assertEqual(tools.get("ping").name, "ping")
+    
+    def test_langchain_ainvoke_across_event_loops(self):
+        """Test async tool calls under separate asyncio.run calls."""
+        try:
+            import langchain  # noqa: F401
+        except ImportError:
+            self.skipTest("langchain is not installed")
+        from shivonai.lyra.langchain_tools import langchain_toolkit
+        
+        with FakeMCPServer(num_tools=3, payload_items=2) as server:
+            with MCPClient(server.url) as client:
+                tool = langchain_toolkit("token", client=client)[1]
+                
+                first = asyncio.run(tool.ainvoke({"param_0": "a"}))
+                second = asyncio.run(tool.ainvoke({"param_0": "b"}))
+        
+        self.assertEqual(len(first), 2)
+        self.assertEqual(second, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+import unittest
+
+from benchmarks.fake_server import FakeMCPServer
+from shivonai.core.async_client import AsyncMCPClient
+from shivonai.core.mcp_client import MCPClient
+from shivonai.core.transport import Cassette, RecordTransport, ReplayMissError, ReplayTransport
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Test cases for recording MCP traffic and replaying it offline."""
+    
+    def setUp(self):
+        """Record a session against the fake server."""
+        self.path = os.path.join(tempfile.mkdtemp(), "session.jsonl.gz")
+        with FakeMCPServer(num_tools=5, payload_items=3, gzip=True) as server:
+            self.url = server.url
+            with MCPClient(server.url, transport=RecordTransport(self.path), circuit_breaker=None) as client:
+                client.authenticate("secret-token")
+                self.tools = client.list_tools()
+                self.result = client.call_tool("tool_1", {"param_0": "x"})
+    
+    def test_replay_without_server(self):
+        """Test that a replayed session needs no server and keeps no secrets."""
+        with open(self.path, "rb") as file:
+            self.assertNotIn(b"secret-token", gzip.decompress(file.read()))
+        
+        client = MCPClient(self.url, transport=ReplayTransport(self.path), circuit_breaker=None)
+        client.authenticate("another-token")
+        
+        self.assertEqual(client.list_tools(), self.tools)
+        self.assertEqual(client.call_tool("tool_1", {"param_0": "x"}), self.result)
+        self.assertEqual(client.call_tool("tool_1", {"param_0": "x"}), self.result)
+        with self.assertRaises(ReplayMissError):
+            client.call_tool("tool_1", {"param_0": "y"})
+    
+    def test_latency_injection(self):
+        """Test that replayed responses can be delayed."""
+        client = MCPClient(self.url, transport=ReplayTransport(self.path, latency=0.05), circuit_breaker=None)
+        
+        started = time.perf_counter()
+        client.authenticate("token")
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+    
+    def test_async_replay(self):
+        """Test that the async client replays the same cassette."""
+        cassette = Cassette.load(self.path)
+        
+        async def run():
+            async with AsyncMCPClient(self.url, transport=ReplayTransport(cassette), circuit_breaker=None) as client:
+                await client.authenticate("token")
+                return await client.call_tool("tool_1", {"param_0": "x"})
+        
+        self.assertEqual(asyncio.run(run()), self.result)
+    
+    def test_session_and_transport_exclusive(self):
+        """Test that a transport cannot be mounted on a caller's session."""
+        import requests
+        
+        with self.assertRaises(ValueError):
+            MCPClient(session=requests.Session(), transport=ReplayTransport(Cassette()))
+
+
+if __name__ == '__main__':
+    unittest.main()
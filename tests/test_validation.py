@@ -0,0 +1,126 @@
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+from shivonai.core.streaming import tool_callers
+from shivonai.utils.schemas import convert_parameters_to_schema, get_args_model
+from shivonai.utils.validation import ToolArgumentError, get_validator
+from tests.helpers import make_client, make_response
+
+
+PARAMETERS = [
+    {"name": "query", "type": "string", "required": True},
+    {"name": "limit", "type": "integer"},
+    {"name": "max_price", "type": "number"},
+    {"name": "furnished", "type": "boolean"},
+    {"name": "amenities", "type": "array"},
+    {"name": "filters", "type": "object"},
+    {"name": "radius", "type": "float"},
+    {"name": "near"}
+]
+
+TOOLS = [{"name": "search", "parameters": PARAMETERS}]
+
+
+class TestArgumentValidator(unittest.TestCase):
+    """Test cases for the compiled argument validator."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.validator = get_validator(PARAMETERS)
+    
+    def test_coerces_declared_types(self):
+        """Test that string arguments are coerced to the declared types."""
+        arguments = self.validator.validate("search", {
+            "query": 42,
+            "limit": "10",
+            "max_price": "1500.5",
+            "furnished": "yes",
+            "amenities": "parking, garden",
+            "extra": "kept"
+        })
+        
+        self.assertEqual(arguments, {
+            "query": "42",
+            "limit": 10,
+            "max_price": 1500.5,
+            "furnished": True,
+            "amenities": ["parking", "garden"],
+            "extra": "kept"
+        })
+        self.assertEqual(self.validator.validate("search", {"query": "a", "amenities": '["x", 1]'})["amenities"], ["x", "1"])
+    
+    def test_rejects_bad_arguments(self):
+        """Test that missing and uncoercible arguments are reported together."""
+        with self.assertRaises(ToolArgumentError) as context:
+            self.validator.validate("search", {"limit": "ten", "furnished": "maybe"})
+        
+        error = context.exception
+        self.assertEqual(error.tool_name, "search")
+        self.assertEqual([message.split(":")[0] for message in error.errors], ["query", "limit", "furnished"])
+        self.assertIsInstance(error, ValueError)
+    
+    def test_optional_none_dropped_and_unknown_types_passed(self):
+        """Test that unset optional arguments are dropped and objects kept."""
+        arguments = self.validator.validate("search", {"query": "flat", "limit": None, "filters": {"city": "Paris"}})
+        
+        self.assertEqual(arguments, {"query": "flat", "filters": {"city": "Paris"}})
+    
+    def test_untyped_parameters_passed_unchanged(self):
+        """Test that parameters of unknown or missing types are not stringified."""
+        arguments = self.validator.validate("search", {"query": "flat", "radius": 2.5, "near": [48.8, 2.3]})
+        schema = convert_parameters_to_schema(PARAMETERS)
+        
+        self.assertEqual(arguments, {"query": "flat", "radius": 2.5, "near": [48.8, 2.3]})
+        self.assertEqual(schema["properties"]["filters"]["type"], "object")
+        self.assertNotIn("type", schema["properties"]["radius"])
+    
+    def test_validator_reused(self):
+        """Test that the validator is compiled once per parameter spec."""
+        self.assertIs(self.validator, get_validator([dict(param) for param in PARAMETERS]))
+    
+    def test_args_model_types(self):
+        """Test that generated argument models carry the declared types."""
+        model = get_args_model("searchSchema", PARAMETERS)
+        
+        self.assertIs(model.model_fields["limit"].annotation, int)
+        self.assertIs(model.model_fields["filters"].annotation, Any)
+    
+    def test_args_model_accepts_text_for_arrays(self):
+        """Test that the argument model leaves array coercion to the validator."""
+        model = get_args_model("searchSchema", PARAMETERS)
+        
+        arguments = model(query="flat", amenities="parking, garden").model_dump(exclude_none=True)
+        
+        self.assertEqual(self.validator.validate("search", arguments)["amenities"], ["parking", "garden"])
+
+
+class TestValidatingCallers(unittest.TestCase):
+    """Test cases for validation in toolkit callers."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.client = make_client()
+    
+    @patch('requests.Session.post')
+    def test_coerced_arguments_are_sent(self, mock_post):
+        """Test that the server receives the coerced arguments."""
+        mock_post.return_value = make_response({"result": []})
+        call_tool, _ = tool_callers(self.client, None, tool_infos=TOOLS)
+        
+        call_tool("search", {"query": "flat", "limit": "5"})
+        
+        self.assertEqual(mock_post.call_args.kwargs["json"]["parameters"], {"query": "flat", "limit": 5})
+    
+    @patch('requests.Session.post')
+    def test_invalid_arguments_never_sent(self, mock_post):
+        """Test that invalid calls fail without a round trip."""
+        call_tool, _ = tool_callers(self.client, None, tool_infos=TOOLS)
+        
+        with self.assertRaises(ToolArgumentError):
+            call_tool("search", {"limit": "5"})
+        mock_post.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()